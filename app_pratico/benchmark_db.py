@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark de requisições por segundo para cada perfil de engine.
+
+Para cada perfil (DB_ENGINE_PROFILE=basic e tuned) sobe a aplicação em um
+processo novo, cria um usuário com alguns tópicos e dispara requisições
+pelo cliente de teste do Flask em várias threads, misturando leituras
+(listagens e dashboard) e escritas (novas sessões de estudo).
+
+Sem --database-url cada perfil usa um SQLite temporário próprio; com
+--database-url (ex.: um PostgreSQL de teste) os dois perfis usam o mesmo
+banco, que precisa aceitar as migrações.
+
+    python benchmark_db.py [--threads 4] [--seconds 10] [--write-ratio 0.2] [--database-url URL]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+READ_PATHS = ['/api/study/sessions', '/api/topics/', '/api/revisions/', '/api/study/dashboard']
+
+def run_profile(args):
+    profile, database_url, threads, seconds, write_ratio = args
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['DB_ENGINE_PROFILE'] = profile
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+    from flask_migrate import upgrade
+    from src.app import application as app
+    from src.models.user import db, User
+
+    username = f"benchmark-{uuid.uuid4().hex[:8]}"
+    with app.app_context():
+        upgrade()
+        user = User(username=username, email=f"{username}@example.com")
+        user.set_password('senha-benchmark')
+        db.session.add(user)
+        db.session.commit()
+
+    counts = []
+    errors = []
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        client.post('/api/auth/login', json={'username': username, 'password': 'senha-benchmark'})
+        for i in range(5):
+            client.post('/api/topics/', json={'name': f"Tópico {seed}-{i}", 'group_id': 1, 'group_name': 'G1'})
+
+        done = 0
+        while time.perf_counter() < deadline:
+            if rng.random() < write_ratio:
+                response = client.post('/api/study/sessions', json={'description': 'benchmark'})
+            else:
+                response = client.get(rng.choice(READ_PATHS))
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+            done += 1
+        counts.append(done)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        engine = db.engine
+        settings = {
+            'pool': type(engine.pool).__name__,
+            'pool_size': getattr(engine.pool, 'size', lambda: None)()
+        }
+        if engine.dialect.name == 'sqlite':
+            with engine.connect() as connection:
+                settings['journal_mode'] = connection.exec_driver_sql('PRAGMA journal_mode').scalar()
+                settings['synchronous'] = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+
+    return profile, sum(counts), elapsed, len(errors), settings
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de throughput por perfil de engine')
+    parser.add_argument('--threads', type=int, default=4, help='Clientes simultâneos')
+    parser.add_argument('--seconds', type=float, default=10, help='Duração de cada perfil')
+    parser.add_argument('--write-ratio', type=float, default=0.2, help='Fração de requisições de escrita')
+    parser.add_argument('--database-url', default=None, help='Banco a usar (padrão: SQLite temporário por perfil)')
+    args = parser.parse_args()
+
+    print(f"Clientes: {args.threads}, duração: {args.seconds:g}s, escritas: {args.write_ratio:.0%}")
+    context = multiprocessing.get_context('spawn')
+    for profile in ('basic', 'tuned'):
+        database_url = args.database_url
+        if database_url is None:
+            database_dir = tempfile.mkdtemp(prefix=f"benchmark-db-{profile}-")
+            database_url = f"sqlite:///{os.path.join(database_dir, 'app.db')}"
+
+        # Um processo por perfil: as opções do engine são fixadas na criação da aplicação
+        with context.Pool(1) as pool:
+            profile, requests, elapsed, errors, settings = pool.apply(
+                run_profile, ((profile, database_url, args.threads, args.seconds, args.write_ratio),)
+            )
+        details = ', '.join(f"{key}={value}" for key, value in settings.items())
+        print(f"{profile:<6} {requests / elapsed:8.1f} req/s ({requests} requisições, {errors} erros) [{details}]")
+
+if __name__ == '__main__':
+    main()
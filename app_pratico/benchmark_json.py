@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do codificador JSON das respostas: biblioteca padrão x orjson.
+
+Usa o FastJSONProvider da aplicação com cargas parecidas com as das rotas
+de listagem (sessões de estudo, registros de questões, revisões e o
+progresso do edital), com datas já em texto (to_dict) e como datetime.
+
+    python benchmark_json.py [--rows 2000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from src.app import application as app
+from src.utils.json_provider import orjson
+
+def build_payloads(rows):
+    random.seed(42)
+    base = datetime(2024, 1, 1, 8, 0, 0)
+
+    def sessions(as_text):
+        result = []
+        for i in range(rows):
+            start = base + timedelta(hours=i * 7, minutes=random.randint(0, 59))
+            end = start + timedelta(minutes=random.randint(10, 180))
+            result.append({
+                'id': i + 1,
+                'user_id': 1,
+                'topic_id': random.randint(1, 60),
+                'start_time': start.isoformat() if as_text else start,
+                'end_time': end.isoformat() if as_text else end,
+                'duration_minutes': int((end - start).total_seconds() // 60),
+                'description': f"Revisão de manobrabilidade {i}",
+                'created_at': start.isoformat() if as_text else start
+            })
+        return result
+
+    questions = [
+        {
+            'id': i + 1,
+            'user_id': 1,
+            'topic_id': random.randint(1, 60),
+            'date': (base + timedelta(days=i)).isoformat(),
+            'total_questions': 20,
+            'correct_answers': random.randint(5, 20),
+            'wrong_answers': random.randint(0, 15),
+            'difficulty_level': random.choice(['Fácil', 'Médio', 'Difícil']),
+            'accuracy_percentage': random.random() * 100,
+            'notes': None,
+            'created_at': (base + timedelta(days=i)).isoformat()
+        }
+        for i in range(rows)
+    ]
+
+    revisions = [
+        {
+            'id': i + 1,
+            'topic_id': i // 5 + 1,
+            'scheduled_date': (base + timedelta(days=i % 60)).isoformat(),
+            'completed_at': None,
+            'is_completed': False,
+            'revision_number': i % 5 + 1,
+            'notes': None,
+            'notify': True,
+            'color': '#4285f4',
+            'grade': None
+        }
+        for i in range(rows)
+    ]
+
+    edital = {
+        'items': [
+            {
+                'id': i + 1,
+                'section': f"SEÇÃO {i // 7}",
+                'subsection': None,
+                'content': "Comportamento do casco e leme(s) interagindo com sistema(s) propulsor(es)",
+                'order_index': i,
+                'is_studied': i % 3 == 0,
+                'study_date': None,
+                'confidence_level': 'Médio',
+                'notes': None
+            }
+            for i in range(rows)
+        ],
+        'stats': {'total_items': rows, 'studied_items': rows // 3}
+    }
+
+    return {
+        'sessões (texto)': sessions(True),
+        'sessões (datetime)': sessions(False),
+        'questões': questions,
+        'revisões': revisions,
+        'progresso do edital': edital
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do codificador JSON')
+    parser.add_argument('--rows', type=int, default=2000, help='Linhas por carga')
+    parser.add_argument('--repeat', type=int, default=20, help='Codificações por medição')
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson não instalado: apenas a biblioteca padrão será medida")
+
+    payloads = build_payloads(args.rows)
+    encoders = [('stdlib', False)] + ([('orjson', True)] if orjson else [])
+
+    with app.app_context():
+        provider = app.json
+        print(f"{'carga':<22}{'encoder':<10}{'ms/resposta':>12}{'KB':>10}{'MB/s':>10}")
+        for name, payload in payloads.items():
+            results = {}
+            for encoder, use_orjson in encoders:
+                provider.use_orjson = use_orjson
+                body = provider.response(payload).get_data()
+                seconds = min(timeit.repeat(lambda: provider.response(payload), number=args.repeat, repeat=3)) / args.repeat
+                results[encoder] = seconds
+                print(f"{name:<22}{encoder:<10}{seconds * 1000:>12.2f}{len(body) / 1024:>10.1f}{len(body) / seconds / 1e6:>10.1f}")
+            if len(results) == 2:
+                print(f"{'':<22}{'ganho':<10}{results['stdlib'] / results['orjson']:>11.1f}x")
+
+if __name__ == '__main__':
+    main()
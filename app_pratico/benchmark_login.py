@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark do login: logins por segundo por núcleo.
+
+Cria um banco SQLite temporário com um usuário e faz logins pelo cliente
+de teste do Flask em um ou mais processos.
+
+    python benchmark_login.py [--logins 50] [--processes 2] [--method scrypt:32768:8:1]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def run_logins(args):
+    database_url, method, logins = args
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['PASSWORD_HASH_METHOD'] = method
+
+    from src.app import application as app
+    client = app.test_client()
+
+    start = time.perf_counter()
+    for _ in range(logins):
+        response = client.post('/api/auth/login', json={'username': 'benchmark', 'password': 'senha-benchmark'})
+        assert response.status_code == 200, response.data
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de logins por segundo')
+    parser.add_argument('--logins', type=int, default=50, help='Logins por processo')
+    parser.add_argument('--processes', type=int, default=1, help='Processos em paralelo (um por núcleo)')
+    parser.add_argument('--method', default='scrypt:32768:8:1', help='PASSWORD_HASH_METHOD a medir')
+    args = parser.parse_args()
+
+    database_dir = tempfile.mkdtemp(prefix='benchmark-login-')
+    database_url = f"sqlite:///{os.path.join(database_dir, 'app.db')}"
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['PASSWORD_HASH_METHOD'] = args.method
+
+    from flask_migrate import upgrade
+    from src.app import application as app
+    from src.models.user import db, User
+
+    with app.app_context():
+        upgrade()
+        user = User(username='benchmark', email='benchmark@example.com')
+        user.set_password('senha-benchmark')
+        db.session.add(user)
+        db.session.commit()
+
+    print(f"Método: {args.method}")
+    print(f"Processos: {args.processes} x {args.logins} logins")
+
+    jobs = [(database_url, args.method, args.logins)] * args.processes
+    start = time.perf_counter()
+    with multiprocessing.get_context('spawn').Pool(args.processes) as pool:
+        durations = pool.map(run_logins, jobs)
+    elapsed = time.perf_counter() - start
+
+    total = args.processes * args.logins
+    per_core = sum(args.logins / duration for duration in durations) / args.processes
+    print(f"Total: {total} logins em {elapsed:.2f}s ({total / elapsed:.1f} logins/s, incluindo inicialização)")
+    print(f"Por núcleo: {per_core:.1f} logins/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark das listagens: instâncias do ORM + to_dict() x leitura por colunas.
+
+Cria um banco SQLite temporário com um histórico grande para um usuário,
+confere que src/services/read_models.py produz o mesmo JSON (byte a byte)
+que o to_dict() de cada modelo e mede tempo e pico de memória por linha.
+
+    python benchmark_reads.py [--rows 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def seed(db, rows):
+    from src.models.user import User
+    from src.models.notification import Notification
+    from src.models.study import QuestionRecord, StudySession
+    from src.models.topic import Revision, Topic
+
+    random.seed(42)
+    base = datetime(2024, 1, 1, 8, 0, 0)
+
+    user = User(username='benchmark', email='benchmark@example.com')
+    user.set_password('senha-benchmark')
+    db.session.add(user)
+    db.session.flush()
+
+    topic_count = max(1, rows // 5)
+    db.session.execute(Topic.__table__.insert(), [
+        {
+            'user_id': user.id, 'group_id': i % 3 + 1, 'group_name': f"G{i % 3 + 1}",
+            'name': f"Tópico {i}", 'description': 'Descrição', 'is_completed': i % 4 == 0,
+            'confidence_level': 'Médio', 'created_at': base + timedelta(hours=i),
+            'completed_at': base + timedelta(days=i) if i % 4 == 0 else None, 'ease_factor': 2.5
+        }
+        for i in range(topic_count)
+    ])
+    topic_ids = [topic_id for (topic_id,) in db.session.query(Topic.id)]
+
+    db.session.execute(Revision.__table__.insert(), [
+        {
+            'topic_id': topic_ids[i // 5], 'scheduled_date': base + timedelta(days=i % 90),
+            'revision_number': i % 5 + 1, 'is_completed': i % 2 == 0,
+            'completed_at': base + timedelta(days=i % 90) if i % 2 == 0 else None,
+            'notify': True, 'color': '#4285f4'
+        }
+        for i in range(topic_count * 5)
+    ])
+    db.session.execute(StudySession.__table__.insert(), [
+        {
+            'user_id': user.id, 'topic_id': random.choice(topic_ids),
+            'start_time': base + timedelta(hours=i * 7), 'end_time': base + timedelta(hours=i * 7, minutes=50),
+            'duration_minutes': 50, 'description': f"Sessão {i}"
+        }
+        for i in range(rows)
+    ])
+    db.session.execute(QuestionRecord.__table__.insert(), [
+        {
+            'user_id': user.id, 'topic_id': random.choice(topic_ids), 'date': base + timedelta(hours=i * 5),
+            'source': 'Banco', 'difficulty_level': 'Médio', 'total_questions': 20,
+            'correct_answers': 15, 'wrong_answers': 5, 'accuracy_percentage': 75.0
+        }
+        for i in range(rows)
+    ])
+    db.session.execute(Notification.__table__.insert(), [
+        {
+            'user_id': user.id, 'title': 'Revisão', 'message': f"Lembrete {i}", 'is_read': i % 3 == 0,
+            'created_at': base + timedelta(minutes=i), 'scheduled_for': None
+        }
+        for i in range(rows)
+    ])
+    db.session.commit()
+    return user.id
+
+def measure(db, load, repeat):
+    """Melhor tempo e pico de memória de load() com a sessão limpa a cada rodada"""
+    best = None
+    for _ in range(repeat):
+        db.session.remove()
+        start = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    db.session.remove()
+    tracemalloc.start()
+    result = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das listagens (ORM x colunas)')
+    parser.add_argument('--rows', type=int, default=20000, help='Linhas por tabela')
+    parser.add_argument('--repeat', type=int, default=5, help='Rodadas por medição')
+    args = parser.parse_args()
+
+    database_dir = tempfile.mkdtemp(prefix='benchmark-reads-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(database_dir, 'app.db')}"
+
+    from flask_migrate import upgrade
+    from src.app import application as app
+    from src.models.user import db
+    from src.models.notification import Notification
+    from src.models.study import QuestionRecord, StudySession
+    from src.models.topic import Revision, Topic
+    from src.services import read_models
+
+    with app.app_context():
+        upgrade()
+        user_id = seed(db, args.rows)
+
+        cases = [
+            ('sessões de estudo', StudySession, read_models.study_sessions,
+             [StudySession.user_id == user_id], [StudySession.start_time.desc(), StudySession.id.desc()], None),
+            ('registros de questões', QuestionRecord, read_models.question_records,
+             [QuestionRecord.user_id == user_id], [QuestionRecord.date.desc(), QuestionRecord.id.desc()], None),
+            ('revisões', Revision, read_models.revisions,
+             [Topic.user_id == user_id], [Revision.scheduled_date, Revision.id], Topic),
+            ('notificações', Notification, read_models.notifications,
+             [Notification.user_id == user_id], [Notification.created_at.desc(), Notification.id.desc()], None),
+            ('tópicos', Topic, read_models.topics,
+             [Topic.user_id == user_id], [Topic.id], None),
+        ]
+
+        print(f"{'listagem':<24}{'linhas':>8}{'ORM µs/linha':>14}{'colunas µs/linha':>18}{'ORM KB':>10}{'colunas KB':>12}")
+        for name, model, reader, filters, order, join in cases:
+            def load_orm():
+                query = db.session.query(model)
+                if join is not None:
+                    query = query.join(join)
+                return [item.to_dict() for item in query.filter(*filters).order_by(*order).all()]
+
+            def load_rows():
+                query = reader.query()
+                if join is not None:
+                    query = query.join(join, Revision.topic_id == Topic.id)
+                return reader.to_dicts(query.filter(*filters).order_by(*order).all())
+
+            orm_time, orm_peak, orm_items = measure(db, load_orm, args.repeat)
+            rows_time, rows_peak, row_items = measure(db, load_rows, args.repeat)
+
+            if app.json.dumps(orm_items) != app.json.dumps(row_items):
+                sys.exit(f"JSON diferente para {name}")
+
+            count = len(orm_items)
+            print(
+                f"{name:<24}{count:>8}{orm_time / count * 1e6:>14.2f}{rows_time / count * 1e6:>18.2f}"
+                f"{orm_peak / 1024:>10.0f}{rows_peak / 1024:>12.0f}"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Verificação do roteamento de leituras para a réplica (src/utils/replica.py).
+
+Usa dois arquivos SQLite temporários no lugar do primário e da réplica; a
+"replicação" é uma cópia do primário para a réplica (API de backup do
+sqlite3), feita só quando o script quer simular que a réplica alcançou o
+primário. Assim, o que um GET devolve mostra de qual banco ele leu.
+
+Confere que:
+- nenhuma escrita chega à réplica;
+- logo após uma escrita o cliente lê do primário (as próprias escritas);
+- passado REPLICA_STICKY_SECONDS, os GETs leem da réplica (ainda atrasada);
+- rotas marcadas com @use_primary e a reconstrução do dashboard usam o primário.
+
+    python check_replica.py [--sticky-seconds 1]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+failures = []
+
+def check(description, condition):
+    print(f"{'OK  ' if condition else 'FALHA'} {description}")
+    if not condition:
+        failures.append(description)
+
+def topic_names(response):
+    return {topic['name'] for topic in response.get_json()['topics']}
+
+def main():
+    parser = argparse.ArgumentParser(description='Verificação do roteamento para a réplica')
+    parser.add_argument('--sticky-seconds', type=float, default=1, help='REPLICA_STICKY_SECONDS usado na verificação')
+    args = parser.parse_args()
+
+    database_dir = tempfile.mkdtemp(prefix='check-replica-')
+    primary_path = os.path.join(database_dir, 'primary.db')
+    replica_path = os.path.join(database_dir, 'replica.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{primary_path}"
+    os.environ['DATABASE_REPLICA_URL'] = f"sqlite:///{replica_path}"
+    os.environ['REPLICA_STICKY_SECONDS'] = str(args.sticky_seconds)
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+    from flask_migrate import upgrade
+    from sqlalchemy import event
+    from src.app import application as app
+    from src.models.user import db
+    from src.utils.replica import REPLICA_BIND
+
+    def replicate():
+        with sqlite3.connect(primary_path) as source, sqlite3.connect(replica_path) as target:
+            source.backup(target)
+
+    with app.app_context():
+        upgrade()
+        replica_engine = db.engines[REPLICA_BIND]
+    replicate()
+
+    replica_statements = []
+
+    @event.listens_for(replica_engine, 'before_cursor_execute')
+    def record_statement(connection, cursor, statement, parameters, context, executemany):
+        replica_statements.append(statement)
+
+    client = app.test_client()
+    credentials = {'username': 'replica', 'email': 'replica@example.com', 'password': 'senha-replica'}
+    client.post('/api/auth/register', json=credentials)
+    client.post('/api/auth/login', json={'username': 'replica', 'password': 'senha-replica'})
+    client.post('/api/topics/', json={'name': 'Tópico 1', 'group_id': 1, 'group_name': 'G1'})
+
+    response = client.get('/api/topics/')
+    check("GET logo após a escrita lê do primário", response.status_code == 200 and topic_names(response) == {'Tópico 1'})
+    check("GET logo após a escrita não consulta a réplica", not replica_statements)
+
+    time.sleep(args.sticky_seconds + 0.1)
+    response = client.get('/api/topics/')
+    check("Passada a janela, GET lê da réplica atrasada", response.status_code == 200 and topic_names(response) == set())
+    check("A leitura foi feita na réplica", bool(replica_statements))
+
+    replicate()
+    response = client.get('/api/topics/')
+    check("Após a replicação a réplica devolve o tópico", topic_names(response) == {'Tópico 1'})
+
+    replica_statements.clear()
+    response = client.get('/api/revisions/notifications/preferences')
+    check("Rota @use_primary cria as preferências no primário", response.status_code == 200 and not replica_statements)
+
+    time.sleep(args.sticky_seconds + 0.1)
+    client.post('/api/topics/', json={'name': 'Tópico 2', 'group_id': 1, 'group_name': 'G1'})
+    time.sleep(args.sticky_seconds + 0.1)
+    # A réplica não tem o rollup do usuário nem o Tópico 2: o dashboard
+    # reconstrói o rollup lendo e gravando no primário
+    response = client.get('/api/study/dashboard')
+    totals = [group['total'] for group in response.get_json().get('progress_by_group', [])]
+    with sqlite3.connect(primary_path) as connection:
+        rollups = connection.execute('SELECT COUNT(*) FROM user_dashboard_rollup').fetchone()[0]
+    check("Dashboard reconstrói o rollup a partir do primário", totals == [2] and rollups > 0)
+
+    writes = [statement for statement in replica_statements
+              if statement.lstrip().split(None, 1)[0].upper() not in ('SELECT', 'PRAGMA', 'WITH')]
+    check("Nenhuma escrita enviada à réplica", not writes)
+    with sqlite3.connect(replica_path) as connection:
+        rollups = connection.execute('SELECT COUNT(*) FROM user_dashboard_rollup').fetchone()[0]
+    check("A réplica só muda pela replicação", rollups == 0)
+
+    print(f"\n{len(failures)} falha(s)" if failures else "\nTudo certo")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -2,25 +2,23 @@
 """
 Script para popular o banco de dados com o conteúdo programático oficial
 do edital da DPC para Praticante de Prático
+
+A sincronização é incremental: só os itens novos, alterados ou removidos
+são gravados, e o progresso dos usuários é preservado.
 """
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.models.user import db
-from src.models.study import EditalItem, EditalProgress
-from src.main import app
+from src.services.edital_sync import sync_edital_items
+from src.app import application as app
 
 def create_edital_content():
     """Criar conteúdo programático do edital da DPC"""
     
     with app.app_context():
-        # Limpar dados existentes do edital
-        EditalProgress.query.delete()
-        EditalItem.query.delete()
-        db.session.commit()
-        
         # Conteúdo programático baseado no edital oficial da DPC
         edital_content = [
             {
@@ -129,26 +127,20 @@ def create_edital_content():
             }
         ]
         
-        # Inserir dados no banco
-        for group_data in edital_content:
-            group_name = group_data["group_name"]
-            
-            for i, item_description in enumerate(group_data["items"], 1):
-                edital_item = EditalItem(
-                    section=group_name,
-                    subsection=None,
-                    content=item_description,
-                    order_index=i
-                )
-                db.session.add(edital_item)
-        
+        # Sincronizar com o banco (na ordem dos grupos)
+        entries = [
+            {"section": group_data["group_name"], "content": item_description}
+            for group_data in edital_content
+            for item_description in group_data["items"]
+        ]
+        summary = sync_edital_items(entries)
         db.session.commit()
-        print(f"✅ Conteúdo programático criado com sucesso!")
-        print(f"📚 Total de grupos: {len(edital_content)}")
         
-        # Contar total de itens
-        total_items = sum(len(group["items"]) for group in edital_content)
-        print(f"📋 Total de itens: {total_items}")
+        print(f"✅ Conteúdo programático sincronizado com sucesso!")
+        print(f"📚 Total de grupos: {len(edital_content)}")
+        print(f"📋 Total de itens: {len(entries)}")
+        print(f"➕ Novos: {summary['inserted']}  ✏️ Alterados: {summary['updated']}  "
+              f"🗄️ Retirados: {summary['retired']}  = Inalterados: {summary['unchanged']}")
 
 if __name__ == "__main__":
     create_edital_content()
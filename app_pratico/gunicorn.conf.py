@@ -0,0 +1,116 @@
+"""
+Configuração do Gunicorn (carregada por: gunicorn -c gunicorn.conf.py src.app:application).
+
+Tudo pode ser ajustado por variáveis de ambiente:
+- GUNICORN_WORKER_CLASS: gevent (padrão), gthread ou sync. O stream SSE de
+  notificações mantém conexões abertas, então gevent é o indicado; com
+  gthread cada conexão de stream ocupa uma thread. No gevent o psycopg2 é
+  tornado cooperativo com o psycogreen: sem ele cada consulta bloqueia o
+  processo inteiro (todas as greenlets, inclusive os streams SSE).
+- WEB_CONCURRENCY: número de processos (padrão calculado pelos núcleos
+  disponíveis e pela classe de worker)
+- GUNICORN_THREADS: threads por processo no gthread (padrão 4)
+- GUNICORN_WORKER_CONNECTIONS: conexões simultâneas por processo no gevent
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: reciclagem dos
+  processos (0 desativa); os streams SSE reconectam com Last-Event-ID
+- GUNICORN_PRELOAD: carregar a aplicação no master antes do fork (padrão
+  true), compartilhando catálogo do edital, index.html e módulos em
+  copy-on-write
+- GUNICORN_TIMEOUT: segundos sem resposta antes de reiniciar um worker
+"""
+
+import gc
+import os
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    return value.lower() not in ('0', 'false', 'no') if value else default
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - sem sched_getaffinity (macOS)
+        return os.cpu_count() or 1
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+cpus = _cpu_count()
+
+if worker_class == 'gevent':
+    # Um processo por núcleo; a concorrência vem das greenlets
+    default_workers = cpus
+elif worker_class == 'gthread':
+    default_workers = cpus + 1
+else:
+    default_workers = cpus * 2 + 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = _env_int('WEB_CONCURRENCY', default_workers)
+threads = _env_int('GUNICORN_THREADS', 4) if worker_class == 'gthread' else 1
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = 30
+keepalive = 5
+
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+accesslog = '-'
+errorlog = '-'
+
+def _patch_psycopg():
+    """Fazer o libpq ceder o loop do gevent enquanto espera o banco"""
+    if worker_class != 'gevent':
+        return
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+if worker_class == 'gevent' and preload_app:
+    # Com preload a aplicação é importada no master: o patch precisa vir
+    # antes, senão threading/socket ficam com as versões bloqueantes
+    from gevent import monkey
+    monkey.patch_all()
+    _patch_psycopg()
+
+def when_ready(server):
+    """No master, antes do fork: aquecer os caches compartilhados"""
+    if not preload_app:
+        return
+
+    from src.app import application
+    from src.models.user import db
+    from src.services import edital_catalog
+
+    with application.app_context():
+        try:
+            edital_catalog.get_catalog()
+        except Exception as e:
+            server.log.warning("Catálogo do edital não pré-carregado: %s", e)
+        # As conexões abertas no master não podem ser herdadas pelos workers
+        for engine in db.engines.values():
+            engine.dispose()
+
+    # Objetos já carregados ficam fora do GC: o coletor não toca nessas
+    # páginas e elas continuam compartilhadas entre os processos
+    gc.freeze()
+
+def post_fork(server, worker):
+    if not preload_app:
+        # Sem preload o worker gevent aplica o monkey.patch_all sozinho;
+        # o psycopg2 precisa do patch próprio em cada processo
+        _patch_psycopg()
+        return
+
+    from src.app import application
+    from src.models.user import db
+
+    # Descarta (sem fechar) qualquer conexão herdada do master
+    with application.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,151 @@
+"""Schema inicial (equivalente ao antigo db.create_all)
+
+Bancos criados antes das migrações já possuem estas tabelas; elas só são
+criadas quando ausentes, então o upgrade é seguro nos dois casos.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'users', 'topics', 'revisions', 'study_sessions', 'question_records',
+    'edital_items', 'edital_progress', 'notification_preferences',
+    'notifications', 'user_dashboard_rollup'
+]
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create_table(name, *columns):
+        if name not in existing:
+            op.create_table(name, *columns)
+
+    create_table(
+        'users',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('username', sa.String(length=80), nullable=False, unique=True),
+        sa.Column('email', sa.String(length=120), nullable=False, unique=True),
+        sa.Column('password_hash', sa.String(length=256), nullable=False)
+    )
+    create_table(
+        'topics',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('group_name', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('is_completed', sa.Boolean(), nullable=True),
+        sa.Column('confidence_level', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True)
+    )
+    create_table(
+        'revisions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('topic_id', sa.Integer(), sa.ForeignKey('topics.id'), nullable=False),
+        sa.Column('scheduled_date', sa.DateTime(), nullable=False),
+        sa.Column('revision_number', sa.Integer(), nullable=False),
+        sa.Column('is_completed', sa.Boolean(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('notify', sa.Boolean(), nullable=True),
+        sa.Column('color', sa.String(length=20), nullable=True)
+    )
+    create_table(
+        'study_sessions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.Column('duration_minutes', sa.Integer(), nullable=True),
+        sa.Column('topic_id', sa.Integer(), sa.ForeignKey('topics.id'), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True)
+    )
+    create_table(
+        'question_records',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('topic_id', sa.Integer(), sa.ForeignKey('topics.id'), nullable=True),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('source', sa.String(length=200), nullable=True),
+        sa.Column('specific_topic', sa.String(length=200), nullable=True),
+        sa.Column('difficulty_level', sa.String(length=20), nullable=True),
+        sa.Column('total_questions', sa.Integer(), nullable=False),
+        sa.Column('correct_answers', sa.Integer(), nullable=False),
+        sa.Column('wrong_answers', sa.Integer(), nullable=False),
+        sa.Column('accuracy_percentage', sa.Float(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True)
+    )
+    create_table(
+        'edital_items',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('section', sa.String(length=100), nullable=False),
+        sa.Column('subsection', sa.String(length=100), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('order_index', sa.Integer(), nullable=False)
+    )
+    create_table(
+        'edital_progress',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('edital_item_id', sa.Integer(), sa.ForeignKey('edital_items.id'), nullable=False),
+        sa.Column('is_studied', sa.Boolean(), nullable=True),
+        sa.Column('study_date', sa.DateTime(), nullable=True),
+        sa.Column('confidence_level', sa.String(length=20), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True)
+    )
+    create_table(
+        'notification_preferences',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('enable_browser_notifications', sa.Boolean(), nullable=True),
+        sa.Column('enable_email_notifications', sa.Boolean(), nullable=True),
+        sa.Column('reminder_minutes_before', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+    )
+    create_table(
+        'notifications',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('revision_id', sa.Integer(), sa.ForeignKey('revisions.id'), nullable=True),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=True)
+    )
+    create_table(
+        'user_dashboard_rollup',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('group_id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('group_name', sa.String(length=100), nullable=True),
+        sa.Column('topics_total', sa.Integer(), nullable=False),
+        sa.Column('topics_completed', sa.Integer(), nullable=False),
+        sa.Column('study_sessions', sa.Integer(), nullable=False),
+        sa.Column('study_minutes', sa.Integer(), nullable=False),
+        sa.Column('question_records', sa.Integer(), nullable=False),
+        sa.Column('questions_total', sa.Integer(), nullable=False),
+        sa.Column('questions_correct', sa.Integer(), nullable=False),
+        sa.Column('edital_studied', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade():
+    for name in reversed(TABLES):
+        op.drop_table(name)
@@ -0,0 +1,63 @@
+"""Índices para as colunas filtradas por usuário
+
+No Postgres os índices são criados com CREATE INDEX CONCURRENTLY, fora da
+transação da migração, para não bloquear escritas em tabelas já populadas.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_topics_user_id_group_id', 'topics', ['user_id', 'group_id']),
+    ('ix_revisions_topic_id_scheduled_date', 'revisions', ['topic_id', 'scheduled_date']),
+    ('ix_study_sessions_user_id_start_time', 'study_sessions', ['user_id', 'start_time']),
+    ('ix_study_sessions_topic_id', 'study_sessions', ['topic_id']),
+    ('ix_question_records_user_id_date', 'question_records', ['user_id', 'date']),
+    ('ix_question_records_topic_id', 'question_records', ['topic_id']),
+    ('ix_edital_items_order_index', 'edital_items', ['order_index']),
+    ('ix_edital_progress_user_id_edital_item_id', 'edital_progress', ['user_id', 'edital_item_id']),
+    ('ix_notification_preferences_user_id', 'notification_preferences', ['user_id']),
+    ('ix_notifications_user_id_is_read_created_at', 'notifications', ['user_id', 'is_read', 'created_at']),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {
+        index['name']
+        for table in {table for _, table, _ in INDEXES}
+        for index in inspector.get_indexes(table)
+    }
+
+
+def upgrade():
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    # CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name not in existing:
+                op.create_index(name, table, columns, postgresql_concurrently=concurrently)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if name in existing:
+                op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
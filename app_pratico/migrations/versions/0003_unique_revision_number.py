@@ -0,0 +1,67 @@
+"""Restrição única (topic_id, revision_number) em revisions
+
+Duplicatas antigas (cronogramas criados mais de uma vez) são removidas,
+mantendo a revisão de menor id e redirecionando suas notificações.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(name):
+    return name in {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('revisions')}
+
+
+def upgrade():
+    op.execute("""
+        UPDATE notifications SET revision_id = (
+            SELECT MIN(kept.id)
+            FROM revisions AS duplicate
+            JOIN revisions AS kept
+              ON kept.topic_id = duplicate.topic_id
+             AND kept.revision_number = duplicate.revision_number
+            WHERE duplicate.id = notifications.revision_id
+        )
+        WHERE revision_id IS NOT NULL
+          AND revision_id IN (SELECT id FROM revisions)
+    """)
+    op.execute("""
+        DELETE FROM revisions
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM revisions GROUP BY topic_id, revision_number
+        )
+    """)
+
+    if _has_index('uq_revisions_topic_id_revision_number'):
+        return
+
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_revisions_topic_id_revision_number', 'revisions',
+            ['topic_id', 'revision_number'], unique=True,
+            postgresql_concurrently=concurrently
+        )
+
+
+def downgrade():
+    if not _has_index('uq_revisions_topic_id_revision_number'):
+        return
+
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_revisions_topic_id_revision_number', table_name='revisions',
+            postgresql_concurrently=concurrently
+        )
@@ -0,0 +1,48 @@
+"""Colunas do agendamento adaptativo (SM-2)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = {
+    'topics': [
+        sa.Column('ease_factor', sa.Float(), nullable=True),
+        sa.Column('interval_days', sa.Float(), nullable=True),
+    ],
+    'revisions': [
+        sa.Column('grade', sa.Integer(), nullable=True),
+    ],
+}
+
+
+def upgrade():
+    # Bancos criados a partir dos modelos já têm as colunas
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in COLUMNS.items():
+        existing = {column['name'] for column in inspector.get_columns(table)}
+        missing = [column for column in columns if column.name not in existing]
+        if missing:
+            with op.batch_alter_table(table) as batch_op:
+                for column in missing:
+                    batch_op.add_column(column)
+
+
+def downgrade():
+    with op.batch_alter_table('revisions') as batch_op:
+        batch_op.drop_column('grade')
+
+    with op.batch_alter_table('topics') as batch_op:
+        batch_op.drop_column('interval_days')
+        batch_op.drop_column('ease_factor')
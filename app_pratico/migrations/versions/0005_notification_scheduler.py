@@ -0,0 +1,66 @@
+"""Suporte ao agendador de notificações
+
+- revisions.updated_at (indexado) permite ler apenas as revisões alteradas;
+- notification_preferences.updated_at indexado, pelo mesmo motivo;
+- índice único (revision_id, scheduled_for) evita lembretes duplicados.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_revisions_updated_at', 'revisions', ['updated_at'], False),
+    ('ix_notification_preferences_updated_at', 'notification_preferences', ['updated_at'], False),
+    ('uq_notifications_revision_id_scheduled_for', 'notifications', ['revision_id', 'scheduled_for'], True),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    return {
+        index['name']
+        for table in {table for _, table, _, _ in INDEXES}
+        for index in inspector.get_indexes(table)
+    }
+
+
+def _has_column(table, column):
+    return column in {c['name'] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # Bancos criados a partir dos modelos já têm a coluna e os índices
+    if not _has_column('revisions', 'updated_at'):
+        with op.batch_alter_table('revisions') as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            if name not in existing:
+                op.create_index(name, table, columns, unique=unique, postgresql_concurrently=concurrently)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            if name in existing:
+                op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+    with op.batch_alter_table('revisions') as batch_op:
+        batch_op.drop_column('updated_at')
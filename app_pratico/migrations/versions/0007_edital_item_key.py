@@ -0,0 +1,55 @@
+"""Chave estável e retirada de itens do edital (sincronização incremental)
+
+As chaves dos itens existentes são preenchidas na primeira sincronização.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'uq_edital_items_item_key'
+COLUMNS = [
+    sa.Column('item_key', sa.String(length=64), nullable=True),
+    sa.Column('retired_at', sa.DateTime(), nullable=True),
+]
+
+
+def _existing_indexes():
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('edital_items')}
+
+
+def upgrade():
+    # Bancos criados a partir dos modelos já têm as colunas e o índice
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('edital_items')}
+    missing = [column for column in COLUMNS if column.name not in existing_columns]
+    if missing:
+        with op.batch_alter_table('edital_items') as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+    if INDEX_NAME not in _existing_indexes():
+        concurrently = op.get_bind().dialect.name == 'postgresql'
+        with op.get_context().autocommit_block():
+            op.create_index(INDEX_NAME, 'edital_items', ['item_key'], unique=True, postgresql_concurrently=concurrently)
+
+
+def downgrade():
+    if INDEX_NAME in _existing_indexes():
+        concurrently = op.get_bind().dialect.name == 'postgresql'
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name='edital_items', postgresql_concurrently=concurrently)
+
+    with op.batch_alter_table('edital_items') as batch_op:
+        batch_op.drop_column('retired_at')
+        batch_op.drop_column('item_key')
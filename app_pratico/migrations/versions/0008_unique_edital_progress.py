@@ -0,0 +1,72 @@
+"""Restrição única (user_id, edital_item_id) em edital_progress
+
+Duplicatas antigas são removidas, mantendo o registro de menor id (o que
+as rotas de marcação liam). O rollup dos usuários afetados é apagado e
+reconstruído na próxima leitura do dashboard.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def _existing_indexes():
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('edital_progress')}
+
+
+def upgrade():
+    op.execute("""
+        DELETE FROM user_dashboard_rollup
+        WHERE user_id IN (
+            SELECT user_id FROM edital_progress
+            GROUP BY user_id, edital_item_id HAVING COUNT(*) > 1
+        )
+    """)
+    op.execute("""
+        DELETE FROM edital_progress
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM edital_progress GROUP BY user_id, edital_item_id
+        )
+    """)
+
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        if 'uq_edital_progress_user_id_edital_item_id' not in existing:
+            op.create_index(
+                'uq_edital_progress_user_id_edital_item_id', 'edital_progress',
+                ['user_id', 'edital_item_id'], unique=True,
+                postgresql_concurrently=concurrently
+            )
+        if 'ix_edital_progress_user_id_edital_item_id' in existing:
+            op.drop_index(
+                'ix_edital_progress_user_id_edital_item_id', table_name='edital_progress',
+                postgresql_concurrently=concurrently
+            )
+
+
+def downgrade():
+    existing = _existing_indexes()
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        if 'ix_edital_progress_user_id_edital_item_id' not in existing:
+            op.create_index(
+                'ix_edital_progress_user_id_edital_item_id', 'edital_progress',
+                ['user_id', 'edital_item_id'],
+                postgresql_concurrently=concurrently
+            )
+        if 'uq_edital_progress_user_id_edital_item_id' in existing:
+            op.drop_index(
+                'uq_edital_progress_user_id_edital_item_id', table_name='edital_progress',
+                postgresql_concurrently=concurrently
+            )
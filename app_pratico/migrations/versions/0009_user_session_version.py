@@ -0,0 +1,30 @@
+"""Versão de sessão dos usuários (revogação e cache de autenticação)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bancos criados a partir dos modelos já têm a coluna
+    if 'session_version' in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')}:
+        return
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('session_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('session_version')
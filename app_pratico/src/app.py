@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory, jsonify, request
+from flask_migrate import Migrate
 from datetime import timedelta
 import sys
 
@@ -14,9 +15,19 @@ from src.routes.topics import topics_bp
 from src.routes.study import study_bp
 from src.routes.revisions import revisions_bp
 from src.routes.edital import edital_bp
+from src.commands import register_commands
+from src.utils.json_provider import FastJSONProvider
+from src.utils.compression import register_compression
+from src.utils.static_assets import register_static_assets
+from src.utils.database import register_database
+from src.utils.replica import register_replica_routing
 
 def create_app():
-    app = Flask(__name__, static_folder="../static", static_url_path="/static")
+    app = Flask(__name__, static_folder="static", static_url_path="/static")
+    
+    # JSON: orjson quando disponível (JSON_ENCODER=stdlib força a biblioteca padrão)
+    app.json = FastJSONProvider(app)
+    app.json.use_orjson = app.json.use_orjson and os.getenv('JSON_ENCODER', 'orjson') != 'stdlib'
     
     # Configurações
     app.config.update(
@@ -25,11 +36,23 @@ def create_app():
         SQLALCHEMY_DATABASE_URI=os.getenv('DATABASE_URL', 'sqlite:///instance/app.db').replace(
             'postgres://', 'postgresql://', 1),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        SQLALCHEMY_ENGINE_OPTIONS={"pool_pre_ping": True}
+        DATABASE_REPLICA_URL=(os.getenv('DATABASE_REPLICA_URL') or '').replace('postgres://', 'postgresql://', 1) or None,
+        REPLICA_STICKY_SECONDS=float(os.getenv('REPLICA_STICKY_SECONDS', 10)),
+        EDITAL_IMPORT_PATH=os.getenv('EDITAL_IMPORT_PATH', '/home/ubuntu/edital_pratico_2012.txt'),
+        PASSWORD_HASH_METHOD=os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1'),
+        COMPRESS_ENABLED=os.getenv('COMPRESS_ENABLED', 'true').lower() != 'false',
+        COMPRESS_ALGORITHMS=os.getenv('COMPRESS_ALGORITHMS', 'zstd,br,gzip'),
+        COMPRESS_MIN_SIZE=int(os.getenv('COMPRESS_MIN_SIZE', 1024)),
+        COMPRESS_GZIP_LEVEL=int(os.getenv('COMPRESS_GZIP_LEVEL', 6)),
+        COMPRESS_BR_LEVEL=int(os.getenv('COMPRESS_BR_LEVEL', 4)),
+        COMPRESS_ZSTD_LEVEL=int(os.getenv('COMPRESS_ZSTD_LEVEL', 3)),
+        STATIC_BUILD_DIR=os.getenv('STATIC_BUILD_DIR', str(Path(__file__).parent.parent / 'instance' / 'static'))
     )
 
     # Inicializações
-    db.init_app(app)
+    register_database(app, db)  # Perfil do engine (pool, pragmas do SQLite): src/utils/database.py
+    register_replica_routing(app)  # Leituras GET na réplica (DATABASE_REPLICA_URL): src/utils/replica.py
+    Migrate(app, db, directory=str(Path(__file__).parent.parent / 'migrations'), render_as_batch=True)
     
     # Blueprints
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -38,14 +61,18 @@ def create_app():
     app.register_blueprint(revisions_bp, url_prefix="/api/revisions")
     app.register_blueprint(edital_bp, url_prefix="/api/edital")
 
-    # Database
-    with app.app_context():
-        try:
-            if not os.path.exists('instance'):
-                os.makedirs('instance')
-            db.create_all()
-        except Exception as e:
-            app.logger.error(f"Database error: {str(e)}")
+    # Comandos de manutenção (flask --app src.app <comando>)
+    register_commands(app)
+
+    # Compressão das respostas (gzip/brotli/zstd conforme o Accept-Encoding)
+    register_compression(app)
+
+    # Arquivos estáticos: índice montado na inicialização e servido pelo WhiteNoise
+    assets = register_static_assets(app)
+
+    # Database: o schema é gerenciado pelas migrações (flask --app src.app db upgrade)
+    if not os.path.exists('instance'):
+        os.makedirs('instance')
 
     # Rotas
     @app.route('/health')
@@ -58,9 +85,9 @@ def create_app():
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve_spa(path):
-        if path and os.path.exists(os.path.join(app.static_folder, path)):
+        if path in assets.files and path != 'index.html':
             return send_from_directory(app.static_folder, path)
-        return send_from_directory(app.static_folder, 'index.html')
+        return assets.index_response(app, request)
 
     return app
 
@@ -0,0 +1,73 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from src.models.user import db
+from src.services import dashboard_rollup, spaced_repetition, edital_import
+from src.services.notification_scheduler import NotificationScheduler
+from src.utils import static_assets
+
+@click.command('rebuild-dashboard-rollup')
+@click.option('--user-id', type=int, default=None, help='Reconstruir apenas para este usuário')
+@with_appcontext
+def rebuild_dashboard_rollup_command(user_id):
+    """Recalcular a tabela user_dashboard_rollup a partir do histórico"""
+    rows = dashboard_rollup.rebuild_dashboard_rollup(user_id)
+    db.session.commit()
+    click.echo(f"Rollup do dashboard reconstruído: {rows} linhas")
+
+@click.command('reschedule-overdue-revisions')
+@with_appcontext
+def reschedule_overdue_revisions_command():
+    """Reagendar as revisões atrasadas de todos os usuários (execução noturna)"""
+    rescheduled = spaced_repetition.reschedule_overdue_revisions()
+    db.session.commit()
+    click.echo(f"Revisões reagendadas: {rescheduled}")
+
+@click.command('run-notification-scheduler')
+@click.option('--poll-interval', type=float, default=30, help='Segundos entre as leituras de alterações')
+@with_appcontext
+def run_notification_scheduler_command(poll_interval):
+    """Processo contínuo que cria as notificações de revisão no horário do lembrete"""
+    click.echo("Agendador de notificações iniciado")
+    NotificationScheduler(poll_interval=poll_interval).run_forever()
+
+@click.command('import-edital')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@with_appcontext
+def import_edital_command(path):
+    """Importar o edital a partir de um arquivo de texto, em blocos"""
+    def report(items_created, bytes_read, bytes_total):
+        click.echo(f"{items_created} itens ({bytes_read * 100 // max(bytes_total, 1)}%)")
+    
+    try:
+        created = edital_import.import_edital_file(path, progress=report)
+    except edital_import.EditalAlreadyImported:
+        raise click.ClickException("Edital já foi importado anteriormente")
+    db.session.commit()
+    click.echo(f"Edital importado: {created} itens")
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Gerar o bundle minificado e com hash dos scripts da SPA (executado no build)"""
+    assets = static_assets.StaticAssets(current_app.static_folder, current_app.config['STATIC_BUILD_DIR'])
+    assets.load()
+    report = assets.build_bundle()
+
+    if not report['minified']:
+        click.echo("rjsmin não instalado: scripts concatenados sem minificação")
+    click.echo(f"Bundle: {report['bundle']} ({report['requests'][0]} requisições -> {report['requests'][1]})")
+    for encoding, before in report['before'].items():
+        after = report['after'][encoding]
+        click.echo(f"  {encoding:<8} {before / 1024:8.1f} KB -> {after / 1024:8.1f} KB ({(1 - after / before) * 100:.0f}% menor)")
+
+    before_ms = report['before']['identity'] / 1024 / static_assets.PARSE_KB_PER_MS
+    after_ms = report['after']['identity'] / 1024 / static_assets.PARSE_KB_PER_MS
+    click.echo(f"Parse estimado ({static_assets.PARSE_KB_PER_MS:g} KB/ms): {before_ms:.0f} ms -> {after_ms:.0f} ms")
+
+def register_commands(app):
+    app.cli.add_command(rebuild_dashboard_rollup_command)
+    app.cli.add_command(reschedule_overdue_revisions_command)
+    app.cli.add_command(run_notification_scheduler_command)
+    app.cli.add_command(import_edital_command)
+    app.cli.add_command(build_assets_command)
@@ -0,0 +1,37 @@
+from datetime import datetime
+from src.models.user import db
+
+# group_id reservado para a linha de totais do usuário (grupos reais começam em 1)
+TOTALS_GROUP_ID = 0
+
+class UserDashboardRollup(db.Model):
+    __tablename__ = 'user_dashboard_rollup'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    group_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 = totais do usuário
+    group_name = db.Column(db.String(100), nullable=True)
+    topics_total = db.Column(db.Integer, nullable=False, default=0)
+    topics_completed = db.Column(db.Integer, nullable=False, default=0)
+    study_sessions = db.Column(db.Integer, nullable=False, default=0)  # Sessões com duração registrada
+    study_minutes = db.Column(db.Integer, nullable=False, default=0)
+    question_records = db.Column(db.Integer, nullable=False, default=0)
+    questions_total = db.Column(db.Integer, nullable=False, default=0)
+    questions_correct = db.Column(db.Integer, nullable=False, default=0)
+    edital_studied = db.Column(db.Integer, nullable=False, default=0)  # Apenas na linha de totais
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'group_id': self.group_id,
+            'group_name': self.group_name,
+            'topics_total': self.topics_total,
+            'topics_completed': self.topics_completed,
+            'study_sessions': self.study_sessions,
+            'study_minutes': self.study_minutes,
+            'question_records': self.question_records,
+            'questions_total': self.questions_total,
+            'questions_correct': self.questions_correct,
+            'edital_studied': self.edital_studied,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -3,6 +3,10 @@ from src.models.user import db
 
 class NotificationPreference(db.Model):
     __tablename__ = 'notification_preferences'
+    __table_args__ = (
+        db.Index('ix_notification_preferences_user_id', 'user_id'),
+        db.Index('ix_notification_preferences_updated_at', 'updated_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -25,6 +29,10 @@ class NotificationPreference(db.Model):
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
+    __table_args__ = (
+        db.Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+        db.Index('uq_notifications_revision_id_scheduled_for', 'revision_id', 'scheduled_for', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -3,6 +3,10 @@ from src.models.user import db
 
 class StudySession(db.Model):
     __tablename__ = 'study_sessions'
+    __table_args__ = (
+        db.Index('ix_study_sessions_user_id_start_time', 'user_id', 'start_time'),
+        db.Index('ix_study_sessions_topic_id', 'topic_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -33,6 +37,10 @@ class StudySession(db.Model):
 
 class QuestionRecord(db.Model):
     __tablename__ = 'question_records'
+    __table_args__ = (
+        db.Index('ix_question_records_user_id_date', 'user_id', 'date'),
+        db.Index('ix_question_records_topic_id', 'topic_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -72,12 +80,18 @@ class QuestionRecord(db.Model):
 
 class EditalItem(db.Model):
     __tablename__ = 'edital_items'
+    __table_args__ = (
+        db.Index('ix_edital_items_order_index', 'order_index'),
+        db.Index('uq_edital_items_item_key', 'item_key', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     section = db.Column(db.String(100), nullable=False)  # Seção do edital
     subsection = db.Column(db.String(100), nullable=True)  # Subseção (opcional)
     content = db.Column(db.Text, nullable=False)  # Conteúdo do item
     order_index = db.Column(db.Integer, nullable=False)  # Índice para ordenação
+    item_key = db.Column(db.String(64), nullable=True)  # Grupo + hash do conteúdo normalizado (sincronização)
+    retired_at = db.Column(db.DateTime, nullable=True)  # Itens retirados do edital mantêm o histórico de progresso
     
     # Relacionamentos
     progress_records = db.relationship('EditalProgress', backref='edital_item', lazy=True, cascade="all, delete-orphan")
@@ -93,6 +107,9 @@ class EditalItem(db.Model):
 
 class EditalProgress(db.Model):
     __tablename__ = 'edital_progress'
+    __table_args__ = (
+        db.Index('uq_edital_progress_user_id_edital_item_id', 'user_id', 'edital_item_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -112,3 +129,15 @@ class EditalProgress(db.Model):
             'confidence_level': self.confidence_level,
             'notes': self.notes
         }
+
+class EditalCatalogVersion(db.Model):
+    """Carimbo de versão do catálogo do edital (linha única, id=1)
+
+    Incrementado a cada importação ou recarga do edital; os processos
+    comparam com a versão em cache para saber quando recarregar.
+    """
+    __tablename__ = 'edital_catalog_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,6 +3,9 @@ from src.models.user import db
 
 class Topic(db.Model):
     __tablename__ = 'topics'
+    __table_args__ = (
+        db.Index('ix_topics_user_id_group_id', 'user_id', 'group_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -14,6 +17,8 @@ class Topic(db.Model):
     confidence_level = db.Column(db.String(20), default='Baixo')  # Baixo, Médio, Alto
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
+    ease_factor = db.Column(db.Float, default=2.5)  # Fator de facilidade (SM-2)
+    interval_days = db.Column(db.Float, nullable=True)  # Último intervalo entre revisões
     
     # Relacionamentos
     revisions = db.relationship('Revision', backref='topic', lazy=True, cascade="all, delete-orphan")
@@ -29,11 +34,18 @@ class Topic(db.Model):
             'is_completed': self.is_completed,
             'confidence_level': self.confidence_level,
             'created_at': self.created_at.isoformat(),
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'ease_factor': self.ease_factor,
+            'interval_days': self.interval_days
         }
 
 class Revision(db.Model):
     __tablename__ = 'revisions'
+    __table_args__ = (
+        db.Index('ix_revisions_topic_id_scheduled_date', 'topic_id', 'scheduled_date'),
+        db.Index('uq_revisions_topic_id_revision_number', 'topic_id', 'revision_number', unique=True),
+        db.Index('ix_revisions_updated_at', 'updated_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     topic_id = db.Column(db.Integer, db.ForeignKey('topics.id'), nullable=False)
@@ -44,6 +56,8 @@ class Revision(db.Model):
     notes = db.Column(db.Text, nullable=True)
     notify = db.Column(db.Boolean, default=True)  # Se deve notificar o usuário
     color = db.Column(db.String(20), default='#4285f4')  # Cor para visualização no calendário
+    grade = db.Column(db.Integer, nullable=True)  # Nota de lembrança (0 a 5) ao concluir
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Usado pelo agendador de notificações
     
     # Relacionamentos
     notifications = db.relationship('Notification', backref='revision', lazy=True, cascade="all, delete-orphan")
@@ -58,5 +72,6 @@ class Revision(db.Model):
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'notes': self.notes,
             'notify': self.notify,
-            'color': self.color
+            'color': self.color,
+            'grade': self.grade
         }
@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify, session
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, jsonify
 from src.models.user import db, User
+from src.utils.auth import current_user, login_user, logout_user, user_changed
+from src.utils import passwords
 import logging
 import traceback
 
@@ -49,7 +50,7 @@ def register():
         
         # Iniciar sessão
         logger.info("Iniciando sessão do usuário")
-        session['user_id'] = new_user.id
+        login_user(new_user)
         
         logger.info("Retornando resposta de sucesso")
         return jsonify({
@@ -77,19 +78,21 @@ def login():
         user = User.query.filter_by(username=data['username']).first()
         logger.info(f"Usuário encontrado: {user is not None}")
         
-        if user:
-            logger.info(f"Hash da senha do usuário: {user.password_hash}")
-            password_check = user.check_password(data['password'])
-            logger.info(f"Verificação de senha: {password_check}")
-        
-        # Verificar se o usuário existe e a senha está correta
-        if not user or not user.check_password(data['password']):
+        # Verificar se o usuário existe e a senha está correta (uma única derivação)
+        valid, needs_rehash = passwords.verify_password(user.password_hash, data['password']) if user else (False, False)
+        if not valid:
             logger.warning("Credenciais inválidas")
             return jsonify({'error': 'Credenciais inválidas'}), 401
         
+        # Parâmetros de hash alterados: regerar com a senha já conferida
+        if needs_rehash:
+            user.set_password(data['password'])
+            user_changed(user)  # Mesma senha: as sessões abertas continuam válidas
+            db.session.commit()
+        
         # Iniciar sessão
         logger.info(f"Login bem-sucedido para usuário: {user.username}")
-        session['user_id'] = user.id
+        login_user(user)
         
         return jsonify({
             'message': 'Login realizado com sucesso',
@@ -104,7 +107,7 @@ def login():
 def logout():
     try:
         # Remover usuário da sessão
-        session.pop('user_id', None)
+        logout_user()
         logger.info("Logout realizado com sucesso")
         return jsonify({'message': 'Logout realizado com sucesso'}), 200
     except Exception as e:
@@ -115,15 +118,14 @@ def logout():
 @auth_bp.route('/check-auth', methods=['GET'])
 def check_auth():
     try:
-        user_id = session.get('user_id')
-        if user_id:
-            user = User.query.get(user_id)
-            if user:
-                logger.info(f"Usuário autenticado: {user.username}")
-                return jsonify({
-                    'authenticated': True,
-                    'user': user.to_dict()
-                }), 200
+        # Usuário vem do cache de autenticação na maioria das requisições
+        user = current_user()
+        if user:
+            logger.info(f"Usuário autenticado: {user.username}")
+            return jsonify({
+                'authenticated': True,
+                'user': user.to_dict()
+            }), 200
         
         logger.info("Usuário não autenticado")
         return jsonify({'authenticated': False}), 200
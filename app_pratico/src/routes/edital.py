@@ -1,117 +1,77 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 from src.models.user import db, User
 from src.models.topic import Topic, Revision
 from src.models.study import StudySession, QuestionRecord, EditalItem, EditalProgress
 from src.models.notification import Notification, NotificationPreference
+from src.services import dashboard_rollup, edital_catalog, edital_import, edital_progress
+from src.services.edital_bitmap import ProgressBitmap
+from src.utils.auth import login_required, current_user
 import logging
 import os
-import re
 
 edital_bp = Blueprint('edital', __name__)
 logger = logging.getLogger(__name__)
 
 @edital_bp.route('/import', methods=['POST'])
+@login_required
 def import_edital():
-    """Importar conteúdo do edital do arquivo de texto"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
+    """Importar conteúdo do edital do arquivo de texto
+
+    O arquivo pode ser enviado no campo "file" (multipart) ou lido do
+    caminho configurado em EDITAL_IMPORT_PATH. Com ?background=true a
+    importação roda em segundo plano e a resposta traz o id da tarefa.
+    """
     # Verificar se já existem itens do edital
-    existing_items = EditalItem.query.count()
-    if existing_items > 0:
+    if db.session.query(EditalItem.id).first() is not None:
         return jsonify({"error": "Edital já foi importado anteriormente"}), 400
     
-    try:
-        # Caminho para o arquivo do edital
-        edital_file_path = '/home/ubuntu/edital_pratico_2012.txt'
-        
+    # Arquivo enviado ou caminho configurado
+    upload = request.files.get('file')
+    if upload:
+        edital_file_path = edital_import.save_upload(upload.stream)
+    else:
+        edital_file_path = current_app.config['EDITAL_IMPORT_PATH']
         if not os.path.exists(edital_file_path):
             return jsonify({"error": "Arquivo do edital não encontrado"}), 404
-        
-        # Ler o conteúdo do arquivo
-        with open(edital_file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Processar o conteúdo e extrair seções
-        sections = []
-        current_section = None
-        current_subsection = None
-        current_content = []
-        order_index = 0
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            
-            # Pular linhas vazias
-            if not line:
-                continue
-            
-            # Detectar cabeçalhos de seção (em maiúsculas ou com numeração)
-            if line.isupper() or re.match(r'^\d+\.', line):
-                # Salvar seção anterior, se existir
-                if current_section:
-                    sections.append({
-                        'section': current_section,
-                        'subsection': current_subsection,
-                        'content': '\n'.join(current_content),
-                        'order_index': order_index
-                    })
-                    order_index += 1
-                
-                current_section = line
-                current_subsection = None
-                current_content = []
-            
-            # Detectar subseções (com letras ou números)
-            elif re.match(r'^[a-z\d]\)', line) or re.match(r'^[a-z\d]\.\d', line):
-                # Salvar subseção anterior, se existir
-                if current_section and current_content:
-                    sections.append({
-                        'section': current_section,
-                        'subsection': current_subsection,
-                        'content': '\n'.join(current_content),
-                        'order_index': order_index
-                    })
-                    order_index += 1
-                
-                current_subsection = line
-                current_content = []
-            
-            # Conteúdo normal
-            else:
-                current_content.append(line)
-        
-        # Adicionar a última seção
-        if current_section and current_content:
-            sections.append({
-                'section': current_section,
-                'subsection': current_subsection,
-                'content': '\n'.join(current_content),
-                'order_index': order_index
-            })
-        
-        # Inserir seções no banco de dados
-        for section_data in sections:
-            edital_item = EditalItem(
-                section=section_data['section'],
-                subsection=section_data['subsection'],
-                content=section_data['content'],
-                order_index=section_data['order_index']
-            )
-            db.session.add(edital_item)
-        
+    
+    if request.args.get('background', '').lower() == 'true':
+        job = edital_import.start_import_job(
+            current_app._get_current_object(), edital_file_path, remove_after=bool(upload)
+        )
+        return jsonify(job.to_dict()), 202
+    
+    try:
+        created = edital_import.import_edital_file(edital_file_path)
         db.session.commit()
         
         return jsonify({
             "success": True,
-            "message": f"Edital importado com sucesso. {len(sections)} itens criados."
+            "message": f"Edital importado com sucesso. {created} itens criados."
         })
     
+    except edital_import.EditalAlreadyImported:
+        db.session.rollback()
+        return jsonify({"error": "Edital já foi importado anteriormente"}), 400
+    
     except Exception as e:
         db.session.rollback()
         logger.error(f"Erro ao importar edital: {str(e)}")
         return jsonify({"error": f"Erro ao importar edital: {str(e)}"}), 500
+    
+    finally:
+        if upload:
+            os.remove(edital_file_path)
+
+@edital_bp.route('/import/<job_id>', methods=['GET'])
+@login_required
+def get_import_job(job_id):
+    """Consultar o progresso de uma importação em segundo plano"""
+    job = edital_import.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Importação não encontrada"}), 404
+    
+    return jsonify(job.to_dict())
 
 @edital_bp.route('/', methods=['GET'])
 def get_edital_items():
@@ -119,35 +79,38 @@ def get_edital_items():
     # Parâmetros de filtro opcionais
     section = request.args.get('section')
     
-    # Construir a consulta base
-    query = EditalItem.query
-    
-    # Aplicar filtros se fornecidos
-    if section:
-        query = query.filter(EditalItem.section == section)
-    
-    # Ordenar por índice
-    items = query.order_by(EditalItem.order_index).all()
-    
-    # Obter seções únicas para navegação
-    sections = db.session.query(EditalItem.section).distinct().all()
-    sections = [s[0] for s in sections]
-    
-    return jsonify({
-        "items": [item.to_dict() for item in items],
-        "sections": sections
+    # Itens e seções vêm do cache do catálogo (ETag/304 para quem já tem a versão)
+    return edital_catalog.catalog_response(('edital', section), lambda catalog: {
+        "items": catalog.section_items(section),
+        "sections": catalog.sections
     })
 
 @edital_bp.route('/progress', methods=['GET'])
+@login_required
 def get_edital_progress():
-    """Obter progresso do usuário no edital"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
-    
-    # Obter todos os itens do edital
-    edital_items = EditalItem.query.order_by(EditalItem.order_index).all()
+    """Obter progresso do usuário no edital
+
+    Com ?format=bitmap a resposta traz só os bitsets compactos (itens
+    estudados e níveis de confiança, na ordem do catálogo) e as
+    estatísticas; o cliente combina com o catálogo da versão informada.
+    """
+    user_id = current_user().id
+    
+    # Obter todos os itens do edital (cache do catálogo)
+    catalog = edital_catalog.get_catalog()
+    edital_items = catalog.items
+    
+    if request.args.get('format') == 'bitmap':
+        records = db.session.query(
+            EditalProgress.edital_item_id, EditalProgress.is_studied, EditalProgress.confidence_level
+        ).filter(EditalProgress.user_id == user_id)
+        bitmap = ProgressBitmap.from_records(catalog.positions, records)
+        
+        return jsonify({
+            "catalog_version": catalog.version,
+            **bitmap.to_payload(),
+            "stats": bitmap.stats()
+        })
     
     # Obter progresso do usuário
     progress_records = EditalProgress.query.filter_by(user_id=user_id).all()
@@ -157,10 +120,11 @@ def get_edital_progress():
     
     # Construir resposta combinando itens e progresso
     result = []
-    for item in edital_items:
-        progress = progress_map.get(item.id)
+    bitmap = ProgressBitmap(len(edital_items))
+    for position, item in enumerate(edital_items):
+        progress = progress_map.get(item['id'])
         
-        item_data = item.to_dict()
+        item_data = dict(item)
         if progress:
             item_data.update({
                 'is_studied': progress.is_studied,
@@ -168,6 +132,7 @@ def get_edital_progress():
                 'confidence_level': progress.confidence_level,
                 'notes': progress.notes
             })
+            bitmap.set(position, progress.is_studied, progress.confidence_level)
         else:
             item_data.update({
                 'is_studied': False,
@@ -178,35 +143,17 @@ def get_edital_progress():
         
         result.append(item_data)
     
-    # Calcular estatísticas de progresso
-    total_items = len(edital_items)
-    studied_items = sum(1 for item in result if item['is_studied'])
-    progress_percentage = (studied_items / total_items * 100) if total_items > 0 else 0
-    
-    # Agrupar por nível de confiança
-    confidence_stats = {
-        'Baixo': sum(1 for item in result if item['is_studied'] and item['confidence_level'] == 'Baixo'),
-        'Médio': sum(1 for item in result if item['is_studied'] and item['confidence_level'] == 'Médio'),
-        'Alto': sum(1 for item in result if item['is_studied'] and item['confidence_level'] == 'Alto')
-    }
-    
+    # Estatísticas de progresso e por nível de confiança (contagem de bits)
     return jsonify({
         "items": result,
-        "stats": {
-            "total_items": total_items,
-            "studied_items": studied_items,
-            "progress_percentage": progress_percentage,
-            "confidence_stats": confidence_stats
-        }
+        "stats": bitmap.stats()
     })
 
 @edital_bp.route('/mark', methods=['POST'])
+@login_required
 def mark_edital_item():
     """Marcar um item do edital como estudado"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     data = request.json
     
     if not data or 'edital_item_id' not in data:
@@ -214,7 +161,7 @@ def mark_edital_item():
     
     # Verificar se o item do edital existe
     edital_item = EditalItem.query.get(data['edital_item_id'])
-    if not edital_item:
+    if not edital_item or edital_item.retired_at is not None:
         return jsonify({"error": "Item do edital não encontrado"}), 404
     
     # Verificar se já existe um registro de progresso para este item
@@ -232,7 +179,9 @@ def mark_edital_item():
         db.session.add(progress)
     
     # Atualizar campos
+    was_studied = progress.is_studied
     progress.is_studied = data.get('is_studied', True)
+    dashboard_rollup.record_edital_studied(user_id, was_studied, progress.is_studied)
     
     if progress.is_studied and not progress.study_date:
         progress.study_date = datetime.utcnow()
@@ -252,3 +201,51 @@ def mark_edital_item():
         db.session.rollback()
         logger.error(f"Erro ao marcar item do edital: {str(e)}")
         return jsonify({"error": "Erro ao marcar item do edital"}), 500
+
+def _is_item_id(value):
+    # bool é subclasse de int, mas não é um id
+    return isinstance(value, int) and not isinstance(value, bool)
+
+@edital_bp.route('/mark/bulk', methods=['POST'])
+@login_required
+def bulk_mark_edital_items():
+    """Marcar ou desmarcar vários itens do edital de uma vez
+
+    Aceita {"items": [{edital_item_id, is_studied, confidence_level, notes}, ...]}
+    ou {"section": "...", "is_studied": ..., "confidence_level": ..., "notes": ...}
+    para todos os itens de uma seção.
+    """
+    user_id = current_user().id
+    data = request.get_json(silent=True)
+    
+    if not data or ('items' not in data and 'section' not in data):
+        return jsonify({"error": "Dados incompletos"}), 400
+    
+    catalog = edital_catalog.get_catalog()
+    
+    if 'section' in data:
+        # Mesmos valores para todos os itens da seção
+        values = {field: data[field] for field in ('is_studied', 'confidence_level', 'notes') if field in data}
+        entries = [dict(values, edital_item_id=item['id']) for item in catalog.section_items(data['section'])]
+        if not entries:
+            return jsonify({"error": "Seção do edital não encontrada"}), 404
+    else:
+        entries = data['items']
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) and 'edital_item_id' in entry for entry in entries):
+            return jsonify({"error": "Dados incompletos"}), 400
+        if not all(_is_item_id(entry['edital_item_id']) for entry in entries):
+            return jsonify({"error": "edital_item_id inválido (use um inteiro)"}), 400
+        
+        # Verificar se os itens existem (catálogo em cache, sem consulta)
+        missing = [entry['edital_item_id'] for entry in entries if entry['edital_item_id'] not in catalog.positions]
+        if missing:
+            return jsonify({"error": "Item do edital não encontrado", "edital_item_ids": missing}), 404
+    
+    try:
+        updated = edital_progress.bulk_mark(user_id, entries)
+        db.session.commit()
+        return jsonify({"success": True, "updated": updated})
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Erro ao marcar itens do edital: {str(e)}")
+        return jsonify({"error": "Erro ao marcar itens do edital"}), 500
@@ -1,27 +1,30 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, current_app, Response
 from datetime import datetime, timedelta
 from src.models.user import db, User
 from src.models.topic import Topic, Revision
 from src.models.notification import Notification, NotificationPreference
+from src.services import read_models, spaced_repetition
+from src.services.notification_stream import hub, backlog_events
+from src.utils.pagination import paginate, paginated_response, invalid_cursor_response, InvalidCursor
+from src.utils.auth import login_required, current_user
+from src.utils.replica import use_primary
 import logging
 
 revisions_bp = Blueprint('revisions', __name__)
 logger = logging.getLogger(__name__)
 
 @revisions_bp.route('/', methods=['GET'])
+@login_required
 def get_revisions():
     """Obter todas as revisões do usuário atual"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     is_completed = request.args.get('is_completed')
     topic_id = request.args.get('topic_id')
     
     # Construir a consulta base
-    query = db.session.query(Revision).join(Topic).filter(Topic.user_id == user_id)
+    query = read_models.revisions.query().join(Topic, Revision.topic_id == Topic.id).filter(Topic.user_id == user_id)
     
     # Aplicar filtros se fornecidos
     if is_completed is not None:
@@ -31,18 +34,19 @@ def get_revisions():
     if topic_id:
         query = query.filter(Revision.topic_id == topic_id)
     
-    # Ordenar por data programada
-    revisions = query.order_by(Revision.scheduled_date).all()
+    # Ordenar por data programada, paginando por chave
+    try:
+        page = paginate(query, [Revision.scheduled_date, Revision.id])
+    except InvalidCursor:
+        return invalid_cursor_response()
     
-    return jsonify([revision.to_dict() for revision in revisions])
+    return paginated_response(read_models.revisions.to_dicts(page.items), page)
 
 @revisions_bp.route('/calendar', methods=['GET'])
+@login_required
 def get_calendar_revisions():
     """Obter revisões formatadas para visualização em calendário"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros para intervalo de datas (opcional)
     start_date = request.args.get('start')
@@ -71,12 +75,10 @@ def get_calendar_revisions():
     return jsonify([revision.to_calendar_dict() for revision in revisions])
 
 @revisions_bp.route('/<int:revision_id>', methods=['PUT'])
+@login_required
 def update_revision(revision_id):
     """Atualizar uma revisão específica"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Verificar se a revisão existe e pertence ao usuário
     revision = db.session.query(Revision).join(Topic).filter(
@@ -121,12 +123,10 @@ def update_revision(revision_id):
         return jsonify({"error": "Erro ao atualizar revisão"}), 500
 
 @revisions_bp.route('/mark-completed/<int:revision_id>', methods=['POST'])
+@login_required
 def mark_revision_completed(revision_id):
     """Marcar uma revisão como concluída"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Verificar se a revisão existe e pertence ao usuário
     revision = db.session.query(Revision).join(Topic).filter(
@@ -137,9 +137,22 @@ def mark_revision_completed(revision_id):
     if not revision:
         return jsonify({"error": "Revisão não encontrada ou acesso negado"}), 404
     
+    # Nota de lembrança opcional (0 a 5) para o agendamento adaptativo
+    data = request.get_json(silent=True) or {}
+    grade = data.get('grade')
+    if grade is not None:
+        try:
+            grade = spaced_repetition.parse_grade(grade)
+        except ValueError:
+            return jsonify({"error": "Nota inválida (use um inteiro de 0 a 5)"}), 400
+    
     revision.is_completed = True
     revision.completed_at = datetime.utcnow()
     
+    # Recalcular as revisões pendentes do tópico a partir da nota
+    if grade is not None:
+        spaced_repetition.reschedule_after_revision(revision, grade)
+    
     try:
         db.session.commit()
         return jsonify({"success": True, "message": "Revisão marcada como concluída"})
@@ -149,12 +162,11 @@ def mark_revision_completed(revision_id):
         return jsonify({"error": "Erro ao marcar revisão como concluída"}), 500
 
 @revisions_bp.route('/notifications/preferences', methods=['GET', 'POST'])
+@login_required
+@use_primary  # O GET cria as preferências padrão se ainda não existirem
 def notification_preferences():
     """Obter ou atualizar preferências de notificação"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     if request.method == 'GET':
         # Obter preferências atuais
@@ -195,36 +207,62 @@ def notification_preferences():
             return jsonify({"error": "Erro ao atualizar preferências de notificação"}), 500
 
 @revisions_bp.route('/notifications', methods=['GET'])
+@login_required
 def get_notifications():
     """Obter notificações do usuário"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     is_read = request.args.get('is_read')
     
     # Construir a consulta base
-    query = Notification.query.filter_by(user_id=user_id)
+    query = read_models.notifications.query().filter(Notification.user_id == user_id)
     
     # Aplicar filtros se fornecidos
     if is_read is not None:
         is_read = is_read.lower() == 'true'
         query = query.filter(Notification.is_read == is_read)
     
-    # Ordenar por data de criação (mais recentes primeiro)
-    notifications = query.order_by(Notification.created_at.desc()).all()
+    # Ordenar por data de criação (mais recentes primeiro), paginando por chave
+    try:
+        page = paginate(query, [Notification.created_at, Notification.id], descending=True)
+    except InvalidCursor:
+        return invalid_cursor_response()
     
-    return jsonify([notification.to_dict() for notification in notifications])
+    return paginated_response(read_models.notifications.to_dicts(page.items), page)
+
+@revisions_bp.route('/notifications/stream', methods=['GET'])
+@login_required
+@use_primary  # O backlog precisa incluir as notificações recém-gravadas
+def stream_notifications():
+    """Stream SSE com as notificações novas e os lembretes de revisão"""
+    user_id = current_user().id
+    
+    # Retomada: o navegador reenvia o último id recebido ao reconectar
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID inválido"}), 400
+    
+    # Inscrever antes de ler o backlog para não perder eventos entre as duas etapas
+    subscription = hub.subscribe(current_app._get_current_object(), user_id)
+    backlog = backlog_events(user_id, last_event_id) if last_event_id is not None else []
+    
+    return Response(
+        hub.stream(subscription, backlog, last_event_id or 0),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
 
 @revisions_bp.route('/notifications/mark-read/<int:notification_id>', methods=['POST'])
+@login_required
 def mark_notification_read(notification_id):
     """Marcar uma notificação como lida"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
     
@@ -242,12 +280,10 @@ def mark_notification_read(notification_id):
         return jsonify({"error": "Erro ao marcar notificação como lida"}), 500
 
 @revisions_bp.route('/create-notification', methods=['POST'])
+@login_required
 def create_notification():
     """Criar uma notificação manualmente (para testes)"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     data = request.json
     
     if not data or 'title' not in data or 'message' not in data:
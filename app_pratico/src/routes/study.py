@@ -1,8 +1,12 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 from src.models.user import db, User
 from src.models.topic import Topic
 from src.models.study import QuestionRecord, StudySession, EditalItem, EditalProgress
+from src.services import dashboard_rollup, edital_catalog, read_models
+from src.utils.pagination import paginate, paginated_response, invalid_cursor_response, InvalidCursor
+from src.utils.auth import login_required, current_user
+from sqlalchemy import func
 import logging
 
 study_bp = Blueprint('study', __name__)
@@ -10,12 +14,10 @@ logger = logging.getLogger(__name__)
 
 # Rotas para sessões de estudo
 @study_bp.route('/sessions', methods=['GET'])
+@login_required
 def get_study_sessions():
     """Obter todas as sessões de estudo do usuário atual"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     topic_id = request.args.get('topic_id')
@@ -23,7 +25,7 @@ def get_study_sessions():
     end_date = request.args.get('end_date')
     
     # Construir a consulta base
-    query = StudySession.query.filter_by(user_id=user_id)
+    query = read_models.study_sessions.query().filter(StudySession.user_id == user_id)
     
     # Aplicar filtros se fornecidos
     if topic_id:
@@ -43,18 +45,19 @@ def get_study_sessions():
         except ValueError:
             pass
     
-    # Ordenar por data de início (mais recentes primeiro)
-    sessions = query.order_by(StudySession.start_time.desc()).all()
+    # Ordenar por data de início (mais recentes primeiro), paginando por chave
+    try:
+        page = paginate(query, [StudySession.start_time, StudySession.id], descending=True)
+    except InvalidCursor:
+        return invalid_cursor_response()
     
-    return jsonify([session.to_dict() for session in sessions])
+    return paginated_response(read_models.study_sessions.to_dicts(page.items), page)
 
 @study_bp.route('/sessions', methods=['POST'])
+@login_required
 def create_study_session():
     """Criar uma nova sessão de estudo"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     data = request.json
     
     if not data:
@@ -84,6 +87,7 @@ def create_study_session():
     
     try:
         db.session.add(study_session)
+        dashboard_rollup.record_study_session(study_session)
         db.session.commit()
         return jsonify(study_session.to_dict()), 201
     except Exception as e:
@@ -92,12 +96,10 @@ def create_study_session():
         return jsonify({"error": "Erro ao criar sessão de estudo"}), 500
 
 @study_bp.route('/sessions/<int:session_id>', methods=['PUT'])
+@login_required
 def update_study_session(session_id):
     """Atualizar uma sessão de estudo existente"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Verificar se a sessão existe e pertence ao usuário
     study_session = StudySession.query.filter_by(id=session_id, user_id=user_id).first()
@@ -110,6 +112,9 @@ def update_study_session(session_id):
     if not data:
         return jsonify({"error": "Dados incompletos"}), 400
     
+    # Descontar a contribuição atual do rollup antes de alterar a sessão
+    dashboard_rollup.record_study_session(study_session, sign=-1)
+    
     # Atualizar campos permitidos
     if 'topic_id' in data:
         study_session.topic_id = data['topic_id']
@@ -131,6 +136,7 @@ def update_study_session(session_id):
             return jsonify({"error": "Formato de data inválido para end_time"}), 400
     
     try:
+        dashboard_rollup.record_study_session(study_session)
         db.session.commit()
         return jsonify(study_session.to_dict())
     except Exception as e:
@@ -139,12 +145,10 @@ def update_study_session(session_id):
         return jsonify({"error": "Erro ao atualizar sessão de estudo"}), 500
 
 @study_bp.route('/sessions/<int:session_id>/end', methods=['POST'])
+@login_required
 def end_study_session(session_id):
     """Finalizar uma sessão de estudo em andamento"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Verificar se a sessão existe e pertence ao usuário
     study_session = StudySession.query.filter_by(id=session_id, user_id=user_id).first()
@@ -156,10 +160,12 @@ def end_study_session(session_id):
         return jsonify({"error": "Esta sessão de estudo já foi finalizada"}), 400
     
     # Finalizar a sessão
+    dashboard_rollup.record_study_session(study_session, sign=-1)
     study_session.end_time = datetime.utcnow()
     study_session.calculate_duration()
     
     try:
+        dashboard_rollup.record_study_session(study_session)
         db.session.commit()
         return jsonify(study_session.to_dict())
     except Exception as e:
@@ -169,12 +175,10 @@ def end_study_session(session_id):
 
 # Rotas para registros de questões
 @study_bp.route('/questions', methods=['GET'])
+@login_required
 def get_question_records():
     """Obter todos os registros de questões do usuário atual"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     topic_id = request.args.get('topic_id')
@@ -183,7 +187,7 @@ def get_question_records():
     difficulty = request.args.get('difficulty_level')
     
     # Construir a consulta base
-    query = QuestionRecord.query.filter_by(user_id=user_id)
+    query = read_models.question_records.query().filter(QuestionRecord.user_id == user_id)
     
     # Aplicar filtros se fornecidos
     if topic_id:
@@ -206,18 +210,19 @@ def get_question_records():
         except ValueError:
             pass
     
-    # Ordenar por data (mais recentes primeiro)
-    records = query.order_by(QuestionRecord.date.desc()).all()
+    # Ordenar por data (mais recentes primeiro), paginando por chave
+    try:
+        page = paginate(query, [QuestionRecord.date, QuestionRecord.id], descending=True)
+    except InvalidCursor:
+        return invalid_cursor_response()
     
-    return jsonify([record.to_dict() for record in records])
+    return paginated_response(read_models.question_records.to_dicts(page.items), page)
 
 @study_bp.route('/questions', methods=['POST'])
+@login_required
 def create_question_record():
     """Criar um novo registro de questões"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     data = request.json
     
     if not data or 'total_questions' not in data or 'correct_answers' not in data:
@@ -252,6 +257,7 @@ def create_question_record():
     
     try:
         db.session.add(record)
+        dashboard_rollup.record_question_record(record)
         db.session.commit()
         return jsonify(record.to_dict()), 201
     except Exception as e:
@@ -260,12 +266,10 @@ def create_question_record():
         return jsonify({"error": "Erro ao criar registro de questões"}), 500
 
 @study_bp.route('/questions/<int:record_id>', methods=['PUT'])
+@login_required
 def update_question_record(record_id):
     """Atualizar um registro de questões existente"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Verificar se o registro existe e pertence ao usuário
     record = QuestionRecord.query.filter_by(id=record_id, user_id=user_id).first()
@@ -278,6 +282,9 @@ def update_question_record(record_id):
     if not data:
         return jsonify({"error": "Dados incompletos"}), 400
     
+    # Descontar a contribuição atual do rollup antes de alterar o registro
+    dashboard_rollup.record_question_record(record, sign=-1)
+    
     # Atualizar campos permitidos
     if 'topic_id' in data:
         record.topic_id = data['topic_id']
@@ -313,6 +320,7 @@ def update_question_record(record_id):
     record.calculate_accuracy()
     
     try:
+        dashboard_rollup.record_question_record(record)
         db.session.commit()
         return jsonify(record.to_dict())
     except Exception as e:
@@ -320,22 +328,76 @@ def update_question_record(record_id):
         logger.error(f"Erro ao atualizar registro de questões: {str(e)}")
         return jsonify({"error": "Erro ao atualizar registro de questões"}), 500
 
+# Rótulos e chaves dos agrupamentos por data (granularity)
+DATE_GRANULARITIES = {
+    'day': '%d/%m/%Y',
+    'week': '%d/%m/%Y',  # Rótulo é a segunda-feira que inicia a semana
+    'month': '%b/%Y'
+}
+
+DIFFICULTY_LEVELS = ['Fácil', 'Médio', 'Difícil']
+
+def _date_bucket(column, granularity):
+    """Expressão SQL que trunca uma data para o início do dia, semana ou mês"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.date_trunc(granularity, column)
+    
+    # SQLite: datas são texto ISO, truncadas com as funções de data nativas
+    if granularity == 'day':
+        return func.date(column)
+    if granularity == 'week':
+        return func.date(column, 'weekday 0', '-6 days')
+    return func.strftime('%Y-%m-01', column)
+
+def _bucket_datetime(value):
+    """Normalizar o valor do bucket (texto no SQLite, timestamp no Postgres)"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
 @study_bp.route('/questions/stats', methods=['GET'])
+@login_required
 def get_question_stats():
     """Obter estatísticas de desempenho em questões para visualização gráfica"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     group_by = request.args.get('group_by', 'topic')  # topic, date, difficulty
+    granularity = request.args.get('granularity', 'month')  # day, week, month (apenas para date)
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    # Filtrar por intervalo de datas
-    query = QuestionRecord.query.filter_by(user_id=user_id)
+    if granularity not in DATE_GRANULARITIES:
+        return jsonify({"error": "Granularidade inválida"}), 400
+    
+    # Cada agrupamento é uma única consulta agregada; as linhas não são carregadas
+    if group_by == 'topic':
+        # Agrupar por nome do tópico (registros sem tópico ficam em "Sem tópico")
+        key = func.coalesce(Topic.name, 'Sem tópico')
+        query = db.session.query(key).outerjoin(
+            Topic, Topic.id == QuestionRecord.topic_id
+        ).group_by(key).order_by(func.min(QuestionRecord.id))
     
+    elif group_by == 'date':
+        # Agrupar por dia, semana ou mês truncando a data no banco
+        key = _date_bucket(QuestionRecord.date, granularity)
+        query = db.session.query(key).group_by(key).order_by(key)
+    
+    elif group_by == 'difficulty':
+        # Agrupar por nível de dificuldade
+        key = QuestionRecord.difficulty_level
+        query = db.session.query(key).group_by(key)
+    
+    else:
+        return jsonify({"error": "Tipo de agrupamento inválido"}), 400
+    
+    query = query.add_columns(
+        func.sum(QuestionRecord.total_questions),
+        func.sum(QuestionRecord.correct_answers),
+        func.sum(QuestionRecord.wrong_answers)
+    ).filter(QuestionRecord.user_id == user_id)
+    
+    # Filtrar por intervalo de datas
     if start_date:
         try:
             start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
@@ -350,132 +412,46 @@ def get_question_stats():
         except ValueError:
             pass
     
-    records = query.all()
+    stats = {}
     
-    # Processar estatísticas de acordo com o agrupamento solicitado
-    if group_by == 'topic':
-        # Agrupar por tópico
-        stats = {}
-        for record in records:
-            topic_name = "Sem tópico"
-            if record.topic_id:
-                topic = Topic.query.get(record.topic_id)
-                if topic:
-                    topic_name = topic.name
-            
-            if topic_name not in stats:
-                stats[topic_name] = {
-                    'total_questions': 0,
-                    'correct_answers': 0,
-                    'wrong_answers': 0,
-                    'accuracy': 0
-                }
-            
-            stats[topic_name]['total_questions'] += record.total_questions
-            stats[topic_name]['correct_answers'] += record.correct_answers
-            stats[topic_name]['wrong_answers'] += record.wrong_answers
-        
-        # Calcular precisão para cada tópico
-        for topic_name in stats:
-            if stats[topic_name]['total_questions'] > 0:
-                stats[topic_name]['accuracy'] = (stats[topic_name]['correct_answers'] / stats[topic_name]['total_questions']) * 100
-        
-        # Formatar para visualização em gráfico
-        chart_data = {
-            'labels': list(stats.keys()),
-            'datasets': [
-                {
-                    'label': 'Acertos (%)',
-                    'data': [stats[topic]['accuracy'] for topic in stats]
-                },
-                {
-                    'label': 'Total de Questões',
-                    'data': [stats[topic]['total_questions'] for topic in stats]
-                }
-            ]
-        }
-    
-    elif group_by == 'date':
-        # Agrupar por mês
-        stats = {}
-        for record in records:
-            month_key = record.date.strftime('%Y-%m')
-            month_label = record.date.strftime('%b/%Y')
-            
-            if month_key not in stats:
-                stats[month_key] = {
-                    'label': month_label,
-                    'total_questions': 0,
-                    'correct_answers': 0,
-                    'wrong_answers': 0,
-                    'accuracy': 0
-                }
-            
-            stats[month_key]['total_questions'] += record.total_questions
-            stats[month_key]['correct_answers'] += record.correct_answers
-            stats[month_key]['wrong_answers'] += record.wrong_answers
-        
-        # Calcular precisão para cada mês
-        for month_key in stats:
-            if stats[month_key]['total_questions'] > 0:
-                stats[month_key]['accuracy'] = (stats[month_key]['correct_answers'] / stats[month_key]['total_questions']) * 100
-        
-        # Ordenar por data
-        sorted_months = sorted(stats.keys())
-        
-        # Formatar para visualização em gráfico
-        chart_data = {
-            'labels': [stats[month]['label'] for month in sorted_months],
-            'datasets': [
-                {
-                    'label': 'Acertos (%)',
-                    'data': [stats[month]['accuracy'] for month in sorted_months]
-                },
-                {
-                    'label': 'Total de Questões',
-                    'data': [stats[month]['total_questions'] for month in sorted_months]
-                }
-            ]
-        }
+    if group_by == 'difficulty':
+        # Os níveis conhecidos sempre aparecem, mesmo sem registros
+        for difficulty in DIFFICULTY_LEVELS + ['Não especificado']:
+            stats[difficulty] = {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0}
     
-    elif group_by == 'difficulty':
-        # Agrupar por nível de dificuldade
-        stats = {
-            'Fácil': {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0, 'accuracy': 0},
-            'Médio': {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0, 'accuracy': 0},
-            'Difícil': {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0, 'accuracy': 0},
-            'Não especificado': {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0, 'accuracy': 0}
-        }
-        
-        for record in records:
-            difficulty = record.difficulty_level if record.difficulty_level else 'Não especificado'
-            
-            stats[difficulty]['total_questions'] += record.total_questions
-            stats[difficulty]['correct_answers'] += record.correct_answers
-            stats[difficulty]['wrong_answers'] += record.wrong_answers
-        
-        # Calcular precisão para cada nível de dificuldade
-        for difficulty in stats:
-            if stats[difficulty]['total_questions'] > 0:
-                stats[difficulty]['accuracy'] = (stats[difficulty]['correct_answers'] / stats[difficulty]['total_questions']) * 100
+    for key_value, total_questions, correct_answers, wrong_answers in query.all():
+        if group_by == 'date':
+            label = _bucket_datetime(key_value).strftime(DATE_GRANULARITIES[granularity])
+        elif group_by == 'difficulty':
+            label = key_value if key_value else 'Não especificado'
+        else:
+            label = key_value
         
-        # Formatar para visualização em gráfico
-        chart_data = {
-            'labels': list(stats.keys()),
-            'datasets': [
-                {
-                    'label': 'Acertos (%)',
-                    'data': [stats[difficulty]['accuracy'] for difficulty in stats]
-                },
-                {
-                    'label': 'Total de Questões',
-                    'data': [stats[difficulty]['total_questions'] for difficulty in stats]
-                }
-            ]
-        }
-    
-    else:
-        return jsonify({"error": "Tipo de agrupamento inválido"}), 400
+        group_stats = stats.setdefault(label, {'total_questions': 0, 'correct_answers': 0, 'wrong_answers': 0})
+        group_stats['total_questions'] += total_questions or 0
+        group_stats['correct_answers'] += correct_answers or 0
+        group_stats['wrong_answers'] += wrong_answers or 0
+    
+    # Calcular precisão para cada grupo
+    for label in stats:
+        stats[label]['accuracy'] = 0
+        if stats[label]['total_questions'] > 0:
+            stats[label]['accuracy'] = (stats[label]['correct_answers'] / stats[label]['total_questions']) * 100
+    
+    # Formatar para visualização em gráfico
+    chart_data = {
+        'labels': list(stats.keys()),
+        'datasets': [
+            {
+                'label': 'Acertos (%)',
+                'data': [stats[label]['accuracy'] for label in stats]
+            },
+            {
+                'label': 'Total de Questões',
+                'data': [stats[label]['total_questions'] for label in stats]
+            }
+        ]
+    }
     
     return jsonify(chart_data)
 
@@ -486,28 +462,17 @@ def get_edital_items():
     # Parâmetros de filtro opcionais
     section = request.args.get('section')
     
-    # Construir a consulta base
-    query = EditalItem.query
-    
-    # Aplicar filtros se fornecidos
-    if section:
-        query = query.filter(EditalItem.section == section)
-    
-    # Ordenar por índice
-    items = query.order_by(EditalItem.order_index).all()
-    
-    return jsonify([item.to_dict() for item in items])
+    # Itens vêm do cache do catálogo (ETag/304 para quem já tem a versão)
+    return edital_catalog.catalog_response(('study', section), lambda catalog: catalog.section_items(section))
 
 @study_bp.route('/edital/progress', methods=['GET'])
+@login_required
 def get_edital_progress():
     """Obter progresso do usuário no edital"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
+    user_id = current_user().id
     
-    user_id = session['user_id']
-    
-    # Obter todos os itens do edital
-    edital_items = EditalItem.query.order_by(EditalItem.order_index).all()
+    # Obter todos os itens do edital (cache do catálogo)
+    edital_items = edital_catalog.get_catalog().items
     
     # Obter progresso do usuário
     progress_records = EditalProgress.query.filter_by(user_id=user_id).all()
@@ -518,9 +483,9 @@ def get_edital_progress():
     # Construir resposta combinando itens e progresso
     result = []
     for item in edital_items:
-        progress = progress_map.get(item.id)
+        progress = progress_map.get(item['id'])
         
-        item_data = item.to_dict()
+        item_data = dict(item)
         if progress:
             item_data.update({
                 'is_studied': progress.is_studied,
@@ -541,12 +506,10 @@ def get_edital_progress():
     return jsonify(result)
 
 @study_bp.route('/edital/mark', methods=['POST'])
+@login_required
 def mark_edital_item():
     """Marcar um item do edital como estudado"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
-    
-    user_id = session['user_id']
+    user_id = current_user().id
     data = request.json
     
     if not data or 'edital_item_id' not in data:
@@ -554,7 +517,7 @@ def mark_edital_item():
     
     # Verificar se o item do edital existe
     edital_item = EditalItem.query.get(data['edital_item_id'])
-    if not edital_item:
+    if not edital_item or edital_item.retired_at is not None:
         return jsonify({"error": "Item do edital não encontrado"}), 404
     
     # Verificar se já existe um registro de progresso para este item
@@ -572,7 +535,9 @@ def mark_edital_item():
         db.session.add(progress)
     
     # Atualizar campos
+    was_studied = progress.is_studied
     progress.is_studied = data.get('is_studied', True)
+    dashboard_rollup.record_edital_studied(user_id, was_studied, progress.is_studied)
     
     if progress.is_studied and not progress.study_date:
         progress.study_date = datetime.utcnow()
@@ -592,104 +557,64 @@ def mark_edital_item():
         return jsonify({"error": "Erro ao marcar item do edital"}), 500
 
 @study_bp.route('/dashboard', methods=['GET'])
+@login_required
 def get_dashboard_data():
     """Obter dados consolidados para o dashboard"""
-    if 'user_id' not in session:
-        return jsonify({"error": "Usuário não autenticado"}), 401
+    user_id = current_user().id
     
-    user_id = session['user_id']
+    # Os agregados vêm da tabela user_dashboard_rollup, mantida pelas rotas de
+    # escrita; a leitura é uma única consulta indexada por user_id
+    rows = dashboard_rollup.get_user_rollup(user_id)
+    totals = rows[0]
+    groups = rows[1:]
     
     # 1. Progresso por grupo de matérias
-    topics = Topic.query.filter_by(user_id=user_id).all()
-    topics_by_group = {}
-    
-    for topic in topics:
-        if topic.group_id not in topics_by_group:
-            topics_by_group[topic.group_id] = {
-                'group_id': topic.group_id,
-                'group_name': topic.group_name,
-                'total': 0,
-                'completed': 0,
-                'percentage': 0
-            }
-        
-        topics_by_group[topic.group_id]['total'] += 1
-        if topic.is_completed:
-            topics_by_group[topic.group_id]['completed'] += 1
-    
-    # Calcular percentuais
-    for group_id in topics_by_group:
-        if topics_by_group[group_id]['total'] > 0:
-            topics_by_group[group_id]['percentage'] = (topics_by_group[group_id]['completed'] / topics_by_group[group_id]['total']) * 100
+    topics_by_group = [
+        {
+            'group_id': row.group_id,
+            'group_name': row.group_name,
+            'total': row.topics_total,
+            'completed': row.topics_completed,
+            'percentage': (row.topics_completed / row.topics_total) * 100
+        }
+        for row in groups if row.topics_total > 0
+    ]
     
     # 2. Horas estudadas
-    study_sessions = StudySession.query.filter_by(user_id=user_id).all()
-    total_minutes = sum(session.duration_minutes or 0 for session in study_sessions)
-    total_hours = total_minutes / 60
-    
-    # Horas por grupo
-    hours_by_group = {}
-    for session in study_sessions:
-        if not session.topic_id or not session.duration_minutes:
-            continue
-        
-        topic = Topic.query.get(session.topic_id)
-        if not topic:
-            continue
-        
-        if topic.group_id not in hours_by_group:
-            hours_by_group[topic.group_id] = {
-                'group_name': topic.group_name,
-                'minutes': 0
-            }
-        
-        hours_by_group[topic.group_id]['minutes'] += session.duration_minutes
-    
-    # Converter minutos para horas
-    for group_id in hours_by_group:
-        hours_by_group[group_id]['hours'] = hours_by_group[group_id]['minutes'] / 60
+    total_hours = totals.study_minutes / 60
+    
+    # Horas por grupo (sessões sem tópico ou sem duração não entram)
+    hours_by_group = [
+        {
+            'group_name': row.group_name,
+            'minutes': row.study_minutes,
+            'hours': row.study_minutes / 60
+        }
+        for row in groups if row.study_sessions > 0
+    ]
     
     # 3. Desempenho em questões
-    question_records = QuestionRecord.query.filter_by(user_id=user_id).all()
-    total_questions = sum(record.total_questions for record in question_records)
-    total_correct = sum(record.correct_answers for record in question_records)
+    total_questions = totals.questions_total
+    total_correct = totals.questions_correct
     
     overall_accuracy = 0
     if total_questions > 0:
         overall_accuracy = (total_correct / total_questions) * 100
     
     # Desempenho por grupo
-    accuracy_by_group = {}
-    for record in question_records:
-        if not record.topic_id:
-            continue
-        
-        topic = Topic.query.get(record.topic_id)
-        if not topic:
-            continue
-        
-        if topic.group_id not in accuracy_by_group:
-            accuracy_by_group[topic.group_id] = {
-                'group_name': topic.group_name,
-                'total_questions': 0,
-                'correct_answers': 0,
-                'accuracy': 0
-            }
-        
-        accuracy_by_group[topic.group_id]['total_questions'] += record.total_questions
-        accuracy_by_group[topic.group_id]['correct_answers'] += record.correct_answers
-    
-    # Calcular precisão por grupo
-    for group_id in accuracy_by_group:
-        if accuracy_by_group[group_id]['total_questions'] > 0:
-            accuracy_by_group[group_id]['accuracy'] = (
-                accuracy_by_group[group_id]['correct_answers'] / 
-                accuracy_by_group[group_id]['total_questions']
-            ) * 100
+    accuracy_by_group = [
+        {
+            'group_name': row.group_name,
+            'total_questions': row.questions_total,
+            'correct_answers': row.questions_correct,
+            'accuracy': (row.questions_correct / row.questions_total) * 100 if row.questions_total > 0 else 0
+        }
+        for row in groups if row.question_records > 0
+    ]
     
     # 4. Progresso no edital
-    edital_items = EditalItem.query.count()
-    studied_items = EditalProgress.query.filter_by(user_id=user_id, is_studied=True).count()
+    edital_items = len(edital_catalog.get_catalog().items)
+    studied_items = totals.edital_studied
     
     edital_progress = 0
     if edital_items > 0:
@@ -697,16 +622,16 @@ def get_dashboard_data():
     
     # Consolidar todos os dados
     dashboard_data = {
-        'progress_by_group': list(topics_by_group.values()),
+        'progress_by_group': topics_by_group,
         'study_hours': {
             'total_hours': total_hours,
-            'by_group': list(hours_by_group.values())
+            'by_group': hours_by_group
         },
         'question_performance': {
             'total_questions': total_questions,
             'total_correct': total_correct,
             'overall_accuracy': overall_accuracy,
-            'by_group': list(accuracy_by_group.values())
+            'by_group': accuracy_by_group
         },
         'edital_progress': {
             'total_items': edital_items,
@@ -1,27 +1,34 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
 from src.models.topic import Topic, Revision
 from src.models.user import db
+from src.services import dashboard_rollup, read_models, spaced_repetition
+from src.services.revision_schedule import create_revision_schedules
 from datetime import datetime, timedelta
+from src.utils.pagination import paginate, paginated_response, invalid_cursor_response, InvalidCursor, MAX_PAGE_SIZE
+from src.utils.auth import login_required, current_user
+import logging
 
 topics_bp = Blueprint('topics', __name__)
+logger = logging.getLogger(__name__)
 
 @topics_bp.route('/', methods=['GET'])
+@login_required
 def get_topics():
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
-    # Buscar todos os tópicos do usuário
-    topics = Topic.query.filter_by(user_id=user_id).all()
-    return jsonify({
-        'topics': [topic.to_dict() for topic in topics]
-    }), 200
+    # Buscar os tópicos do usuário (página padrão ampla: os seletores da
+    # interface seguem o X-Next-Cursor até carregar todos)
+    try:
+        page = paginate(read_models.topics.query().filter(Topic.user_id == user_id), [Topic.id], default_limit=MAX_PAGE_SIZE)
+    except InvalidCursor:
+        return invalid_cursor_response()
+    
+    return paginated_response({'topics': read_models.topics.to_dicts(page.items)}, page)
 
 @topics_bp.route('/', methods=['POST'])
+@login_required
 def create_topic():
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     data = request.get_json()
     
@@ -40,6 +47,7 @@ def create_topic():
     )
     
     db.session.add(new_topic)
+    dashboard_rollup.record_topic(new_topic)
     db.session.commit()
     
     # Se o usuário quiser criar revisões automaticamente
@@ -56,10 +64,9 @@ def create_topic():
     }), 201
 
 @topics_bp.route('/<int:topic_id>', methods=['PUT'])
+@login_required
 def update_topic(topic_id):
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     # Buscar o tópico
     topic = Topic.query.filter_by(id=topic_id, user_id=user_id).first()
@@ -68,6 +75,9 @@ def update_topic(topic_id):
     
     data = request.get_json()
     
+    # Descontar a contribuição atual do rollup antes de alterar o tópico
+    dashboard_rollup.record_topic(topic, sign=-1)
+    
     # Atualizar campos
     if 'name' in data:
         topic.name = data['name']
@@ -82,6 +92,7 @@ def update_topic(topic_id):
     if 'confidence_level' in data:
         topic.confidence_level = data['confidence_level']
     
+    dashboard_rollup.record_topic(topic)
     db.session.commit()
     
     return jsonify({
@@ -90,16 +101,16 @@ def update_topic(topic_id):
     }), 200
 
 @topics_bp.route('/<int:topic_id>', methods=['DELETE'])
+@login_required
 def delete_topic(topic_id):
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     # Buscar o tópico
     topic = Topic.query.filter_by(id=topic_id, user_id=user_id).first()
     if not topic:
         return jsonify({'error': 'Tópico não encontrado'}), 404
     
+    dashboard_rollup.record_topic_deletion(topic)
     db.session.delete(topic)
     db.session.commit()
     
@@ -108,28 +119,25 @@ def delete_topic(topic_id):
     }), 200
 
 @topics_bp.route('/<int:topic_id>/revisions', methods=['GET'])
+@login_required
 def get_revisions(topic_id):
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     # Verificar se o tópico pertence ao usuário
-    topic = Topic.query.filter_by(id=topic_id, user_id=user_id).first()
-    if not topic:
+    if not db.session.query(Topic.id).filter_by(id=topic_id, user_id=user_id).first():
         return jsonify({'error': 'Tópico não encontrado'}), 404
     
     # Buscar revisões do tópico
-    revisions = Revision.query.filter_by(topic_id=topic_id).all()
+    revisions = read_models.revisions.query().filter(Revision.topic_id == topic_id).all()
     
     return jsonify({
-        'revisions': [revision.to_dict() for revision in revisions]
+        'revisions': read_models.revisions.to_dicts(revisions)
     }), 200
 
 @topics_bp.route('/<int:topic_id>/revisions', methods=['POST'])
+@login_required
 def create_revision_schedule_endpoint(topic_id):
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     # Verificar se o tópico pertence ao usuário
     topic = Topic.query.filter_by(id=topic_id, user_id=user_id).first()
@@ -146,51 +154,53 @@ def create_revision_schedule_endpoint(topic_id):
 def create_revision_schedule(topic_id):
     """Função interna para criar revisões programadas para um tópico"""
     # Verificar se o tópico existe
-    topic = Topic.query.get(topic_id)
+    topic = db.session.get(Topic, topic_id)
     if not topic:
         return
     
-    # Definir intervalos para as revisões (em dias)
-    intervals = [1, 7, 15, 30, 60]
-    
-    # Data inicial (hoje)
-    start_date = datetime.utcnow()
-    
-    # Criar revisões
-    for i, interval in enumerate(intervals):
-        if i == 0:
-            # Primeira revisão: 1 dia após hoje
-            revision_date = start_date + timedelta(days=interval)
-        else:
-            # Revisões subsequentes: baseadas na revisão anterior
-            previous_revision = Revision.query.filter_by(
-                topic_id=topic_id, 
-                revision_number=i
-            ).first()
-            
-            if previous_revision:
-                revision_date = previous_revision.scheduled_date + timedelta(days=interval)
-            else:
-                # Fallback se algo der errado
-                revision_date = start_date + timedelta(days=sum(intervals[:i+1]))
-        
-        # Criar nova revisão
-        new_revision = Revision(
-            topic_id=topic_id,
-            scheduled_date=revision_date,
-            revision_number=i+1,
-            is_completed=False
-        )
-        
-        db.session.add(new_revision)
-    
+    # Datas calculadas em memória e inseridas em um único INSERT
+    create_revision_schedules([topic_id])
     db.session.commit()
 
+@topics_bp.route('/revisions/bulk', methods=['POST'])
+@login_required
+def create_revision_schedules_endpoint():
+    """Criar cronogramas de revisão para vários tópicos em uma única transação"""
+    user_id = current_user().id
+    
+    data = request.get_json() or {}
+    
+    # Considerar apenas tópicos do usuário
+    query = db.session.query(Topic.id).filter(Topic.user_id == user_id)
+    
+    if data.get('all_unscheduled'):
+        # Todos os tópicos que ainda não têm nenhuma revisão
+        query = query.filter(~Topic.revisions.any())
+    elif isinstance(data.get('topic_ids'), list) and data['topic_ids']:
+        query = query.filter(Topic.id.in_(data['topic_ids']))
+    else:
+        return jsonify({'error': 'Informe topic_ids ou all_unscheduled'}), 400
+    
+    topic_ids = [topic_id for (topic_id,) in query.all()]
+    
+    try:
+        created = create_revision_schedules(topic_ids)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("Erro ao criar cronogramas de revisão")
+        return jsonify({'error': 'Erro ao criar cronogramas de revisão'}), 500
+    
+    return jsonify({
+        'message': 'Cronogramas de revisões criados com sucesso',
+        'topic_ids': topic_ids,
+        'created_revisions': created
+    }), 201
+
 @topics_bp.route('/revisions/<int:revision_id>', methods=['PUT'])
+@login_required
 def update_revision(revision_id):
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
+    user_id = current_user().id
     
     # Buscar a revisão
     revision = Revision.query.get(revision_id)
@@ -204,6 +214,14 @@ def update_revision(revision_id):
     
     data = request.get_json()
     
+    # Nota de lembrança opcional (0 a 5) para o agendamento adaptativo
+    grade = data.get('grade')
+    if grade is not None:
+        try:
+            grade = spaced_repetition.parse_grade(grade)
+        except ValueError:
+            return jsonify({'error': 'Nota inválida (use um inteiro de 0 a 5)'}), 400
+    
     # Atualizar campos
     if 'is_completed' in data:
         revision.is_completed = data['is_completed']
@@ -221,6 +239,10 @@ def update_revision(revision_id):
         except ValueError:
             return jsonify({'error': 'Formato de data inválido'}), 400
     
+    # Recalcular as revisões pendentes do tópico a partir da nota
+    if grade is not None and revision.is_completed:
+        spaced_repetition.reschedule_after_revision(revision, grade)
+    
     db.session.commit()
     
     return jsonify({
@@ -229,21 +251,18 @@ def update_revision(revision_id):
     }), 200
 
 @topics_bp.route('/upcoming-revisions', methods=['GET'])
+@login_required
 def get_upcoming_revisions():
-    user_id = session.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'Não autorizado'}), 401
-    
-    # Buscar tópicos do usuário
-    topics = Topic.query.filter_by(user_id=user_id).all()
-    topic_ids = [topic.id for topic in topics]
+    user_id = current_user().id
     
     # Parâmetros de filtro opcionais
     days_ahead = request.args.get('days', default=30, type=int)  # Padrão: próximos 30 dias
     include_completed = request.args.get('include_completed', default='false', type=str).lower() == 'true'
     
-    # Construir a consulta base
-    query = Revision.query.filter(Revision.topic_id.in_(topic_ids))
+    # Uma única consulta: revisões do usuário com apenas as colunas necessárias do tópico
+    query = db.session.query(
+        Revision, Topic.name, Topic.group_name, Topic.description
+    ).join(Topic, Topic.id == Revision.topic_id).filter(Topic.user_id == user_id)
     
     # Aplicar filtro de data
     if days_ahead > 0:
@@ -253,22 +272,23 @@ def get_upcoming_revisions():
     if not include_completed:
         query = query.filter(Revision.is_completed == False)
     
-    # Ordenar por data
-    upcoming_revisions = query.order_by(Revision.scheduled_date).all()
+    # Ordenar por data (id desempata revisões no mesmo horário), paginando por chave
+    try:
+        page = paginate(
+            query, [Revision.scheduled_date, Revision.id],
+            key=lambda row: [row[0].scheduled_date, row[0].id]
+        )
+    except InvalidCursor:
+        return invalid_cursor_response()
     
     # Preparar dados para retorno (formato plano para facilitar consumo pelo frontend)
     result = []
-    for revision in upcoming_revisions:
-        topic = Topic.query.get(revision.topic_id)
-        
-        # Criar um dicionário plano com todos os campos necessários
+    for revision, topic_name, topic_group, topic_description in page.items:
         revision_dict = revision.to_dict()
-        revision_dict['topic_name'] = topic.name if topic else 'Tópico desconhecido'
-        revision_dict['topic_group'] = topic.group_name if topic else ''
-        revision_dict['topic_description'] = topic.description if topic else ''
+        revision_dict['topic_name'] = topic_name
+        revision_dict['topic_group'] = topic_group
+        revision_dict['topic_description'] = topic_description
         
         result.append(revision_dict)
     
-    return jsonify({
-        'upcoming_revisions': result
-    }), 200
+    return paginated_response({'upcoming_revisions': result}, page)
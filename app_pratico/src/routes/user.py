@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.utils.auth import user_changed
 
 user_bp = Blueprint('user', __name__)
 
@@ -28,12 +29,14 @@ def update_user(user_id):
     data = request.json
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
+    user_changed(user)
     db.session.commit()
     return jsonify(user.to_dict())
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
+    user_changed(user)
     db.session.delete(user)
     db.session.commit()
     return '', 204
@@ -0,0 +1,276 @@
+"""
+Manutenção incremental da tabela user_dashboard_rollup.
+
+Cada rota de escrita chama as funções record_* antes do commit, na mesma
+transação da alteração. Para atualizações, a contribuição antiga é removida
+(sign=-1) antes de alterar o objeto e a nova é somada depois.
+
+Usuários sem a linha de totais (group_id=0) ainda não foram inicializados:
+os deltas são ignorados e o dashboard reconstrói o rollup na primeira leitura.
+"""
+
+from datetime import datetime
+from sqlalchemy import func, case, and_, insert, update
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db, User
+from src.models.topic import Topic
+from src.models.study import StudySession, QuestionRecord, EditalItem, EditalProgress
+from src.models.dashboard import UserDashboardRollup, TOTALS_GROUP_ID
+from src.utils.replica import stick_to_primary
+
+COUNTERS = (
+    'topics_total', 'topics_completed',
+    'study_sessions', 'study_minutes',
+    'question_records', 'questions_total', 'questions_correct',
+    'edital_studied'
+)
+
+def _increment(user_id, group_id, group_name, deltas, create):
+    """Somar deltas à linha (user_id, group_id); retorna False se a linha não existir"""
+    values = {
+        column: getattr(UserDashboardRollup, column) + delta
+        for column, delta in deltas.items() if delta
+    }
+    values['updated_at'] = datetime.utcnow()
+
+    result = db.session.execute(
+        update(UserDashboardRollup)
+        .where(UserDashboardRollup.user_id == user_id, UserDashboardRollup.group_id == group_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        return True
+
+    if not create:
+        return False
+
+    db.session.execute(insert(UserDashboardRollup).values(
+        user_id=user_id,
+        group_id=group_id,
+        group_name=group_name,
+        **{column: delta for column, delta in deltas.items() if delta}
+    ))
+    return True
+
+def _apply(user_id, totals_deltas, group_deltas=()):
+    """Aplicar deltas na linha de totais e nas linhas de grupo do usuário"""
+    if not _increment(user_id, TOTALS_GROUP_ID, None, totals_deltas, create=False):
+        return
+
+    for (group_id, group_name), deltas in group_deltas:
+        _increment(user_id, group_id, group_name, deltas, create=True)
+
+def _topic_group(topic_id):
+    if not topic_id:
+        return None
+    return db.session.query(Topic.group_id, Topic.group_name).filter(Topic.id == topic_id).first()
+
+def record_topic(topic, sign=1):
+    """Contabilizar (ou descontar, com sign=-1) um tópico"""
+    deltas = {
+        'topics_total': sign,
+        'topics_completed': sign if topic.is_completed else 0
+    }
+    _apply(topic.user_id, deltas, [((topic.group_id, topic.group_name), deltas)])
+
+def record_topic_deletion(topic):
+    """Descontar um tópico excluído e a atividade que era agrupada por ele"""
+    record_topic(topic, sign=-1)
+    group = (topic.group_id, topic.group_name)
+
+    # Sessões e questões continuam nos totais, mas deixam de contar no grupo
+    sessions = db.session.query(
+        StudySession.user_id,
+        func.count(StudySession.id),
+        func.sum(StudySession.duration_minutes)
+    ).filter(
+        StudySession.topic_id == topic.id,
+        StudySession.duration_minutes != None,
+        StudySession.duration_minutes != 0
+    ).group_by(StudySession.user_id).all()
+
+    for user_id, count, minutes in sessions:
+        _apply(user_id, {}, [(group, {'study_sessions': -count, 'study_minutes': -minutes})])
+
+    records = db.session.query(
+        QuestionRecord.user_id,
+        func.count(QuestionRecord.id),
+        func.sum(QuestionRecord.total_questions),
+        func.sum(QuestionRecord.correct_answers)
+    ).filter(
+        QuestionRecord.topic_id == topic.id
+    ).group_by(QuestionRecord.user_id).all()
+
+    for user_id, count, total, correct in records:
+        _apply(user_id, {}, [(group, {
+            'question_records': -count,
+            'questions_total': -total,
+            'questions_correct': -correct
+        })])
+
+def record_study_session(study_session, sign=1):
+    """Contabilizar (ou descontar, com sign=-1) uma sessão de estudo"""
+    minutes = study_session.duration_minutes or 0
+    deltas = {
+        'study_sessions': sign if minutes else 0,
+        'study_minutes': sign * minutes
+    }
+
+    group_deltas = []
+    if minutes:
+        group = _topic_group(study_session.topic_id)
+        if group:
+            group_deltas.append((tuple(group), deltas))
+
+    _apply(study_session.user_id, deltas, group_deltas)
+
+def record_question_record(record, sign=1):
+    """Contabilizar (ou descontar, com sign=-1) um registro de questões"""
+    deltas = {
+        'question_records': sign,
+        'questions_total': sign * (record.total_questions or 0),
+        'questions_correct': sign * (record.correct_answers or 0)
+    }
+
+    group_deltas = []
+    group = _topic_group(record.topic_id)
+    if group:
+        group_deltas.append((tuple(group), deltas))
+
+    _apply(record.user_id, deltas, group_deltas)
+
+def record_edital_studied(user_id, was_studied, is_studied):
+    """Atualizar a contagem de itens estudados quando is_studied muda"""
+    record_edital_studied_delta(user_id, int(bool(is_studied)) - int(bool(was_studied)))
+
+def record_edital_studied_delta(user_id, delta):
+    """Somar delta à contagem de itens estudados (marcações em lote)"""
+    if delta:
+        _apply(user_id, {'edital_studied': delta})
+
+def rebuild_dashboard_rollup(user_id=None):
+    """Recalcular o rollup a partir do histórico completo (corrige desvios)"""
+    rows = {}
+
+    def row(row_user_id, group_id, group_name=None):
+        key = (row_user_id, group_id)
+        if key not in rows:
+            rows[key] = dict(
+                {column: 0 for column in COUNTERS},
+                user_id=row_user_id,
+                group_id=group_id,
+                group_name=group_name,
+                updated_at=datetime.utcnow()
+            )
+        return rows[key]
+
+    def scoped(query, column):
+        return query.filter(column == user_id) if user_id is not None else query
+
+    # Todo usuário recebe a linha de totais, mesmo sem histórico
+    for (row_user_id,) in scoped(db.session.query(User.id), User.id):
+        row(row_user_id, TOTALS_GROUP_ID)
+
+    # Tópicos
+    completed = func.sum(case((Topic.is_completed == True, 1), else_=0))
+    topics = scoped(db.session.query(
+        Topic.user_id, Topic.group_id, func.min(Topic.group_name), func.count(Topic.id), completed
+    ), Topic.user_id).group_by(Topic.user_id, Topic.group_id)
+
+    for row_user_id, group_id, group_name, total, done in topics:
+        for target in (row(row_user_id, TOTALS_GROUP_ID), row(row_user_id, group_id, group_name)):
+            target['topics_total'] += total
+            target['topics_completed'] += done or 0
+
+    # Sessões de estudo
+    has_duration = and_(StudySession.duration_minutes != None, StudySession.duration_minutes != 0)
+    session_count = func.sum(case((has_duration, 1), else_=0))
+    session_minutes = func.coalesce(func.sum(StudySession.duration_minutes), 0)
+
+    totals = scoped(db.session.query(
+        StudySession.user_id, session_count, session_minutes
+    ), StudySession.user_id).group_by(StudySession.user_id)
+
+    for row_user_id, count, minutes in totals:
+        target = row(row_user_id, TOTALS_GROUP_ID)
+        target['study_sessions'] = count or 0
+        target['study_minutes'] = minutes
+
+    by_group = scoped(db.session.query(
+        StudySession.user_id, Topic.group_id, func.min(Topic.group_name),
+        func.count(StudySession.id), func.sum(StudySession.duration_minutes)
+    ), StudySession.user_id).join(
+        Topic, Topic.id == StudySession.topic_id
+    ).filter(has_duration).group_by(StudySession.user_id, Topic.group_id)
+
+    for row_user_id, group_id, group_name, count, minutes in by_group:
+        target = row(row_user_id, group_id, group_name)
+        target['study_sessions'] = count
+        target['study_minutes'] = minutes
+
+    # Registros de questões
+    question_sums = (
+        func.count(QuestionRecord.id),
+        func.coalesce(func.sum(QuestionRecord.total_questions), 0),
+        func.coalesce(func.sum(QuestionRecord.correct_answers), 0)
+    )
+
+    totals = scoped(db.session.query(
+        QuestionRecord.user_id, *question_sums
+    ), QuestionRecord.user_id).group_by(QuestionRecord.user_id)
+
+    for row_user_id, count, total, correct in totals:
+        target = row(row_user_id, TOTALS_GROUP_ID)
+        target.update(question_records=count, questions_total=total, questions_correct=correct)
+
+    by_group = scoped(db.session.query(
+        QuestionRecord.user_id, Topic.group_id, func.min(Topic.group_name), *question_sums
+    ), QuestionRecord.user_id).join(
+        Topic, Topic.id == QuestionRecord.topic_id
+    ).group_by(QuestionRecord.user_id, Topic.group_id)
+
+    for row_user_id, group_id, group_name, count, total, correct in by_group:
+        target = row(row_user_id, group_id, group_name)
+        target.update(question_records=count, questions_total=total, questions_correct=correct)
+
+    # Itens do edital estudados
+    studied = scoped(db.session.query(
+        EditalProgress.user_id, func.count(EditalProgress.id)
+    ), EditalProgress.user_id).join(
+        EditalItem, EditalItem.id == EditalProgress.edital_item_id
+    ).filter(
+        EditalProgress.is_studied == True,
+        EditalItem.retired_at == None
+    ).group_by(EditalProgress.user_id)
+
+    for row_user_id, count in studied:
+        row(row_user_id, TOTALS_GROUP_ID)['edital_studied'] = count
+
+    # Substituir as linhas existentes
+    scoped(UserDashboardRollup.query, UserDashboardRollup.user_id).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(UserDashboardRollup), list(rows.values()))
+
+    return len(rows)
+
+def get_user_rollup(user_id):
+    """Obter as linhas de rollup do usuário, inicializando-as se necessário"""
+    def load():
+        return UserDashboardRollup.query.filter_by(user_id=user_id).order_by(UserDashboardRollup.group_id).all()
+
+    rows = load()
+    if rows and rows[0].group_id == TOTALS_GROUP_ID:
+        return rows
+
+    # A reconstrução lê o histórico e regrava o rollup: tudo no primário,
+    # mesmo que a leitura acima tenha vindo de uma réplica atrasada
+    stick_to_primary()
+    try:
+        rebuild_dashboard_rollup(user_id)
+        db.session.commit()
+    except IntegrityError:
+        # Outra requisição inicializou o rollup ao mesmo tempo
+        db.session.rollback()
+
+    return load()
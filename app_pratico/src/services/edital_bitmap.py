@@ -0,0 +1,78 @@
+"""
+Representação compacta do progresso de um usuário no edital.
+
+A posição de cada item é o seu índice no catálogo ativo (ordenado por
+order_index). O progresso vira:
+
+- studied: bitset com um bit por item (bit i = item na posição i, bits
+  menos significativos primeiro em cada byte);
+- confidence: array com 2 bits por item (4 itens por byte, também a partir
+  dos bits menos significativos), com os códigos de CONFIDENCE_LEVELS e
+  OTHER_CONFIDENCE para valores fora da lista.
+
+As estatísticas saem de contagens de bits (popcount) sobre inteiros
+Python, sem percorrer a lista de itens.
+"""
+
+import base64
+
+CONFIDENCE_LEVELS = ['Baixo', 'Médio', 'Alto']  # Códigos 0, 1 e 2
+OTHER_CONFIDENCE = 3
+CONFIDENCE_CODES = {level: code for code, level in enumerate(CONFIDENCE_LEVELS)}
+
+class ProgressBitmap:
+    __slots__ = ('size', 'studied', 'level_bits', 'confidence')
+
+    def __init__(self, size):
+        self.size = size
+        self.studied = 0
+        self.level_bits = [0, 0, 0, 0]  # Um bitset por código de confiança
+        self.confidence = bytearray((size + 3) // 4)  # Código 0 (Baixo) por padrão
+
+    @classmethod
+    def from_records(cls, positions, records):
+        """Montar a partir de (edital_item_id, is_studied, confidence_level)
+
+        positions mapeia o id do item para a sua posição no catálogo; itens
+        fora do catálogo ativo (retirados) são ignorados.
+        """
+        bitmap = cls(len(positions))
+        for item_id, is_studied, confidence_level in records:
+            position = positions.get(item_id)
+            if position is not None:
+                bitmap.set(position, is_studied, confidence_level)
+        return bitmap
+
+    def set(self, position, is_studied, confidence_level):
+        bit = 1 << position
+        if is_studied:
+            self.studied |= bit
+
+        code = CONFIDENCE_CODES.get(confidence_level, OTHER_CONFIDENCE)
+        self.level_bits[code] |= bit
+        shift = (position % 4) * 2
+        byte = self.confidence[position // 4] & ~(0b11 << shift)
+        self.confidence[position // 4] = byte | (code << shift)
+
+    def stats(self):
+        """Estatísticas de progresso a partir das contagens de bits"""
+        studied_items = self.studied.bit_count()
+        confidence_stats = {
+            level: (self.studied & self.level_bits[code]).bit_count()
+            for code, level in enumerate(CONFIDENCE_LEVELS)
+        }
+
+        return {
+            "total_items": self.size,
+            "studied_items": studied_items,
+            "progress_percentage": (studied_items / self.size * 100) if self.size > 0 else 0,
+            "confidence_stats": confidence_stats
+        }
+
+    def to_payload(self):
+        """Bitsets em base64 para o cliente"""
+        studied = self.studied.to_bytes((self.size + 7) // 8, 'little')
+        return {
+            "studied": base64.b64encode(studied).decode('ascii'),
+            "confidence": base64.b64encode(bytes(self.confidence)).decode('ascii')
+        }
@@ -0,0 +1,131 @@
+"""
+Cache em memória do catálogo do edital.
+
+Os itens do edital são globais e quase nunca mudam, então cada processo
+guarda a lista serializada, as seções e os corpos JSON já codificados,
+sob o carimbo de versão da tabela edital_catalog_version. A importação e
+a recarga do edital incrementam esse carimbo (bump_catalog_version); os
+processos conferem a versão no banco no máximo a cada
+VERSION_CHECK_INTERVAL segundos, e o processo que fez a alteração confere
+logo após o commit.
+
+As respostas levam um ETag forte derivado da versão, então clientes que
+já têm o catálogo recebem 304 sem consulta ao banco nem codificação JSON.
+"""
+
+import hashlib
+import threading
+import time
+from flask import current_app, request
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.study import EditalItem, EditalCatalogVersion
+
+# Segundos entre as conferências da versão no banco
+VERSION_CHECK_INTERVAL = 30
+
+# Limite de corpos em cache por versão (o filtro por seção vem do cliente)
+MAX_CACHED_RESPONSES = 256
+
+# Marca em Session.info: a transação alterou a versão do catálogo
+BUMPED_KEY = 'edital_catalog_bumped'
+
+class EditalCatalog:
+    __slots__ = ('version', 'items', 'positions', 'sections', 'responses')
+
+    def __init__(self, version, items):
+        self.version = version
+        self.items = items  # Dicionários de EditalItem.to_dict(), por order_index
+        self.positions = {item['id']: position for position, item in enumerate(items)}
+        self.sections = list(dict.fromkeys(item['section'] for item in items))
+        self.responses = {}  # chave -> (corpo JSON, etag)
+
+    def section_items(self, section=None):
+        if not section:
+            return self.items
+        return [item for item in self.items if item['section'] == section]
+
+_catalog = None
+_checked_at = 0.0
+_invalidations = 0  # Incrementado a cada invalidate_catalog()
+_lock = threading.Lock()
+
+def _load(version):
+    items = db.session.execute(
+        select(EditalItem).where(EditalItem.retired_at == None).order_by(EditalItem.order_index, EditalItem.id)
+    ).scalars().all()
+    return EditalCatalog(version, [item.to_dict() for item in items])
+
+def get_catalog():
+    """Catálogo em cache, recarregado quando a versão no banco muda"""
+    global _catalog, _checked_at
+
+    now = time.monotonic()
+    if _catalog is not None and now - _checked_at < VERSION_CHECK_INTERVAL:
+        return _catalog
+
+    with _lock:
+        if _catalog is None or now - _checked_at >= VERSION_CHECK_INTERVAL:
+            invalidations = _invalidations
+            version = db.session.query(EditalCatalogVersion.version).filter_by(id=1).scalar() or 0
+            if _catalog is None or _catalog.version != version:
+                _catalog = _load(version)
+            # Um commit durante a leitura pode ter mudado a versão: conferir de novo
+            _checked_at = now if invalidations == _invalidations else float('-inf')
+        return _catalog
+
+def invalidate_catalog():
+    """Conferir a versão no banco na próxima leitura deste processo"""
+    global _checked_at, _invalidations
+    _invalidations += 1
+    _checked_at = float('-inf')
+
+def bump_catalog_version():
+    """Incrementar a versão do catálogo (chamar junto com a alteração dos itens)
+
+    O commit fica a cargo de quem chama. Depois dele, o cache deste processo
+    é conferido novamente na próxima leitura; os demais processos percebem a
+    mudança em até VERSION_CHECK_INTERVAL segundos.
+    """
+    updated = db.session.execute(
+        update(EditalCatalogVersion)
+        .where(EditalCatalogVersion.id == 1)
+        .values(version=EditalCatalogVersion.version + 1)
+    ).rowcount
+    if not updated:
+        db.session.add(EditalCatalogVersion(id=1, version=1))
+
+    db.session.info[BUMPED_KEY] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    # Antes do commit outra requisição ainda leria a versão antiga e a
+    # guardaria por mais VERSION_CHECK_INTERVAL segundos
+    if session.info.pop(BUMPED_KEY, False):
+        invalidate_catalog()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_bump(session):
+    session.info.pop(BUMPED_KEY, None)
+
+def catalog_response(key, build):
+    """Resposta JSON do catálogo com ETag forte e suporte a If-None-Match
+
+    build(catalog) monta o payload; o corpo codificado fica em cache por
+    versão e chave.
+    """
+    catalog = get_catalog()
+    cached = catalog.responses.get(key)
+    if cached is None:
+        body = current_app.json.response(build(catalog)).get_data()
+        etag = f"{catalog.version}-{hashlib.sha1(body).hexdigest()[:16]}"
+        cached = (body, etag)
+        if len(catalog.responses) < MAX_CACHED_RESPONSES:
+            catalog.responses[key] = cached
+
+    body, etag = cached
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Sempre revalidar; o 304 é barato
+    return response.make_conditional(request)
@@ -0,0 +1,202 @@
+"""
+Importação do edital a partir de um arquivo de texto.
+
+O arquivo é lido linha a linha por um gerador que emite os itens à medida
+que cada seção/subseção termina; os itens são gravados em INSERTs de
+várias linhas, em blocos, sem montar a lista completa nem objetos ORM.
+A memória usada fica limitada ao bloco corrente.
+
+A importação pode rodar na própria requisição ou como tarefa em segundo
+plano (thread com contexto da aplicação), com progresso consultável pelo
+id da tarefa. O registro de tarefas é local ao processo.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import insert
+from src.models.user import db
+from src.models.study import EditalItem
+from src.services.edital_catalog import bump_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Itens por INSERT (5 colunas, bem abaixo do limite de parâmetros do SQLite)
+INSERT_CHUNK_SIZE = 500
+
+SECTION_PATTERN = re.compile(r'^\d+\.')
+SUBSECTION_PATTERNS = (re.compile(r'^[a-z\d]\)'), re.compile(r'^[a-z\d]\.\d'))
+
+class EditalAlreadyImported(Exception):
+    pass
+
+def parse_edital(lines):
+    """Gerar os itens do edital a partir das linhas do arquivo
+
+    Cabeçalhos de seção são linhas em maiúsculas ou numeradas ("1.");
+    subseções começam com "a)", "1)" ou "a.1". As demais linhas formam o
+    conteúdo do item corrente.
+    """
+    current_section = None
+    current_subsection = None
+    current_content = []
+    order_index = 0
+
+    for line in lines:
+        line = line.strip()
+
+        # Pular linhas vazias
+        if not line:
+            continue
+
+        # Cabeçalho de seção: encerra o item anterior, mesmo sem conteúdo
+        if line.isupper() or SECTION_PATTERN.match(line):
+            if current_section:
+                yield {
+                    'section': current_section,
+                    'subsection': current_subsection,
+                    'content': '\n'.join(current_content),
+                    'order_index': order_index
+                }
+                order_index += 1
+
+            current_section = line
+            current_subsection = None
+            current_content = []
+
+        # Subseção: encerra o item anterior se ele tiver conteúdo
+        elif any(pattern.match(line) for pattern in SUBSECTION_PATTERNS):
+            if current_section and current_content:
+                yield {
+                    'section': current_section,
+                    'subsection': current_subsection,
+                    'content': '\n'.join(current_content),
+                    'order_index': order_index
+                }
+                order_index += 1
+
+            current_subsection = line
+            current_content = []
+
+        # Conteúdo normal
+        else:
+            current_content.append(line)
+
+    # Último item
+    if current_section and current_content:
+        yield {
+            'section': current_section,
+            'subsection': current_subsection,
+            'content': '\n'.join(current_content),
+            'order_index': order_index
+        }
+
+def import_edital_file(path, progress=None):
+    """Importar o edital do arquivo em path com INSERTs em lote
+
+    progress(itens, bytes_lidos, bytes_totais) é chamado após cada bloco.
+    Retorna o número de itens criados; o commit fica a cargo de quem chama.
+    """
+    if db.session.query(EditalItem.id).first() is not None:
+        raise EditalAlreadyImported()
+
+    total_bytes = os.path.getsize(path)
+    created = 0
+
+    with open(path, 'r', encoding='utf-8') as file:
+        items = parse_edital(file)
+        while True:
+            chunk = list(islice(items, INSERT_CHUNK_SIZE))
+            if not chunk:
+                break
+            db.session.execute(insert(EditalItem).values(chunk))
+            created += len(chunk)
+            if progress:
+                progress(created, file.buffer.tell(), total_bytes)
+
+    bump_catalog_version()
+    return created
+
+def save_upload(stream):
+    """Copiar o upload para um arquivo temporário, em blocos"""
+    handle, path = tempfile.mkstemp(prefix='edital-', suffix='.txt')
+    with os.fdopen(handle, 'wb') as target:
+        while True:
+            block = stream.read(64 * 1024)
+            if not block:
+                break
+            target.write(block)
+    return path
+
+class ImportJob:
+    __slots__ = ('id', 'status', 'items_created', 'bytes_read', 'bytes_total', 'error', 'started_at', 'finished_at')
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = 'pending'  # pending, running, completed, failed
+        self.items_created = 0
+        self.bytes_read = 0
+        self.bytes_total = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+    def update(self, items_created, bytes_read, bytes_total):
+        self.items_created = items_created
+        self.bytes_read = bytes_read
+        self.bytes_total = bytes_total
+
+    def to_dict(self):
+        percentage = None
+        if self.bytes_total:
+            percentage = round(self.bytes_read / self.bytes_total * 100, 1)
+        return {
+            'id': self.id,
+            'status': self.status,
+            'items_created': self.items_created,
+            'progress_percentage': percentage,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+_jobs = {}
+
+def get_job(job_id):
+    return _jobs.get(job_id)
+
+def start_import_job(app, path, remove_after=False):
+    """Executar a importação numa thread em segundo plano"""
+    job = ImportJob()
+    _jobs[job.id] = job
+
+    def run():
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        try:
+            with app.app_context():
+                try:
+                    import_edital_file(path, progress=job.update)
+                    db.session.commit()
+                    job.status = 'completed'
+                except EditalAlreadyImported:
+                    db.session.rollback()
+                    job.status = 'failed'
+                    job.error = 'Edital já foi importado anteriormente'
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Erro ao importar edital: {str(e)}")
+                    job.status = 'failed'
+                    job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            if remove_after:
+                os.remove(path)
+
+    threading.Thread(target=run, name=f'edital-import-{job.id}', daemon=True).start()
+    return job
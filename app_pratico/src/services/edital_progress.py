@@ -0,0 +1,83 @@
+"""
+Marcação em lote do progresso no edital.
+
+As entradas são gravadas com INSERT ... ON CONFLICT (user_id,
+edital_item_id) DO UPDATE, em blocos, sem carregar objetos ORM. Campos
+ausentes de uma entrada (confidence_level, notes) não sobrescrevem o valor
+já gravado; por isso as entradas são agrupadas pelo conjunto de campos
+enviados e cada grupo vira um comando.
+"""
+
+from datetime import datetime
+from sqlalchemy import select, case, func
+from src.models.user import db
+from src.models.study import EditalProgress
+from src.services import dashboard_rollup
+from src.utils.sql import dialect_insert
+
+# Linhas por INSERT
+UPSERT_CHUNK_SIZE = 500
+
+OPTIONAL_FIELDS = ('confidence_level', 'notes')
+
+def bulk_mark(user_id, entries):
+    """Aplicar várias marcações do usuário com upserts em lote
+
+    entries: dicionários com edital_item_id e, opcionalmente, is_studied
+    (padrão True), confidence_level e notes. Os ids devem ser de itens
+    ativos do catálogo. Retorna o número de itens gravados; o commit fica
+    a cargo de quem chama.
+    """
+    # Última entrada vence quando o mesmo item aparece mais de uma vez
+    entries = list({entry['edital_item_id']: entry for entry in entries}.values())
+    if not entries:
+        return 0
+
+    # Estado anterior de is_studied, para o rollup do dashboard
+    item_ids = [entry['edital_item_id'] for entry in entries]
+    previously_studied = set(db.session.execute(
+        select(EditalProgress.edital_item_id).where(
+            EditalProgress.user_id == user_id,
+            EditalProgress.edital_item_id.in_(item_ids),
+            EditalProgress.is_studied == True
+        )
+    ).scalars())
+
+    now = datetime.utcnow()
+    shapes = {}
+    for entry in entries:
+        is_studied = bool(entry.get('is_studied', True))
+        row = {
+            'user_id': user_id,
+            'edital_item_id': entry['edital_item_id'],
+            'is_studied': is_studied,
+            'study_date': now if is_studied else None
+        }
+        fields = tuple(field for field in OPTIONAL_FIELDS if field in entry)
+        row.update({field: entry[field] for field in fields})
+        shapes.setdefault(fields, []).append(row)
+
+    table = EditalProgress.__table__
+    for fields, rows in shapes.items():
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            statement = dialect_insert(EditalProgress).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            excluded = statement.excluded
+            statement = statement.on_conflict_do_update(
+                index_elements=['user_id', 'edital_item_id'],
+                set_={
+                    'is_studied': excluded.is_studied,
+                    # Mantém a data da primeira marcação; desmarcar limpa a data
+                    'study_date': case(
+                        (excluded.is_studied, func.coalesce(table.c.study_date, excluded.study_date)),
+                        else_=None
+                    ),
+                    **{field: excluded[field] for field in fields}
+                }
+            )
+            db.session.execute(statement)
+
+    studied_now = sum(1 for entry in entries if entry.get('is_studied', True))
+    studied_before = sum(1 for entry in entries if entry['edital_item_id'] in previously_studied)
+    dashboard_rollup.record_edital_studied_delta(user_id, studied_now - studied_before)
+
+    return len(entries)
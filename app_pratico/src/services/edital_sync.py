@@ -0,0 +1,156 @@
+"""
+Sincronização incremental do catálogo do edital.
+
+Cada item é identificado por uma chave estável: hash do grupo (seção) e
+do conteúdo normalizados (Unicode NFKC, sem diferença de maiúsculas nem de
+espaços). Comparando as chaves do conteúdo desejado com as do banco, a
+sincronização só insere os itens novos, atualiza os que mudaram de texto,
+subseção ou posição e retira (retired_at) os que saíram do edital, em
+comandos em lote. Os ids dos itens mantidos não mudam, então o progresso
+dos usuários (EditalProgress) continua válido.
+"""
+
+import hashlib
+import logging
+import unicodedata
+from datetime import datetime
+from collections import Counter
+from sqlalchemy import select, insert, update, func
+from src.models.user import db
+from src.models.study import EditalItem, EditalProgress
+from src.services.dashboard_rollup import record_edital_studied_delta
+from src.services.edital_catalog import bump_catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Linhas por comando em lote
+CHUNK_SIZE = 500
+
+def normalize_text(text):
+    return ' '.join(unicodedata.normalize('NFKC', text or '').casefold().split())
+
+def edital_item_key(section, content):
+    """Chave estável do item: grupo + conteúdo normalizados"""
+    normalized = f"{normalize_text(section)}\x1f{normalize_text(content)}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:40]
+
+def _chunks(rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start:start + CHUNK_SIZE]
+
+def _studied_counts(item_ids):
+    """Itens estudados por usuário entre item_ids"""
+    counts = Counter()
+    for chunk in _chunks(item_ids):
+        for user_id, count in db.session.execute(
+            select(EditalProgress.user_id, func.count(EditalProgress.id))
+            .where(EditalProgress.edital_item_id.in_(chunk), EditalProgress.is_studied == True)
+            .group_by(EditalProgress.user_id)
+        ):
+            counts[user_id] += count
+    return counts
+
+def sync_edital_items(entries):
+    """Sincronizar o catálogo com a lista desejada de itens
+
+    entries: dicionários com section, content e subsection (opcional), na
+    ordem do edital; order_index passa a ser a posição na lista. Retorna um
+    resumo com inserted, updated, retired e unchanged; o commit fica a
+    cargo de quem chama.
+    """
+    summary = {'inserted': 0, 'updated': 0, 'retired': 0, 'unchanged': 0}
+
+    # Estado atual (linhas antigas sem chave recebem a chave calculada)
+    existing = {}
+    duplicates = []
+    for row in db.session.execute(select(
+        EditalItem.id, EditalItem.item_key, EditalItem.section, EditalItem.subsection,
+        EditalItem.content, EditalItem.order_index, EditalItem.retired_at
+    )):
+        key = row.item_key or edital_item_key(row.section, row.content)
+        kept = existing.get(key)
+        if kept is None:
+            existing[key] = row
+        elif kept.retired_at is not None and row.retired_at is None:
+            # Preferir a linha ativa; a retirada vira duplicata
+            existing[key] = row
+            duplicates.append(kept)
+        else:
+            duplicates.append(row)
+
+    inserts = []
+    updates = []
+    revived_ids = []
+    desired_keys = set()
+
+    for order_index, entry in enumerate(entries):
+        key = edital_item_key(entry['section'], entry['content'])
+        if key in desired_keys:
+            logger.warning(f"Item duplicado ignorado na sincronização do edital: {entry['content']!r}")
+            continue
+        desired_keys.add(key)
+
+        values = {
+            'item_key': key,
+            'section': entry['section'],
+            'subsection': entry.get('subsection'),
+            'content': entry['content'],
+            'order_index': order_index
+        }
+
+        row = existing.get(key)
+        if row is None:
+            inserts.append(values)
+            continue
+
+        current = {
+            'item_key': row.item_key,
+            'section': row.section,
+            'subsection': row.subsection,
+            'content': row.content,
+            'order_index': row.order_index
+        }
+        if current == values and row.retired_at is None:
+            summary['unchanged'] += 1
+            continue
+
+        if row.retired_at is not None:
+            revived_ids.append(row.id)
+        updates.append({'id': row.id, 'retired_at': None, **values})
+
+    # Itens que saíram do edital (e duplicatas antigas) são retirados, não apagados
+    retire_ids = [
+        row.id for key, row in existing.items()
+        if key not in desired_keys and row.retired_at is None
+    ]
+    retire_ids += [row.id for row in duplicates if row.retired_at is None]
+
+    # Retirar antes de inserir/atualizar, liberando as chaves (a linha retirada
+    # é reencontrada pela chave calculada se o item voltar ao edital)
+    now = datetime.utcnow()
+    for chunk in _chunks(retire_ids):
+        db.session.execute(
+            update(EditalItem).where(EditalItem.id.in_(chunk)).values(retired_at=now, item_key=None)
+        )
+
+    for chunk in _chunks(updates):
+        db.session.execute(update(EditalItem), chunk)
+
+    for chunk in _chunks(inserts):
+        db.session.execute(insert(EditalItem).values(chunk))
+
+    summary['inserted'] = len(inserts)
+    summary['updated'] = len(updates)
+    summary['retired'] = len(retire_ids)
+
+    if inserts or updates or retire_ids:
+        bump_catalog_version()
+
+    # Progresso em itens retirados/reativados muda a contagem de estudados:
+    # só os usuários com progresso nesses itens recebem o delta
+    studied = _studied_counts(revived_ids)
+    studied.subtract(_studied_counts(retire_ids))
+    for user_id, delta in studied.items():
+        record_edital_studied_delta(user_id, delta)
+
+    return summary
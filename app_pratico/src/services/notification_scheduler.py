@@ -0,0 +1,219 @@
+"""
+Agendador de lembretes de revisão.
+
+Mantém em memória um min-heap com o horário de disparo de cada revisão
+pendente com notify=True (scheduled_date - reminder_minutes_before do
+usuário). A carga completa acontece só na inicialização; depois, cada
+ciclo lê apenas as revisões e preferências alteradas desde o último ciclo
+(colunas updated_at indexadas) e empilha os novos horários. Entradas
+antigas são descartadas ao sair do heap (remoção preguiçosa).
+
+Os lembretes vencidos são conferidos no banco em uma única consulta e
+gravados com um INSERT em lote; o índice único (revision_id,
+scheduled_for) torna a gravação idempotente entre reinícios.
+"""
+
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, func
+from src.models.user import db
+from src.models.topic import Topic, Revision
+from src.models.notification import Notification, NotificationPreference
+from src.utils.sql import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REMINDER_MINUTES = 30
+
+# Lembretes mais antigos que isso (ex.: revisões atrasadas há dias) não são enviados
+MAX_LATENESS = timedelta(hours=12)
+
+# Linhas por INSERT de notificações
+INSERT_CHUNK_SIZE = 500
+
+# Sobreposição na leitura incremental, para não perder transações que
+# gravaram updated_at antes da marca d'água mas confirmaram depois
+POLL_OVERLAP = timedelta(seconds=5)
+
+class NotificationScheduler:
+    def __init__(self, poll_interval=30):
+        self.poll_interval = poll_interval
+        self.heap = []  # (disparo, revision_id)
+        self.entries = {}  # revision_id -> (disparo, scheduled_date) vigente
+        self.revisions_watermark = None
+        self.preferences_watermark = None
+
+    def _pending_revisions(self):
+        """Consulta base: revisões pendentes com notificação e o lembrete do usuário"""
+        reminder = func.coalesce(NotificationPreference.reminder_minutes_before, DEFAULT_REMINDER_MINUTES)
+        return select(
+            Revision.id, Revision.scheduled_date, Revision.is_completed, Revision.notify, reminder
+        ).join(
+            Topic, Topic.id == Revision.topic_id
+        ).outerjoin(
+            NotificationPreference, NotificationPreference.user_id == Topic.user_id
+        )
+
+    def _push(self, revision_id, scheduled_date, is_completed, notify, reminder_minutes):
+        if is_completed or not notify or scheduled_date is None:
+            self.entries.pop(revision_id, None)
+            return
+
+        due_at = scheduled_date - timedelta(minutes=reminder_minutes or 0)
+        if self.entries.get(revision_id) == (due_at, scheduled_date):
+            return
+
+        self.entries[revision_id] = (due_at, scheduled_date)
+        heapq.heappush(self.heap, (due_at, revision_id))
+
+    def load(self):
+        """Carga inicial de todas as revisões pendentes"""
+        self.revisions_watermark = db.session.query(func.max(Revision.updated_at)).scalar()
+        self.preferences_watermark = db.session.query(func.max(NotificationPreference.updated_at)).scalar()
+
+        query = self._pending_revisions().where(Revision.is_completed == False, Revision.notify == True)
+        for row in db.session.execute(query):
+            self._push(*row)
+
+        logger.info(f"Agendador de notificações carregado: {len(self.entries)} revisões pendentes")
+
+    def poll_changes(self):
+        """Empilhar apenas o que mudou desde o último ciclo"""
+        changed = 0
+
+        # Revisões criadas ou alteradas
+        query = self._pending_revisions()
+        if self.revisions_watermark is not None:
+            query = query.where(Revision.updated_at >= self.revisions_watermark - POLL_OVERLAP)
+        else:
+            query = query.where(Revision.updated_at != None)
+
+        watermark = self.revisions_watermark
+        for row in db.session.execute(query.add_columns(Revision.updated_at)):
+            *values, updated_at = row
+            self._push(*values)
+            watermark = max(watermark, updated_at) if watermark else updated_at
+            changed += 1
+        self.revisions_watermark = watermark
+
+        # Preferências alteradas mudam o horário de todas as revisões do usuário
+        query = select(NotificationPreference.user_id, NotificationPreference.updated_at)
+        if self.preferences_watermark is not None:
+            query = query.where(NotificationPreference.updated_at >= self.preferences_watermark - POLL_OVERLAP)
+
+        users = {}
+        for user_id, updated_at in db.session.execute(query):
+            users[user_id] = updated_at
+
+        if users:
+            query = self._pending_revisions().where(
+                Topic.user_id.in_(list(users)),
+                Revision.is_completed == False,
+                Revision.notify == True
+            )
+            for row in db.session.execute(query):
+                self._push(*row)
+                changed += 1
+            self.preferences_watermark = max(users.values())
+
+        db.session.rollback()  # Encerrar a transação de leitura
+        return changed
+
+    def pop_due(self, now):
+        """Retirar do heap os lembretes vencidos que ainda são vigentes
+
+        Retorna revision_id -> (disparo, scheduled_date).
+        """
+        due = {}
+        while self.heap and self.heap[0][0] <= now:
+            due_at, revision_id = heapq.heappop(self.heap)
+            entry = self.entries.get(revision_id)
+            if entry is None or entry[0] != due_at:
+                continue  # Substituída por uma alteração posterior
+            del self.entries[revision_id]
+            if now - due_at <= MAX_LATENESS:
+                due[revision_id] = entry
+        return due
+
+    def restore(self, due):
+        """Devolver ao heap os lembretes retirados cuja gravação falhou"""
+        for revision_id, entry in due.items():
+            # Uma alteração lida depois da retirada tem precedência
+            if revision_id not in self.entries:
+                self.entries[revision_id] = entry
+                heapq.heappush(self.heap, (entry[0], revision_id))
+
+    def emit(self, due):
+        """Conferir as revisões vencidas e gravar as notificações em lote"""
+        if not due:
+            return 0
+
+        rows = db.session.execute(
+            select(
+                Revision.id, Revision.scheduled_date, Revision.revision_number,
+                Revision.is_completed, Revision.notify, Topic.user_id, Topic.name
+            ).join(
+                Topic, Topic.id == Revision.topic_id
+            ).where(Revision.id.in_(list(due)))
+        ).all()
+
+        notifications = []
+        for revision_id, scheduled_date, number, is_completed, notify, user_id, topic_name in rows:
+            # Revisões concluídas, silenciadas ou reagendadas desde o empilhamento são ignoradas
+            if is_completed or not notify or scheduled_date != due[revision_id][1]:
+                continue
+            notifications.append({
+                'user_id': user_id,
+                'revision_id': revision_id,
+                'title': 'Revisão programada',
+                'message': f"Revisão {number} de \"{topic_name}\" às {scheduled_date.strftime('%d/%m/%Y %H:%M')}",
+                'is_read': False,
+                'created_at': datetime.utcnow(),
+                'scheduled_for': scheduled_date
+            })
+
+        created = 0
+        for start in range(0, len(notifications), INSERT_CHUNK_SIZE):
+            statement = dialect_insert(Notification).values(notifications[start:start + INSERT_CHUNK_SIZE])
+            if hasattr(statement, 'on_conflict_do_nothing'):
+                statement = statement.on_conflict_do_nothing(index_elements=['revision_id', 'scheduled_for'])
+            created += db.session.execute(statement).rowcount
+
+        db.session.commit()
+        return created
+
+    def run_once(self, now=None):
+        self.poll_changes()
+        due = self.pop_due(now or datetime.utcnow())
+        try:
+            return self.emit(due)
+        except Exception:
+            # A marca d'água já passou dessas revisões: sem devolvê-las ao
+            # heap, os lembretes se perderiam
+            db.session.rollback()
+            self.restore(due)
+            raise
+
+    def run_forever(self):
+        self.load()
+        while True:
+            try:
+                created = self.run_once()
+                if created:
+                    logger.info(f"Notificações de revisão criadas: {created}")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Erro no agendador de notificações: {str(e)}")
+                # Lembretes devolvidos ao heap já venceram: esperar um ciclo
+                # inteiro antes de tentar de novo
+                time.sleep(self.poll_interval)
+                continue
+
+            # Dormir até o próximo lembrete ou até o próximo ciclo de leitura
+            sleep = self.poll_interval
+            if self.heap:
+                until_next = (self.heap[0][0] - datetime.utcnow()).total_seconds()
+                sleep = max(0.0, min(sleep, until_next))
+            time.sleep(sleep)
@@ -0,0 +1,225 @@
+"""
+Distribuição de notificações para as conexões SSE abertas.
+
+Cada processo mantém um único leitor em segundo plano que consulta as
+notificações novas dos usuários conectados (pela chave primária, em lotes
+de POLL_BATCH) e as entrega às suas filas. Assim o custo no banco é uma
+consulta por intervalo por processo, independente do número de abas
+abertas; as conexões ociosas só esperam na fila. Sem nenhum inscrito o
+leitor só acompanha o MAX(id), para que a próxima conexão não receba como
+novas as notificações do período ocioso.
+
+No Postgres o id vem da sequência no INSERT, não no commit: uma transação
+com id menor pode confirmar depois de um id maior já ter sido lido. Por
+isso cada leitura recomeça do MAX(id) visto há pelo menos POLL_OVERLAP
+segundos, e os ids já entregues nessa janela são ignorados.
+
+Funciona tanto com threads quanto com o worker gevent do gunicorn (que
+torna threading e queue cooperativos; o psycopg2 via psycogreen, em
+gunicorn.conf.py).
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from sqlalchemy import select, func
+from src.models.user import db
+from src.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre as consultas de notificações novas
+POLL_INTERVAL = 2
+
+# Notificações lidas por consulta do leitor
+POLL_BATCH = 500
+
+# Segundos de releitura: transações que demoram mais que isso entre o
+# INSERT e o commit podem ter a notificação perdida pelo stream (o cliente
+# ainda a vê ao recarregar a lista)
+POLL_OVERLAP = 10
+
+# Máximo de notificações reenviadas ao retomar com Last-Event-ID
+MAX_BACKLOG = 100
+
+# Eventos pendentes por conexão; clientes lentos demais são desconectados
+QUEUE_SIZE = 100
+
+# Segundos sem eventos antes de enviar um comentário de keep-alive
+HEARTBEAT_INTERVAL = 15
+
+# Espera sugerida ao navegador antes de reconectar (ms)
+RECONNECT_DELAY_MS = 5000
+
+def event_type(notification):
+    """Lembretes do agendador chegam como revision-due; o resto como notification"""
+    if notification['revision_id'] and notification['scheduled_for']:
+        return 'revision-due'
+    return 'notification'
+
+def format_event(notification):
+    """Serializar uma notificação no formato text/event-stream"""
+    return (
+        f"id: {notification['id']}\n"
+        f"event: {event_type(notification)}\n"
+        f"data: {json.dumps(notification)}\n\n"
+    )
+
+def backlog_events(user_id, last_event_id):
+    """Eventos perdidos desde last_event_id (retomada após reconexão)"""
+    notifications = Notification.query.filter(
+        Notification.user_id == user_id,
+        Notification.id > last_event_id
+    ).order_by(Notification.id).limit(MAX_BACKLOG).all()
+    return [(notification.id, format_event(notification.to_dict())) for notification in notifications]
+
+class Subscription:
+    """Fila de eventos de uma conexão SSE"""
+    __slots__ = ('user_id', 'queue', 'closed')
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.closed = False
+
+class NotificationHub:
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.subscribers = {}  # user_id -> conjunto de Subscription
+        self.lock = threading.Lock()
+        self.last_id = None  # Maior id já lido
+        self.history = deque()  # (instante, MAX(id)) de cada leitura recente
+        self.sent = set()  # Ids entregues dentro da janela de releitura
+        self.thread = None
+        self.app = None
+
+    def subscribe(self, app, user_id):
+        """Registrar uma conexão e iniciar o leitor na primeira inscrição"""
+        subscription = Subscription(user_id)
+        with self.lock:
+            self.subscribers.setdefault(user_id, set()).add(subscription)
+            if self.thread is None:
+                self.app = app
+                with app.app_context():
+                    self._reset(db.session.query(func.max(Notification.id)).scalar() or 0)
+                self.thread = threading.Thread(target=self._run, name='notification-hub', daemon=True)
+                self.thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.closed = True
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.user_id]
+
+    def _reset(self, max_id):
+        """Recomeçar a janela de releitura a partir de max_id"""
+        self.last_id = max_id
+        self.history = deque([(time.monotonic(), max_id)])
+        self.sent = set()
+
+    def poll(self):
+        """Buscar as notificações novas e entregá-las aos usuários conectados"""
+        with self.lock:
+            user_ids = list(self.subscribers)
+
+        # Limite superior fixo: o que chegar durante a leitura fica para a próxima
+        now = time.monotonic()
+        max_id = db.session.query(func.max(Notification.id)).scalar() or 0
+        if not user_ids:
+            db.session.rollback()
+            self._reset(max_id)
+            return 0
+
+        # Piso da leitura: o MAX(id) mais recente visto há pelo menos POLL_OVERLAP
+        while len(self.history) > 1 and self.history[1][0] <= now - POLL_OVERLAP:
+            self.history.popleft()
+        floor = self.history[0][1]
+        self.sent = {notification_id for notification_id in self.sent if notification_id > floor}
+
+        delivered = 0
+        after_id = floor
+        while True:
+            rows = db.session.execute(
+                select(Notification).where(
+                    Notification.id > after_id,
+                    Notification.id <= max_id,
+                    Notification.user_id.in_(user_ids)
+                ).order_by(Notification.id).limit(POLL_BATCH)
+            ).scalars().all()
+            notifications = [notification.to_dict() for notification in rows]
+            db.session.rollback()  # Encerrar a transação de leitura
+
+            for notification in notifications:
+                if notification['id'] in self.sent:
+                    continue
+                self.sent.add(notification['id'])
+                delivered += self._deliver(notification)
+            if len(notifications) < POLL_BATCH:
+                break
+            after_id = notifications[-1]['id']
+
+        self.history.append((now, max_id))
+        self.last_id = max(self.last_id, max_id)
+        return delivered
+
+    def _deliver(self, notification):
+        with self.lock:
+            subscriptions = list(self.subscribers.get(notification['user_id'], ()))
+
+        delivered = 0
+        event = (notification['id'], format_event(notification))
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except queue.Full:
+                # O cliente não está consumindo: encerrar o stream, ele retoma pelo Last-Event-ID
+                self.unsubscribe(subscription)
+        return delivered
+
+    def stream(self, subscription, backlog, last_event_id=0):
+        """Gerador da resposta SSE: backlog, eventos novos e keep-alive"""
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            sent = set()
+            for event_id, event in backlog:
+                last_event_id = event_id
+                sent.add(event_id)
+                yield event
+
+            while not subscription.closed or not subscription.queue.empty():
+                try:
+                    event_id, event = subscription.queue.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                # O backlog pode já ter entregue eventos que também chegaram pela fila
+                if event_id in sent:
+                    continue
+                if event_id > last_event_id:
+                    last_event_id = event_id
+                    yield event
+                else:
+                    # Confirmada depois de um id maior: sem a linha "id:", o
+                    # Last-Event-ID do navegador não retrocede
+                    yield event.split('\n', 1)[1]
+        finally:
+            self.unsubscribe(subscription)
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.poll()
+            except Exception as e:
+                logger.error(f"Erro ao ler notificações para o stream: {str(e)}")
+            time.sleep(self.poll_interval)
+
+hub = NotificationHub()
@@ -0,0 +1,82 @@
+"""
+Leitura leve para as rotas de listagem.
+
+As listagens só precisam do dicionário de to_dict(); carregar instâncias do
+ORM (identity map, estado de cada atributo, eventos) custa CPU e memória
+por linha sem nenhum uso. Aqui cada listagem seleciona apenas as colunas,
+recebe tuplas (Row) do SQLAlchemy e monta os dicionários diretamente.
+
+Os campos e a ordem das chaves espelham o to_dict() de cada modelo, para
+que o JSON seja idêntico byte a byte; ao alterar um to_dict(), altere
+também o leitor correspondente (benchmark_reads.py confere os dois).
+"""
+
+from src.models.user import db
+from src.models.notification import Notification
+from src.models.study import QuestionRecord, StudySession
+from src.models.topic import Revision, Topic
+
+class RowReader:
+    """Colunas de um modelo na ordem do to_dict() e o mapeamento linha -> dict"""
+    __slots__ = ('fields', 'columns', 'date_positions')
+
+    def __init__(self, model, fields, dates=()):
+        self.fields = tuple(fields)
+        self.columns = [getattr(model, field) for field in self.fields]
+        self.date_positions = tuple(self.fields.index(field) for field in dates)
+
+    def query(self):
+        """Consulta só com as colunas (linhas são tuplas, fora do identity map)"""
+        return db.session.query(*self.columns)
+
+    def to_dict(self, row):
+        if self.date_positions:
+            row = list(row)
+            for position in self.date_positions:
+                value = row[position]
+                if value is not None:
+                    row[position] = value.isoformat()
+        return dict(zip(self.fields, row))
+
+    def to_dicts(self, rows):
+        to_dict = self.to_dict
+        return [to_dict(row) for row in rows]
+
+study_sessions = RowReader(
+    StudySession,
+    ['id', 'user_id', 'start_time', 'end_time', 'duration_minutes', 'topic_id', 'description'],
+    dates=['start_time', 'end_time']
+)
+
+question_records = RowReader(
+    QuestionRecord,
+    [
+        'id', 'user_id', 'topic_id', 'date', 'source', 'specific_topic', 'difficulty_level',
+        'total_questions', 'correct_answers', 'wrong_answers', 'accuracy_percentage', 'notes'
+    ],
+    dates=['date']
+)
+
+revisions = RowReader(
+    Revision,
+    [
+        'id', 'topic_id', 'scheduled_date', 'revision_number', 'is_completed',
+        'completed_at', 'notes', 'notify', 'color', 'grade'
+    ],
+    dates=['scheduled_date', 'completed_at']
+)
+
+notifications = RowReader(
+    Notification,
+    ['id', 'user_id', 'revision_id', 'title', 'message', 'is_read', 'created_at', 'scheduled_for'],
+    dates=['created_at', 'scheduled_for']
+)
+
+topics = RowReader(
+    Topic,
+    [
+        'id', 'user_id', 'group_id', 'group_name', 'name', 'description', 'is_completed',
+        'confidence_level', 'created_at', 'completed_at', 'ease_factor', 'interval_days'
+    ],
+    dates=['created_at', 'completed_at']
+)
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from src.models.user import db
+from src.models.topic import Revision
+from src.utils.sql import dialect_insert
+
+# Intervalos entre revisões (em dias), cada um contado a partir da revisão anterior
+REVISION_INTERVALS = [1, 7, 15, 30, 60]
+
+# Linhas por INSERT (mantém o número de parâmetros abaixo do limite do SQLite)
+INSERT_CHUNK_SIZE = 1000
+
+def compute_schedule(start_date, intervals=REVISION_INTERVALS):
+    """Datas das revisões a partir de start_date, sem consultar o banco"""
+    dates = []
+    revision_date = start_date
+    for interval in intervals:
+        revision_date = revision_date + timedelta(days=interval)
+        dates.append(revision_date)
+    return dates
+
+def create_revision_schedules(topic_ids, start_date=None):
+    """Criar as revisões de vários tópicos com INSERTs em lote (multi-VALUES)
+
+    Revisões já existentes (mesmo topic_id e revision_number) são ignoradas
+    pela restrição única, então repetir a chamada não gera duplicatas.
+    Retorna o número de revisões criadas; o commit fica a cargo de quem chama.
+    """
+    if not topic_ids:
+        return 0
+
+    dates = compute_schedule(start_date or datetime.utcnow())
+    rows = [
+        {
+            'topic_id': topic_id,
+            'scheduled_date': revision_date,
+            'revision_number': number,
+            'is_completed': False
+        }
+        for topic_id in topic_ids
+        for number, revision_date in enumerate(dates, 1)
+    ]
+
+    created = 0
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        statement = dialect_insert(Revision).values(rows[start:start + INSERT_CHUNK_SIZE])
+        if hasattr(statement, 'on_conflict_do_nothing'):
+            statement = statement.on_conflict_do_nothing(index_elements=['topic_id', 'revision_number'])
+        created += db.session.execute(statement).rowcount
+
+    return created
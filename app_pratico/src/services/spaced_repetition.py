@@ -0,0 +1,148 @@
+"""
+Agendamento adaptativo das revisões (estilo SM-2).
+
+Cada tópico guarda um fator de facilidade (ease_factor) e o último
+intervalo (interval_days). Ao concluir uma revisão com uma nota de
+lembrança (0 a 5), o fator é ajustado e as revisões pendentes do tópico
+são redistribuídas em intervalos crescentes:
+
+    intervalo_k = intervalo_inicial * ease_factor ** k
+
+O reagendamento noturno aplica a mesma regra, em lote e vetorizada com
+NumPy, a todos os tópicos com revisões atrasadas.
+"""
+
+from datetime import datetime
+import numpy as np
+from sqlalchemy import select, update
+from src.models.user import db
+from src.models.topic import Topic, Revision
+from src.services.revision_schedule import REVISION_INTERVALS
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+MAX_GRADE = 5
+PASSING_GRADE = 3  # Notas abaixo disso reiniciam o intervalo
+
+# Linhas por UPDATE em lote (executemany)
+UPDATE_CHUNK_SIZE = 1000
+
+def parse_grade(value):
+    """Validar a nota de lembrança enviada pelo cliente (inteiro de 0 a 5)"""
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= MAX_GRADE:
+        raise ValueError(f"Nota inválida: {value!r}")
+    return value
+
+def update_ease(ease, grade):
+    """Novo fator de facilidade após uma revisão com a nota informada (SM-2)"""
+    miss = MAX_GRADE - grade
+    return max(MIN_EASE, ease + (0.1 - miss * (0.08 + miss * 0.02)))
+
+def next_interval(interval, ease, grade):
+    """Intervalo (dias) até a próxima revisão"""
+    if grade < PASSING_GRADE:
+        return 1.0
+    return max(1.0, interval * ease)
+
+def cumulative_offsets(first_interval, ease, positions):
+    """Dias desde a âncora até a revisão na posição k (vetorizado)
+
+    Soma dos k primeiros intervalos da série first_interval * ease ** j:
+    first_interval * (ease ** k - 1) / (ease - 1). ease >= MIN_EASE > 1.
+    """
+    first_interval = np.asarray(first_interval, dtype=float)
+    ease = np.asarray(ease, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    return first_interval * (np.power(ease, positions) - 1.0) / (ease - 1.0)
+
+def _shift(anchor, offsets):
+    """Somar deslocamentos em dias a uma data, devolvendo datetimes"""
+    deltas = np.round(np.asarray(offsets) * 86400e6).astype('timedelta64[us]')
+    return (np.datetime64(anchor, 'us') + deltas).astype(datetime).tolist()
+
+def _default_interval(revision_number):
+    index = min(max(revision_number, 1), len(REVISION_INTERVALS)) - 1
+    return float(REVISION_INTERVALS[index])
+
+def reschedule_after_revision(revision, grade):
+    """Ajustar o tópico e redistribuir as revisões pendentes após uma nota
+
+    Deve ser chamada com a revisão já marcada como concluída; o commit fica
+    a cargo de quem chama.
+    """
+    topic = revision.topic
+    ease = update_ease(topic.ease_factor or DEFAULT_EASE, grade)
+    interval = next_interval(topic.interval_days or _default_interval(revision.revision_number), ease, grade)
+
+    revision.grade = grade
+    topic.ease_factor = ease
+    topic.interval_days = interval
+
+    pending = Revision.query.filter(
+        Revision.topic_id == topic.id,
+        Revision.is_completed == False,
+        Revision.id != revision.id
+    ).order_by(Revision.revision_number).all()
+
+    if not pending:
+        return
+
+    anchor = revision.completed_at or datetime.utcnow()
+    offsets = cumulative_offsets(interval, ease, np.arange(1, len(pending) + 1))
+    for pending_revision, scheduled_date in zip(pending, _shift(anchor, offsets)):
+        pending_revision.scheduled_date = scheduled_date
+
+def reschedule_overdue_revisions(now=None):
+    """Reagendar, para todos os usuários, os tópicos com revisões atrasadas
+
+    A revisão atrasada mais antiga de cada tópico passa para agora e as
+    demais pendentes seguem a série de intervalos do tópico. O cálculo é
+    feito em arrays NumPy e gravado com UPDATEs em lote. Retorna o número
+    de revisões reagendadas; o commit fica a cargo de quem chama.
+    """
+    now = now or datetime.utcnow()
+
+    overdue_topics = select(Revision.topic_id).where(
+        Revision.is_completed == False,
+        Revision.scheduled_date < now
+    ).distinct()
+
+    rows = db.session.execute(
+        select(
+            Revision.id, Revision.topic_id, Revision.revision_number,
+            Topic.ease_factor, Topic.interval_days
+        ).join(
+            Topic, Topic.id == Revision.topic_id
+        ).where(
+            Revision.is_completed == False,
+            Revision.topic_id.in_(overdue_topics)
+        ).order_by(Revision.topic_id, Revision.revision_number)
+    ).all()
+
+    if not rows:
+        return 0
+
+    revision_ids, topic_ids, revision_numbers, eases, intervals = zip(*rows)
+    topic_ids = np.asarray(topic_ids)
+
+    # Posição de cada revisão entre as pendentes do seu tópico (linhas já ordenadas)
+    _, group_starts, group_index = np.unique(topic_ids, return_index=True, return_inverse=True)
+    positions = np.arange(len(topic_ids)) - group_starts[group_index]
+
+    # Fator e intervalo por linha; tópicos nunca avaliados usam o cronograma fixo
+    eases = np.array([DEFAULT_EASE if ease is None else ease for ease in eases], dtype=float)
+    fallback = np.array([_default_interval(number) for number in revision_numbers], dtype=float)
+    intervals = np.array([np.nan if interval is None else interval for interval in intervals], dtype=float)
+    intervals = np.where(np.isnan(intervals), fallback[group_starts][group_index], intervals)
+
+    offsets = cumulative_offsets(intervals, np.maximum(eases, MIN_EASE), positions)
+    scheduled_dates = _shift(now, offsets)
+
+    params = [
+        {'id': revision_id, 'scheduled_date': scheduled_date}
+        for revision_id, scheduled_date in zip(revision_ids, scheduled_dates)
+    ]
+    for start in range(0, len(params), UPDATE_CHUNK_SIZE):
+        db.session.execute(update(Revision), params[start:start + UPDATE_CHUNK_SIZE])
+
+    return len(params)
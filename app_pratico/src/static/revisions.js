@@ -40,27 +40,47 @@ function setupRevisionsEventListeners() {
 function loadRevisionsData() {
     showLoading('Carregando revisões...');
     
-    fetch(`${BASE_URL}/api/topics/upcoming-revisions`, {
-        method: 'GET',
-        credentials: 'include',
-        headers: {
-            'Accept': 'application/json'
-        }
-    })
-    .then(response => {
-        if (!response.ok) {
-            throw new Error('Erro ao carregar revisões');
-        }
-        return response.json();
-    })
-    .then(data => {
-        hideLoading();
-        if (data.upcoming_revisions && data.upcoming_revisions.length > 0) {
-            renderRevisions(data.upcoming_revisions);
-        } else {
-            showEmptyState('Nenhuma revisão programada', 'Adicione tópicos de estudo para gerar revisões automáticas.');
-        }
-    })
+    const revisions = [];
+    
+    // A primeira página é renderizada assim que chega; as seguintes
+    // (cabeçalho X-Next-Cursor) são acrescentadas em segundo plano
+    function loadPage(cursor) {
+        let nextCursor = null;
+        const url = cursor
+            ? `${BASE_URL}/api/topics/upcoming-revisions?cursor=${encodeURIComponent(cursor)}`
+            : `${BASE_URL}/api/topics/upcoming-revisions`;
+        
+        return fetch(url, {
+            method: 'GET',
+            credentials: 'include',
+            headers: {
+                'Accept': 'application/json'
+            }
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Erro ao carregar revisões');
+            }
+            nextCursor = response.headers.get('X-Next-Cursor');
+            return response.json();
+        })
+        .then(data => {
+            hideLoading();
+            revisions.push(...(data.upcoming_revisions || []));
+            
+            if (revisions.length > 0) {
+                renderRevisions(revisions);
+            } else {
+                showEmptyState('Nenhuma revisão programada', 'Adicione tópicos de estudo para gerar revisões automáticas.');
+            }
+            
+            if (nextCursor) {
+                return loadPage(nextCursor);
+            }
+        });
+    }
+    
+    loadPage(null)
     .catch(error => {
         hideLoading();
         showError('Erro ao carregar revisões', error.message);
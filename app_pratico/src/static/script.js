@@ -1,6 +1,7 @@
 // Variáveis globais
 let currentUser = null;
 let currentView = 'login';
+let notificationStream = null;
 const BASE_URL = window.location.origin; // Usar URL absoluta baseada na origem atual
 
 // Função para inicializar a aplicação
@@ -220,6 +221,36 @@ function showDashboard() {
     
     // Configurar event listeners específicos das páginas
     setupTopicsEventListeners();
+    
+    // Receber notificações em tempo real
+    startNotificationStream();
+}
+
+// Abrir o stream SSE de notificações (o navegador reconecta sozinho, enviando o Last-Event-ID)
+function startNotificationStream() {
+    if (notificationStream || !window.EventSource) {
+        return;
+    }
+    
+    notificationStream = new EventSource(`${BASE_URL}/api/revisions/notifications/stream`, { withCredentials: true });
+    notificationStream.addEventListener('notification', (event) => showIncomingNotification(JSON.parse(event.data)));
+    notificationStream.addEventListener('revision-due', (event) => showIncomingNotification(JSON.parse(event.data)));
+    notificationStream.onerror = () => console.warn('Stream de notificações interrompido, reconectando...');
+}
+
+function stopNotificationStream() {
+    if (notificationStream) {
+        notificationStream.close();
+        notificationStream = null;
+    }
+}
+
+// Exibir uma notificação recebida pelo stream
+function showIncomingNotification(notification) {
+    console.log('Notificação recebida:', notification);
+    if (window.Notification && Notification.permission === 'granted') {
+        new Notification(notification.title, { body: notification.message });
+    }
 }
 
 // Carregar conteúdo do dashboard
@@ -407,22 +438,49 @@ function closeQuestionModal() {
     }
 }
 
-function loadTopicsForModal() {
-    fetch(`${BASE_URL}/api/topics`, {
+// Buscar todas as linhas de uma listagem paginada, seguindo o cursor das
+// páginas (cabeçalho X-Next-Cursor) até a última. key é o campo do corpo
+// com a lista; sem key, o próprio corpo é a lista
+function fetchAllPages(url, key, cursor, items = []) {
+    const separator = url.includes('?') ? '&' : '?';
+    const pageUrl = cursor ? `${url}${separator}cursor=${encodeURIComponent(cursor)}` : url;
+    
+    return fetch(pageUrl, {
         method: 'GET',
-        credentials: 'include'
+        credentials: 'include',
+        headers: {
+            'Accept': 'application/json'
+        }
     })
-    .then(response => response.json())
-    .then(data => {
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`Erro ao buscar ${url}: ${response.status}`);
+        }
+        const nextCursor = response.headers.get('X-Next-Cursor');
+        return response.json().then(data => {
+            items.push(...((key ? data[key] : data) || []));
+            return nextCursor ? fetchAllPages(url, key, nextCursor, items) : items;
+        });
+    });
+}
+
+// Buscar todos os tópicos do usuário
+function fetchAllTopics() {
+    return fetchAllPages(`${BASE_URL}/api/topics/`, 'topics');
+}
+
+function loadTopicsForModal() {
+    fetchAllTopics()
+    .then(topics => {
         // Carregar no modal
         const modalSelect = document.querySelector('#question-record-modal select[name="topic_id"]');
-        if (modalSelect && data.topics) {
+        if (modalSelect) {
             // Limpar opções existentes exceto a primeira
             while (modalSelect.children.length > 1) {
                 modalSelect.removeChild(modalSelect.lastChild);
             }
             
-            data.topics.forEach(topic => {
+            topics.forEach(topic => {
                 const option = document.createElement('option');
                 option.value = topic.id;
                 option.textContent = topic.name;
@@ -432,13 +490,13 @@ function loadTopicsForModal() {
         
         // Carregar no filtro
         const filterSelect = document.getElementById('filter-question-topic');
-        if (filterSelect && data.topics) {
+        if (filterSelect) {
             // Limpar opções existentes exceto a primeira
             while (filterSelect.children.length > 1) {
                 filterSelect.removeChild(filterSelect.lastChild);
             }
             
-            data.topics.forEach(topic => {
+            topics.forEach(topic => {
                 const option = document.createElement('option');
                 option.value = topic.id;
                 option.textContent = topic.name;
@@ -498,20 +556,16 @@ function handleQuestionSubmit(e) {
 }
 
 function loadTopicsForQuestions() {
-    fetch(`${BASE_URL}/api/topics`, {
-        method: 'GET',
-        credentials: 'include'
-    })
-    .then(response => response.json())
-    .then(data => {
+    fetchAllTopics()
+    .then(topics => {
         const select = document.querySelector('#questions-page select[id*="topic"]');
-        if (select && data.topics) {
+        if (select) {
             // Limpar opções existentes exceto a primeira
             while (select.children.length > 1) {
                 select.removeChild(select.lastChild);
             }
             
-            data.topics.forEach(topic => {
+            topics.forEach(topic => {
                 const option = document.createElement('option');
                 option.value = topic.id;
                 option.textContent = topic.name;
@@ -527,16 +581,11 @@ function loadTopicsForQuestions() {
 function loadQuestionRecords() {
     console.log('Carregando registros de questões...');
     
-    fetch(`${BASE_URL}/api/study/questions`, {
-        method: 'GET',
-        credentials: 'include'
-    })
-    .then(response => response.json())
-    .then(data => {
-        if (data.records) {
-            displayQuestionRecords(data.records);
-            updateQuestionCharts(data.records);
-        }
+    // Os gráficos usam o histórico completo: seguir todas as páginas
+    fetchAllPages(`${BASE_URL}/api/study/questions?limit=500`)
+    .then(records => {
+        displayQuestionRecords(records);
+        updateQuestionCharts(records);
     })
     .catch(error => {
         console.error('Erro ao carregar registros:', error);
@@ -607,6 +656,7 @@ function handleLogout() {
     .then(data => {
         console.log('Logout realizado:', data);
         currentUser = null;
+        stopNotificationStream();
         document.getElementById('app-container').style.display = 'none';
         document.getElementById('auth-container').style.display = 'block';
         // Limpar campos de formulário
@@ -800,20 +850,16 @@ function updateTimerButtons() {
 }
 
 function loadTopicsForTimer() {
-    fetch(`${BASE_URL}/api/topics`, {
-        method: 'GET',
-        credentials: 'include'
-    })
-    .then(response => response.json())
-    .then(data => {
+    fetchAllTopics()
+    .then(topics => {
         const select = document.getElementById('timer-topic');
-        if (select && data.topics) {
+        if (select) {
             // Limpar opções existentes exceto a primeira
             while (select.children.length > 1) {
                 select.removeChild(select.lastChild);
             }
             
-            data.topics.forEach(topic => {
+            topics.forEach(topic => {
                 const option = document.createElement('option');
                 option.value = topic.id;
                 option.textContent = topic.name;
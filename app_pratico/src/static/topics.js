@@ -11,22 +11,10 @@ function loadTopicsData() {
         topicsList.innerHTML = '<div class="loading">Carregando tópicos...</div>';
     }
     
-    fetch(`${BASE_URL}/api/topics/`, {
-        method: 'GET',
-        credentials: 'include',
-        headers: {
-            'Accept': 'application/json'
-        }
-    })
-    .then(response => {
-        if (!response.ok) {
-            throw new Error(`Erro ao buscar tópicos: ${response.status}`);
-        }
-        return response.json();
-    })
-    .then(data => {
-        console.log('Dados de tópicos recebidos:', data);
-        topicsData = data.topics || [];
+    fetchAllTopics()
+    .then(topics => {
+        console.log('Dados de tópicos recebidos:', topics);
+        topicsData = topics;
         renderTopicsList();
         
         // Atualizar seletores de tópicos em outras partes da aplicação
@@ -0,0 +1,134 @@
+"""
+Camada de autenticação compartilhada pelos blueprints.
+
+A sessão guarda o id do usuário e a sua session_version. O usuário é
+carregado no máximo uma vez por requisição (flask.g) e, entre requisições,
+vem de um cache LRU com TTL, em memória, indexado por (id, versão). Ao
+incrementar users.session_version as sessões antigas deixam de ser
+aceitas; logout e as rotas que alteram ou excluem usuários chamam
+user_changed, que remove o usuário do cache.
+
+O cache é por processo: nos demais workers um usuário alterado, excluído
+ou com as sessões revogadas continua valendo por até USER_CACHE_TTL
+segundos (o limite de atraso aceito para essas mudanças).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, jsonify, session
+from src.models.user import db, User
+
+# Tempo máximo que um usuário fica em cache (s) e número de entradas; é
+# também o atraso máximo para outros processos verem alterações e exclusões
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 1024
+
+class CachedUser:
+    """Cópia leve dos campos públicos do usuário (independente da sessão do banco)"""
+    __slots__ = ('id', 'username', 'email', 'session_version')
+
+    def __init__(self, user):
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+        self.session_version = user.session_version or 0
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email
+        }
+
+class UserCache:
+    def __init__(self, ttl=USER_CACHE_TTL, max_size=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()  # (id, versão) -> (expira_em, CachedUser)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, user):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == user_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+user_cache = UserCache()
+
+def current_user():
+    """Usuário autenticado da requisição atual (CachedUser) ou None"""
+    if 'current_user' in g:
+        return g.current_user
+
+    user = None
+    user_id = session.get('user_id')
+    if user_id:
+        key = (user_id, session.get('session_version', 0))
+        user = user_cache.get(key)
+        if user is None:
+            record = db.session.get(User, user_id)
+            if record is not None and (record.session_version or 0) == key[1]:
+                user = CachedUser(record)
+                user_cache.put(key, user)
+
+    g.current_user = user
+    return user
+
+def login_required(view):
+    """Exigir usuário autenticado; a rota obtém o usuário com current_user()"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_user() is None:
+            return jsonify({"error": "Usuário não autenticado"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def login_user(user):
+    """Iniciar a sessão do usuário"""
+    session['user_id'] = user.id
+    session['session_version'] = user.session_version or 0
+    g.current_user = CachedUser(user)
+    user_cache.put((user.id, g.current_user.session_version), g.current_user)
+
+def logout_user():
+    """Encerrar a sessão atual"""
+    user_id = session.pop('user_id', None)
+    session.pop('session_version', None)
+    g.current_user = None
+    if user_id:
+        user_cache.invalidate(user_id)
+
+def user_changed(user, revoke_sessions=False):
+    """Chamar ao alterar ou excluir o usuário (o commit fica a cargo de quem chama)
+
+    Com revoke_sessions=True a session_version é incrementada e todas as
+    sessões abertas do usuário deixam de valer (ex.: troca de senha). Remove
+    o usuário do cache deste processo; os demais percebem em até
+    USER_CACHE_TTL segundos.
+    """
+    if revoke_sessions:
+        user.session_version = (user.session_version or 0) + 1
+    user_cache.invalidate(user.id)
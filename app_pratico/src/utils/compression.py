@@ -0,0 +1,173 @@
+"""
+Compressão das respostas HTTP (gzip, brotli e zstd) negociada por
+Accept-Encoding.
+
+Respostas comuns são comprimidas de uma vez quando passam de
+COMPRESS_MIN_SIZE bytes. Respostas em stream (SSE, arquivos) são
+comprimidas pedaço a pedaço; nos geradores da aplicação cada pedaço é
+descarregado (flush) para o cliente recebê-lo imediatamente.
+
+brotli e zstandard são opcionais: sem o pacote instalado o algoritmo é
+simplesmente ignorado na negociação.
+
+Configuração (app.config / variáveis de ambiente):
+- COMPRESS_ENABLED: liga/desliga a compressão
+- COMPRESS_ALGORITHMS: ordem de preferência do servidor, ex.: "zstd,br,gzip"
+- COMPRESS_MIN_SIZE: tamanho mínimo (bytes) para comprimir
+- COMPRESS_GZIP_LEVEL (1-9), COMPRESS_BR_LEVEL (0-11), COMPRESS_ZSTD_LEVEL (1-22)
+"""
+
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+DEFAULT_ALGORITHMS = 'zstd,br,gzip'
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_LEVELS = {'gzip': 6, 'br': 4, 'zstd': 3}
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml'
+}
+
+class GzipCompressor:
+    def __init__(self, level):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush(zlib.Z_FINISH)
+
+class BrotliCompressor:
+    def __init__(self, level):
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+class ZstdCompressor:
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush()
+
+COMPRESSORS = {'gzip': GzipCompressor}
+if brotli is not None:
+    COMPRESSORS['br'] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS['zstd'] = ZstdCompressor
+
+def available_algorithms(preference):
+    """Algoritmos configurados que estão instalados, na ordem de preferência"""
+    names = [name.strip() for name in preference.split(',')]
+    return [name for name in names if name in COMPRESSORS]
+
+def is_compressible(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+def _weaken_etag(response):
+    """A representação comprimida não é byte a byte a original: ETag fraco
+
+    A comparação fraca de If-None-Match continua valendo, então as
+    respostas 304 (make_conditional) seguem funcionando.
+    """
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+def _compress_stream(chunks, compressor, flush_each):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if flush_each:
+                data += compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def register_compression(app):
+    """Registrar a compressão de respostas na aplicação"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_ALGORITHMS', DEFAULT_ALGORITHMS)
+    app.config.setdefault('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+    for name, level in DEFAULT_LEVELS.items():
+        app.config.setdefault(f"COMPRESS_{name.upper()}_LEVEL", level)
+
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not config['COMPRESS_ENABLED'] or not is_compressible(response):
+            return response
+
+        # A escolha depende do Accept-Encoding, mesmo quando não comprime
+        response.vary.add('Accept-Encoding')
+
+        algorithm = request.accept_encodings.best_match(available_algorithms(config['COMPRESS_ALGORITHMS']))
+        if algorithm is None:
+            return response
+
+        streamed = response.is_streamed or response.direct_passthrough
+        if streamed:
+            length = response.content_length
+            if length is not None and length < config['COMPRESS_MIN_SIZE']:
+                return response
+        else:
+            data = response.get_data()
+            if len(data) < config['COMPRESS_MIN_SIZE']:
+                return response
+
+        compressor = COMPRESSORS[algorithm](config[f"COMPRESS_{algorithm.upper()}_LEVEL"])
+        if streamed:
+            # Geradores da aplicação (ex.: SSE) precisam de flush a cada pedaço
+            flush_each = not response.direct_passthrough
+            response.response = _compress_stream(response.response, compressor, flush_each)
+            response.direct_passthrough = False
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.compress(data) + compressor.finish())
+
+        response.headers['Content-Encoding'] = algorithm
+        _weaken_etag(response)
+        return response
@@ -0,0 +1,128 @@
+"""
+Perfis de engine do banco de dados.
+
+PostgreSQL (perfil "tuned"):
+- pool com tamanho, overflow, timeout e reciclagem explícitos, em LIFO
+  (as conexões ociosas em excesso envelhecem e são recicladas);
+- statement_timeout por conexão;
+- ping apenas em conexões que ficaram ociosas por mais de DB_PING_IDLE_SECONDS,
+  em vez do pool_pre_ping em toda retirada do pool.
+
+SQLite (perfil "tuned"): WAL, synchronous=NORMAL, mmap, cache maior,
+busy_timeout e tabelas temporárias em memória, aplicados a cada conexão.
+
+DB_ENGINE_PROFILE=basic volta à configuração anterior (só pool_pre_ping),
+útil para comparar no benchmark_db.py. Os valores de DEFAULTS podem ser
+sobrescritos por variáveis de ambiente com o mesmo nome.
+
+Com DATABASE_REPLICA_URL a réplica vira o bind "replica", com o mesmo perfil.
+"""
+
+import os
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from src.utils.replica import REPLICA_BIND
+
+DEFAULT_PROFILE = 'tuned'
+
+DEFAULTS = {
+    'DB_POOL_SIZE': 5,
+    'DB_MAX_OVERFLOW': 10,
+    'DB_POOL_TIMEOUT': 10,  # s esperando uma conexão livre
+    'DB_POOL_RECYCLE': 1800,  # s de vida máxima de uma conexão
+    'DB_PING_IDLE_SECONDS': 30,  # Ociosidade a partir da qual a conexão é testada
+    'DB_STATEMENT_TIMEOUT_MS': 30000,  # 0 desativa
+    'SQLITE_CACHE_SIZE_KB': 65536,
+    'SQLITE_MMAP_SIZE': 268435456,
+    'SQLITE_BUSY_TIMEOUT_MS': 5000
+}
+
+def engine_options(url, config):
+    """Opções de create_engine para a URL conforme o perfil configurado"""
+    if config.get('DB_ENGINE_PROFILE', DEFAULT_PROFILE) != 'tuned':
+        return {'pool_pre_ping': True}
+
+    backend = make_url(url).get_backend_name()
+    if backend == 'postgresql':
+        options = {
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_use_lifo': True
+        }
+        if config['DB_STATEMENT_TIMEOUT_MS']:
+            options['connect_args'] = {'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"}
+        return options
+    return {}
+
+def configure_engine(engine, config):
+    """Registrar os eventos do perfil no engine (chamar uma vez por engine)"""
+    if config.get('DB_ENGINE_PROFILE', DEFAULT_PROFILE) != 'tuned':
+        return
+
+    if engine.dialect.name == 'sqlite':
+        pragmas = [
+            'PRAGMA journal_mode=WAL',
+            'PRAGMA synchronous=NORMAL',
+            f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+            f"PRAGMA cache_size=-{int(config['SQLITE_CACHE_SIZE_KB'])}",
+            f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+            'PRAGMA temp_store=MEMORY'
+        ]
+
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+    else:
+        _ping_after_idle(engine, config['DB_PING_IDLE_SECONDS'])
+
+def _ping_after_idle(engine, idle_seconds):
+    """Testar a conexão na retirada do pool só se ela ficou ociosa
+
+    Uma falha no teste vira DisconnectionError: o pool descarta a conexão e
+    tenta outra, como faria o pool_pre_ping.
+    """
+    dbapi_error = engine.dialect.loaded_dbapi.Error
+
+    @event.listens_for(engine, 'checkin')
+    def mark_idle(dbapi_connection, connection_record):
+        connection_record.info['checked_in_at'] = time.monotonic()
+
+    @event.listens_for(engine, 'checkout')
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get('checked_in_at')
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except dbapi_error as e:
+            raise exc.DisconnectionError() from e
+
+def register_database(app, db):
+    """Aplicar o perfil do engine e inicializar o Flask-SQLAlchemy"""
+    for key, value in DEFAULTS.items():
+        app.config.setdefault(key, int(os.getenv(key, value)))
+    app.config.setdefault('DB_ENGINE_PROFILE', os.getenv('DB_ENGINE_PROFILE', DEFAULT_PROFILE))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config)
+
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        # Bind só de leitura, usado pelo roteamento de src/utils/replica.py
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds[REPLICA_BIND] = {'url': replica_url, **engine_options(replica_url, app.config)}
+
+    db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_engine(engine, app.config)
@@ -0,0 +1,69 @@
+"""
+Provider JSON da aplicação.
+
+Usa o orjson (codificador nativo) quando ele está instalado e o JSON_ENCODER
+não pede o contrário; sem ele, volta ao json da biblioteca padrão com o
+mesmo comportamento. Nos dois casos datas e horas são serializadas em ISO
+8601 (o mesmo texto de isoformat()), então as rotas podem entregar
+datetimes diretamente.
+
+O orjson produz UTF-8 sem escapes \\uXXXX; o resultado é o mesmo JSON, só
+que menor. Objetos que o orjson não aceita (ex.: inteiros acima de 64 bits)
+são codificados pelo caminho da biblioteca padrão.
+"""
+
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+class FastJSONProvider(DefaultJSONProvider):
+    use_orjson = orjson is not None
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_options(self, pretty):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _pretty(self):
+        return self.compact is None and self._app.debug or self.compact is False
+
+    def dumps_bytes(self, obj, pretty=False):
+        """Codificar obj em bytes UTF-8"""
+        if self.use_orjson:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options(pretty))
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        layout = {'indent': 2} if pretty else {'separators': (',', ':')}
+        return super().dumps(obj, **layout).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options(False)).decode('utf-8')
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumps_bytes(obj, pretty=self._pretty()) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
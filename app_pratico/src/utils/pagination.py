@@ -0,0 +1,95 @@
+"""
+Paginação por chave (keyset) compartilhada pelas rotas de listagem.
+
+O cliente envia ?limit=N&cursor=... e recebe a próxima página a partir da
+última linha vista, usando as colunas de ordenação (indexadas) da rota.
+Todas as rotas informam a paginação nos cabeçalhos X-Has-More e
+X-Next-Cursor, sem alterar o formato do corpo (lista ou objeto). Sem
+limit a página tem DEFAULT_PAGE_SIZE linhas: quem precisa da lista
+completa segue o cursor (na SPA, fetchAllPages em script.js).
+"""
+
+import base64
+import json
+from datetime import datetime
+from flask import request, jsonify
+from sqlalchemy import DateTime, and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+class InvalidCursor(ValueError):
+    pass
+
+class Page:
+    __slots__ = ('items', 'has_more', 'next_cursor')
+
+    def __init__(self, items, has_more, next_cursor):
+        self.items = items
+        self.has_more = has_more
+        self.next_cursor = next_cursor
+
+def encode_cursor(values):
+    """Cursor opaco com os valores da chave de ordenação da última linha"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursor(cursor)
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+def _after(columns, values, descending):
+    """Condição "linha vem depois de values" para a ordenação (c1, c2, ...)"""
+    clauses = []
+    for i, column in enumerate(columns):
+        compare = column < values[i] if descending else column > values[i]
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, compare))
+    return or_(*clauses)
+
+def paginate(query, columns, descending=False, key=None, default_limit=DEFAULT_PAGE_SIZE):
+    """Aplicar ordenação, cursor e limite (lidos de request.args) a uma consulta
+
+    columns deve terminar em uma coluna única (normalmente o id) para que a
+    ordenação seja total. key extrai os valores da chave de uma linha
+    (padrão: atributos homônimos das colunas).
+    """
+    limit = request.args.get('limit', default=default_limit, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+
+    order = [column.desc() if descending else column for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        if key is None:
+            key = lambda row: [getattr(row, column.key) for column in columns]
+        next_cursor = encode_cursor(key(rows[-1]))
+
+    return Page(rows, has_more, next_cursor)
+
+def paginated_response(payload, page):
+    """Resposta JSON (lista ou objeto) com os metadados de paginação nos cabeçalhos"""
+    response = jsonify(payload)
+    response.headers['X-Has-More'] = 'true' if page.has_more else 'false'
+    if page.next_cursor:
+        response.headers['X-Next-Cursor'] = page.next_cursor
+    return response
+
+def invalid_cursor_response():
+    return jsonify({"error": "Cursor inválido"}), 400
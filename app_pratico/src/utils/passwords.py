@@ -0,0 +1,49 @@
+"""
+Hash de senhas com custo configurável.
+
+PASSWORD_HASH_METHOD segue o formato do Werkzeug ("scrypt:32768:8:1",
+"pbkdf2:sha256:600000", ...). Cada tentativa de login faz uma única
+derivação; se o hash gravado usar parâmetros diferentes dos configurados,
+ele é regerado após o login bem-sucedido.
+
+Com workers gevent, a derivação (CPU, sem I/O) roda no threadpool do hub
+para não travar as outras conexões do worker; hashlib libera o GIL
+durante o cálculo.
+"""
+
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+def _gevent_threadpool():
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return None
+    if not monkey.is_module_patched('threading'):
+        return None
+    return get_hub().threadpool
+
+def _run_blocking(func, *args):
+    threadpool = _gevent_threadpool()
+    if threadpool is None:
+        return func(*args)
+    return threadpool.apply(func, args)
+
+def hash_method():
+    return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+
+@lru_cache(maxsize=8)
+def _method_prefix(method):
+    """Prefixo gravado no hash para o método (com os parâmetros padrão preenchidos)"""
+    return generate_password_hash('', method).split('$', 1)[0]
+
+def hash_password(password):
+    return _run_blocking(generate_password_hash, password, hash_method())
+
+def verify_password(password_hash, password):
+    """Conferir a senha; retorna (válida, precisa_regerar_hash)"""
+    valid = _run_blocking(check_password_hash, password_hash, password)
+    return valid, valid and password_hash.split('$', 1)[0] != _method_prefix(hash_method())
@@ -0,0 +1,82 @@
+"""
+Roteamento de leituras para a réplica do banco (DATABASE_REPLICA_URL).
+
+Quando há réplica configurada (bind "replica"), as consultas SELECT das
+requisições GET/HEAD nos blueprints de REPLICA_BLUEPRINTS vão para ela;
+todo o resto (escritas, outros blueprints, threads e comandos fora de
+requisição) usa o primário.
+
+Leitura das próprias escritas:
+- dentro de uma requisição, depois da primeira escrita as leituras seguintes
+  também vão para o primário;
+- depois de uma requisição de escrita bem-sucedida (ou de um GET que
+  gravou algo), o cliente fica preso ao primário por REPLICA_STICKY_SECONDS,
+  marcado na sessão (vale para todos os processos).
+
+Rotas GET que leem para decidir uma escrita (get-or-create) usam
+@use_primary; serviços podem chamar stick_to_primary() antes de ler dados
+que vão regravar.
+"""
+
+import time
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.expression import CompoundSelect, Delete, Insert, Select, Update
+
+REPLICA_BIND = 'replica'
+REPLICA_BLUEPRINTS = {'study', 'revisions', 'topics', 'edital'}
+SAFE_METHODS = ('GET', 'HEAD')
+STICKY_SESSION_KEY = 'primary_until'
+DEFAULT_STICKY_SECONDS = 10
+
+def use_primary(view):
+    """Marcar uma rota GET para ler sempre do primário"""
+    view.use_primary = True
+    return view
+
+def stick_to_primary():
+    """Ler do primário no restante da requisição e nas próximas do cliente"""
+    if has_request_context():
+        g.db_read_replica = False
+        g.db_wrote = True
+
+def _replica_allowed():
+    if not current_app.config.get('DATABASE_REPLICA_URL'):
+        return False
+    if request.method not in SAFE_METHODS or request.blueprint not in REPLICA_BLUEPRINTS:
+        return False
+    if getattr(current_app.view_functions.get(request.endpoint), 'use_primary', False):
+        return False
+    return session.get(STICKY_SESSION_KEY, 0) < time.time()
+
+def reads_from_replica():
+    if not has_request_context():
+        return False
+    if 'db_read_replica' not in g:
+        g.db_read_replica = _replica_allowed()
+    return g.db_read_replica
+
+class RoutingSession(Session):
+    """Sessão do Flask-SQLAlchemy que envia os SELECTs elegíveis para a réplica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+                stick_to_primary()
+            elif isinstance(clause, (Select, CompoundSelect)) and reads_from_replica():
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def register_replica_routing(app):
+    """Renovar a marca de leitura no primário após as escritas do cliente"""
+    if not app.config.get('DATABASE_REPLICA_URL'):
+        return
+
+    app.config.setdefault('REPLICA_STICKY_SECONDS', DEFAULT_STICKY_SECONDS)
+
+    @app.after_request
+    def mark_recent_write(response):
+        wrote = request.method not in SAFE_METHODS and response.status_code < 400
+        if wrote or g.get('db_wrote'):
+            session[STICKY_SESSION_KEY] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+        return response
@@ -0,0 +1,12 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.user import db
+
+def dialect_insert(model):
+    """INSERT do dialeto em uso, com suporte a ON CONFLICT no Postgres e no SQLite"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(model)
+    if dialect == 'sqlite':
+        return sqlite.insert(model)
+    return insert(model)
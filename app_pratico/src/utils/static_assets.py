@@ -0,0 +1,232 @@
+"""
+Arquivos estáticos da SPA servidos a partir de um índice montado na
+inicialização.
+
+- Os assets de FINGERPRINTED ganham uma cópia com o hash do conteúdo no
+  nome (script.<hash>.js) no diretório de build, com as variantes .gz e
+  .br pré-comprimidas. Como o nome muda a cada alteração, essas URLs são
+  servidas com Cache-Control imutável de longa duração.
+- O WhiteNoise serve /static/ (arquivos originais e de build) a partir da
+  lista de arquivos lida uma única vez, escolhendo a variante comprimida
+  pelo Accept-Encoding e usando o wsgi.file_wrapper (sendfile) do servidor.
+- O index.html é reescrito para apontar para os nomes com hash e fica em
+  memória (original, gzip e brotli), com ETag e revalidação a cada acesso.
+
+O comando build-assets (executado no script build) concatena e minifica
+os scripts de BUNDLED_SCRIPTS em um único app.<hash>.js e grava o
+manifest.json; na inicialização, se o manifest corresponder aos fontes
+atuais, o index.html carrega o bundle no lugar dos scripts separados.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from whitenoise import WhiteNoise
+from whitenoise.compress import Compressor
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - dependência opcional
+    rjsmin = None
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINTED = ('script.js', 'topics.js', 'revisions.js', 'style.css')
+INDEX_FILE = 'index.html'
+HASH_LENGTH = 12
+STATIC_PREFIX = '/static/'
+# Arquivos sem hash no nome (ex.: /static/script.js de páginas antigas em cache)
+STATIC_MAX_AGE = 60
+
+# Scripts da SPA reunidos no bundle, na ordem em que o index.html os carrega
+BUNDLED_SCRIPTS = ('script.js', 'topics.js', 'revisions.js')
+BUNDLE_NAME = 'app.js'
+MANIFEST_FILE = 'manifest.json'
+# Estimativa de parse/compilação de JavaScript em um celular modesto (~1 MB/s)
+PARSE_KB_PER_MS = 1.0
+
+def hashed_name(name, data):
+    """script.js -> script.<hash do conteúdo>.js"""
+    base, ext = os.path.splitext(name)
+    return f"{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+def _hashed_pattern(name):
+    base, ext = os.path.splitext(name)
+    return re.compile(rf"^{re.escape(base)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}(\.gz|\.br)?$")
+
+def _script_tag(name):
+    return re.compile(rf'([ \t]*)<script src="{re.escape(STATIC_PREFIX + name)}"></script>([ \t]*\r?\n?)'.encode())
+
+def minify_js(source):
+    """Remover comentários e espaços (sem rjsmin instalado, mantém o fonte)"""
+    if rjsmin is None:
+        return source
+    return rjsmin.jsmin(source)
+
+def transfer_sizes(data):
+    """Tamanhos em bytes: original, gzip e brotli (quando disponível)"""
+    sizes = {'identity': len(data), 'gzip': len(gzip.compress(data, 9, mtime=0))}
+    if brotli is not None:
+        sizes['br'] = len(brotli.compress(data))
+    return sizes
+
+class StaticAssets:
+    def __init__(self, source_dir, build_dir):
+        self.source_dir = os.path.abspath(source_dir)
+        self.build_dir = os.path.abspath(build_dir)
+        self.files = frozenset()  # Caminhos relativos dos arquivos de source_dir
+        self.hashed = {}  # Nome original -> nome com hash
+        self.bundle = None  # Nome com hash do bundle dos scripts (se atualizado)
+        self.immutable_urls = frozenset()
+        self.index_variants = {}  # Content-Encoding ('identity', 'gzip', 'br') -> corpo
+        self.index_etag = None
+
+    def load(self):
+        """Montar o índice, gerar os arquivos com hash que faltarem e o index.html"""
+        files = set()
+        for directory, _, names in os.walk(self.source_dir):
+            for name in names:
+                path = os.path.join(directory, name)
+                files.add(os.path.relpath(path, self.source_dir).replace(os.sep, '/'))
+        self.files = frozenset(files)
+
+        os.makedirs(self.build_dir, exist_ok=True)
+        self.hashed = {}
+        for name in FINGERPRINTED:
+            if name not in self.files:
+                continue
+            with open(os.path.join(self.source_dir, name), 'rb') as file:
+                data = file.read()
+            self.hashed[name] = self._write_hashed(name, data)
+        self.bundle = self._load_bundle()
+        immutable = list(self.hashed.values())
+        if self.bundle:
+            immutable.append(self.bundle)
+        self.immutable_urls = frozenset(STATIC_PREFIX + name for name in immutable)
+
+        if INDEX_FILE in self.files:
+            with open(os.path.join(self.source_dir, INDEX_FILE), 'rb') as file:
+                self._load_index(file.read())
+
+    def _write_hashed(self, name, data):
+        target_name = hashed_name(name, data)
+        target = os.path.join(self.build_dir, target_name)
+        if not os.path.exists(target):
+            # Escreve em arquivo temporário e renomeia: outro processo pode estar lendo o diretório
+            temporary = f"{target}.{os.getpid()}.tmp"
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            for variant in Compressor(quiet=True).compress(temporary):
+                os.replace(variant, target + variant[len(temporary):])
+            os.replace(temporary, target)
+
+        # Remove versões anteriores do mesmo asset
+        pattern = _hashed_pattern(name)
+        for existing in os.listdir(self.build_dir):
+            if pattern.match(existing) and not existing.startswith(target_name):
+                os.remove(os.path.join(self.build_dir, existing))
+        return target_name
+
+    def _source_digests(self, names):
+        digests = {}
+        for name in names:
+            with open(os.path.join(self.source_dir, name), 'rb') as file:
+                digests[name] = hashlib.sha256(file.read()).hexdigest()
+        return digests
+
+    def _load_bundle(self):
+        """Nome do bundle gerado pelo build, se ele corresponder aos fontes atuais"""
+        try:
+            with open(os.path.join(self.build_dir, MANIFEST_FILE)) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        bundle = manifest.get('bundle')
+        if not bundle or not os.path.exists(os.path.join(self.build_dir, bundle)):
+            return None
+        if any(name not in self.files for name in BUNDLED_SCRIPTS):
+            return None
+        if manifest.get('sources') != self._source_digests(BUNDLED_SCRIPTS):
+            logger.warning("Bundle %s desatualizado; servindo os scripts separados (rode build-assets)", bundle)
+            return None
+        return bundle
+
+    def build_bundle(self):
+        """Concatenar e minificar BUNDLED_SCRIPTS em app.<hash>.js e gravar o manifest
+
+        Retorna os tamanhos antes e depois para o relatório do comando.
+        """
+        sources = []
+        for name in BUNDLED_SCRIPTS:
+            with open(os.path.join(self.source_dir, name), 'rb') as file:
+                sources.append(file.read())
+
+        # ";" entre os arquivos evita que um fonte sem ponto e vírgula final se junte ao próximo
+        bundle = '\n;\n'.join(minify_js(source.decode('utf-8')) for source in sources).encode('utf-8')
+
+        os.makedirs(self.build_dir, exist_ok=True)
+        self.bundle = self._write_hashed(BUNDLE_NAME, bundle)
+        manifest = {'bundle': self.bundle, 'sources': self._source_digests(BUNDLED_SCRIPTS)}
+        path = os.path.join(self.build_dir, MANIFEST_FILE)
+        with open(f"{path}.{os.getpid()}.tmp", 'w') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+        return {
+            'bundle': self.bundle,
+            'minified': rjsmin is not None,
+            'requests': (len(sources), 1),
+            'before': transfer_sizes(b'\n'.join(sources)),
+            'after': transfer_sizes(bundle)
+        }
+
+    def _load_index(self, body):
+        for name, target_name in self.hashed.items():
+            body = body.replace(f'"{STATIC_PREFIX}{name}"'.encode(), f'"{STATIC_PREFIX}{target_name}"'.encode())
+        if self.bundle:
+            # O primeiro script vira o bundle; os demais saem da página
+            tag = f'<script src="{STATIC_PREFIX}{self.bundle}"></script>'.encode()
+            for position, name in enumerate(BUNDLED_SCRIPTS):
+                pattern = _script_tag(self.hashed.get(name, name))
+                if position == 0:
+                    body = pattern.sub(lambda match: match.group(1) + tag + match.group(2), body, count=1)
+                else:
+                    body = pattern.sub(b'', body)
+        self.index_variants = {'identity': body, 'gzip': gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.index_variants['br'] = brotli.compress(body)
+        self.index_etag = hashlib.sha1(body).hexdigest()[:16]
+
+    def is_immutable(self, path, url):
+        return url in self.immutable_urls
+
+    def index_response(self, app, request):
+        """index.html em memória, na variante aceita pelo cliente"""
+        encoding = request.accept_encodings.best_match([name for name in ('br', 'gzip') if name in self.index_variants])
+        response = app.response_class(self.index_variants[encoding or 'identity'], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(self.index_etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+def register_static_assets(app):
+    """Montar o índice de assets e servir /static/ pelo WhiteNoise"""
+    assets = StaticAssets(app.static_folder, app.config['STATIC_BUILD_DIR'])
+    assets.load()
+
+    whitenoise = WhiteNoise(app.wsgi_app, max_age=STATIC_MAX_AGE, immutable_file_test=assets.is_immutable)
+    whitenoise.add_files(assets.source_dir, prefix='static/')
+    whitenoise.add_files(assets.build_dir, prefix='static/')
+    app.wsgi_app = whitenoise
+    return assets
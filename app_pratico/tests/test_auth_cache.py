@@ -0,0 +1,73 @@
+from werkzeug.security import generate_password_hash
+from src.models.user import db, User
+from src.utils.auth import user_changed
+
+def username(client):
+    data = client.get('/api/auth/check-auth').get_json()
+    return data['user']['username'] if data['authenticated'] else None
+
+def change(app, name, mutate, **kwargs):
+    with app.app_context():
+        user = User.query.filter_by(username=name).one()
+        mutate(user)
+        user_changed(user, **kwargs)
+        db.session.commit()
+
+def test_profile_change_invalidates_cached_user(app, login):
+    client = login('antigo')
+    assert username(client) == 'antigo'
+
+    # Sem user_changed, o cache segue servindo o usuário (até USER_CACHE_TTL)
+    with app.app_context():
+        User.query.filter_by(username='antigo').one().username = 'direto'
+        db.session.commit()
+    assert username(client) == 'antigo'
+
+    change(app, 'direto', lambda user: setattr(user, 'username', 'novo'))
+    assert username(client) == 'novo'
+
+def test_revoke_sessions_logs_out_every_client(app, login):
+    client = login('revogado')
+    other = app.test_client()
+    other.post('/api/auth/login', json={'username': 'revogado', 'password': 'senha-teste'})
+    assert username(other) == 'revogado'
+
+    change(app, 'revogado', lambda user: None, revoke_sessions=True)
+    assert username(client) is None
+    assert username(other) is None
+    assert client.get('/api/topics/').status_code == 401
+
+    # Um login novo recebe a versão atual da sessão
+    assert other.post('/api/auth/login', json={'username': 'revogado', 'password': 'senha-teste'}).status_code == 200
+    assert username(other) == 'revogado'
+
+def test_deleted_user_is_not_served_from_cache(app, login):
+    client = login('excluido')
+    assert username(client) == 'excluido'
+
+    with app.app_context():
+        user = User.query.filter_by(username='excluido').one()
+        user_changed(user)
+        db.session.delete(user)
+        db.session.commit()
+    assert username(client) is None
+
+def test_rehash_on_login_keeps_open_sessions(app, login):
+    client = login('rehash')
+    with app.app_context():
+        user = User.query.filter_by(username='rehash').one()
+        user.password_hash = generate_password_hash('senha-teste', method='pbkdf2:sha256:500')
+        db.session.commit()
+
+    other = app.test_client()
+    assert other.post('/api/auth/login', json={'username': 'rehash', 'password': 'senha-teste'}).status_code == 200
+    with app.app_context():
+        assert User.query.filter_by(username='rehash').one().password_hash.startswith('pbkdf2:sha256:1000$')
+    assert username(client) == 'rehash'
+    assert username(other) == 'rehash'
+
+def test_logout_drops_cached_user(app, login):
+    client = login('saida')
+    assert username(client) == 'saida'
+    client.post('/api/auth/logout')
+    assert username(client) is None
@@ -0,0 +1,83 @@
+from src.models.user import db
+from src.models.study import EditalItem
+from src.services.edital_sync import sync_edital_items
+
+def post(client, url, payload, status=201):
+    response = client.post(url, json=payload)
+    assert response.status_code == status, response.get_json()
+    return response.get_json()
+
+def put(client, url, payload):
+    response = client.put(url, json=payload)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def session_payload(topic_id, minutes):
+    payload = {'description': 'estudo', 'start_time': '2026-10-01T10:00:00'}
+    if topic_id:
+        payload['topic_id'] = topic_id
+    if minutes:
+        payload['end_time'] = f"2026-10-01T{10 + minutes // 60:02d}:{minutes % 60:02d}:00"
+    return payload
+
+def test_deltas_match_full_rebuild(app, login, assert_rollup_matches_rebuild):
+    client = login('rollup')
+    user_id = client.get('/api/auth/check-auth').get_json()['user']['id']
+    with app.app_context():
+        sync_edital_items([{'section': 'Geral', 'content': f"Item {i}"} for i in range(3)])
+        db.session.commit()
+        edital_ids = [item.id for item in EditalItem.query.order_by(EditalItem.id)]
+
+    def check():
+        with app.app_context():
+            return assert_rollup_matches_rebuild(user_id)
+
+    # O dashboard inicializa o rollup; daqui em diante só deltas
+    assert client.get('/api/study/dashboard').status_code == 200
+
+    first = post(client, '/api/topics/', {'name': 'Contratos', 'group_id': 1, 'group_name': 'Civil'})['topic']['id']
+    second = post(client, '/api/topics/', {'name': 'Penas', 'group_id': 2, 'group_name': 'Penal'})['topic']['id']
+    check()
+
+    sessions = [
+        post(client, '/api/study/sessions', session_payload(first, 90))['id'],
+        post(client, '/api/study/sessions', session_payload(None, 30))['id'],
+        post(client, '/api/study/sessions', session_payload(second, 0))['id'],
+    ]
+    records = [
+        post(client, '/api/study/questions', {'topic_id': first, 'total_questions': 10, 'correct_answers': 7})['id'],
+        post(client, '/api/study/questions', {'topic_id': second, 'total_questions': 5, 'correct_answers': 5})['id'],
+        post(client, '/api/study/questions', {'total_questions': 4, 'correct_answers': 1})['id'],
+    ]
+    totals = check()[0]
+    assert (totals['study_sessions'], totals['study_minutes']) == (2, 120)
+    assert (totals['questions_total'], totals['questions_correct']) == (19, 13)
+
+    put(client, f"/api/topics/{first}", {'is_completed': True})
+    put(client, f"/api/study/sessions/{sessions[0]}", {'topic_id': second})
+    put(client, f"/api/study/sessions/{sessions[2]}", {'end_time': '2026-10-01T10:45:00'})
+    put(client, f"/api/study/questions/{records[0]}", {'total_questions': 20, 'correct_answers': 18})
+    put(client, f"/api/study/questions/{records[2]}", {'topic_id': first})
+    check()
+
+    post(client, '/api/edital/mark', {'edital_item_id': edital_ids[0]}, status=200)
+    post(client, '/api/edital/mark', {'edital_item_id': edital_ids[1]}, status=200)
+    post(client, '/api/edital/mark', {'edital_item_id': edital_ids[1], 'is_studied': False}, status=200)
+    assert check()[0]['edital_studied'] == 1
+
+    # Excluir o tópico tira do grupo a atividade ligada a ele
+    assert client.delete(f"/api/topics/{second}").status_code == 200
+    rebuilt = check()
+    assert rebuilt[0]['topics_total'] == 1 and rebuilt[0]['topics_completed'] == 1
+
+def test_users_are_isolated(app, login, assert_rollup_matches_rebuild):
+    clients = [login('primeiro'), login('segundo')]
+    for index, client in enumerate(clients):
+        client.get('/api/study/dashboard')
+        for i in range(index + 1):
+            post(client, '/api/topics/', {'name': f"T{i}", 'group_id': 1, 'group_name': 'G'})
+
+    user_ids = [client.get('/api/auth/check-auth').get_json()['user']['id'] for client in clients]
+    with app.app_context():
+        for index, user_id in enumerate(user_ids):
+            assert assert_rollup_matches_rebuild(user_id)[0]['topics_total'] == index + 1
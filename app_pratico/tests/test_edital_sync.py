@@ -0,0 +1,123 @@
+from sqlalchemy import event
+from src.models.user import db
+from src.models.study import EditalItem, EditalProgress
+from src.services import dashboard_rollup, edital_catalog
+from src.services.edital_sync import sync_edital_items
+
+ENTRIES = [
+    {'section': 'Direito Civil', 'content': 'Pessoas naturais'},
+    {'section': 'Direito Civil', 'content': 'Bens'},
+    {'section': 'Direito Penal', 'content': 'Crimes contra a pessoa'},
+]
+
+def item_ids():
+    return {item.content: item.id for item in EditalItem.query.all()}
+
+def studied(user_id, ids):
+    for item_id in ids:
+        db.session.add(EditalProgress(user_id=user_id, edital_item_id=item_id, is_studied=True))
+    db.session.commit()
+
+def test_resync_keeps_ids_and_progress(app, make_user):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        before = item_ids()
+        user_id = make_user('edital').id
+        studied(user_id, before.values())
+
+        # Mesmo conteúdo com outra caixa/espaços, nova subseção e um item novo
+        summary = sync_edital_items([
+            {'section': 'DIREITO  CIVIL', 'content': 'pessoas   naturais'},
+            {'section': 'Direito Civil', 'content': 'Bens', 'subsection': 'Parte geral'},
+            {'section': 'Direito Penal', 'content': 'Crimes contra a pessoa'},
+            {'section': 'Direito Penal', 'content': 'Crimes contra o patrimônio'},
+        ])
+        db.session.commit()
+
+        assert summary == {'inserted': 1, 'updated': 2, 'retired': 0, 'unchanged': 1}
+        after = {item.id for item in EditalItem.query.filter(EditalItem.retired_at == None)}
+        assert set(before.values()) < after
+        assert EditalProgress.query.filter_by(user_id=user_id).count() == 3
+
+def test_retire_and_revive_apply_studied_deltas(app, make_user, assert_rollup_matches_rebuild):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        ids = item_ids()
+        reader = make_user('leitor').id
+        bystander = make_user('outro').id
+        studied(reader, [ids['Bens'], ids['Crimes contra a pessoa']])
+        for user_id in (reader, bystander):
+            dashboard_rollup.get_user_rollup(user_id)
+        assert assert_rollup_matches_rebuild(reader)[0]['edital_studied'] == 2
+
+        # Retirar um item estudado desconta só de quem o estudou
+        summary = sync_edital_items(ENTRIES[:2])
+        db.session.commit()
+        assert summary['retired'] == 1
+        assert EditalProgress.query.filter_by(edital_item_id=ids['Crimes contra a pessoa']).count() == 1
+        assert assert_rollup_matches_rebuild(reader)[0]['edital_studied'] == 1
+        assert assert_rollup_matches_rebuild(bystander)[0]['edital_studied'] == 0
+
+        # O item volta com o mesmo id e o progresso volta a contar
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        assert item_ids()['Crimes contra a pessoa'] == ids['Crimes contra a pessoa']
+        assert assert_rollup_matches_rebuild(reader)[0]['edital_studied'] == 2
+
+def test_resync_does_not_rebuild_every_rollup(app, make_user):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        studied(make_user('leitor').id, item_ids().values())
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            sync_edital_items(ENTRIES[:1])
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert not [statement for statement in statements if 'DELETE FROM user_dashboard_rollup' in statement]
+
+def test_catalog_is_rechecked_only_after_the_commit(app):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        cached = edital_catalog.get_catalog()
+
+        # Antes do commit, uma leitura concorrente ainda vê (e guarda) a versão antiga
+        sync_edital_items(ENTRIES + [{'section': 'Direito Penal', 'content': 'Penas'}])
+        assert edital_catalog.get_catalog() is cached
+
+        db.session.commit()
+        refreshed = edital_catalog.get_catalog()
+        assert refreshed.version == cached.version + 1
+        assert len(refreshed.items) == len(ENTRIES) + 1
+
+def test_rolled_back_bump_keeps_the_cache(app):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        cached = edital_catalog.get_catalog()
+
+        sync_edital_items(ENTRIES[:1])
+        db.session.rollback()
+        db.session.commit()
+        assert edital_catalog.get_catalog() is cached
+
+def test_bulk_mark_rejects_non_integer_ids(app, login):
+    with app.app_context():
+        sync_edital_items(ENTRIES)
+        db.session.commit()
+        item_id = min(item_ids().values())
+    client = login('lote')
+
+    for bad in ([item_id], {'id': item_id}, str(item_id), True):
+        response = client.post('/api/edital/mark/bulk', json={'items': [{'edital_item_id': bad}]})
+        assert response.status_code == 400, bad
+    response = client.post('/api/edital/mark/bulk', json={'items': [{'edital_item_id': item_id}]})
+    assert response.get_json() == {'success': True, 'updated': 1}
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models.user import db
+from src.models.topic import Topic, Revision
+from src.models.notification import Notification
+from src.services.notification_scheduler import DEFAULT_REMINDER_MINUTES, POLL_OVERLAP, NotificationScheduler
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+def add_revision(topic_id, number, scheduled_date, updated_at):
+    revision = Revision(topic_id=topic_id, revision_number=number, scheduled_date=scheduled_date, updated_at=updated_at)
+    db.session.add(revision)
+    db.session.commit()
+    return revision.id
+
+def setup_topic(make_user):
+    topic = Topic(user_id=make_user('agendador').id, name='Prazos', group_id=1, group_name='G')
+    db.session.add(topic)
+    db.session.commit()
+    return topic.id
+
+def test_late_commits_inside_overlap_are_picked_up(app, make_user):
+    with app.app_context():
+        topic_id = setup_topic(make_user)
+        add_revision(topic_id, 1, NOW + timedelta(days=1), NOW)
+
+        scheduler = NotificationScheduler()
+        scheduler.load()
+        assert scheduler.revisions_watermark == NOW
+
+        # Transações que gravaram updated_at antes da marca d'água e confirmaram depois
+        inside = add_revision(topic_id, 2, NOW + timedelta(days=2), NOW - POLL_OVERLAP + timedelta(seconds=1))
+        outside = add_revision(topic_id, 3, NOW + timedelta(days=3), NOW - POLL_OVERLAP - timedelta(seconds=1))
+        scheduler.poll_changes()
+
+        assert inside in scheduler.entries
+        assert outside not in scheduler.entries
+        assert scheduler.revisions_watermark == NOW
+
+def test_overlap_rereads_do_not_duplicate_reminders(app, make_user):
+    with app.app_context():
+        topic_id = setup_topic(make_user)
+        scheduled = NOW + timedelta(minutes=10)
+        revision_id = add_revision(topic_id, 1, scheduled, NOW)
+
+        scheduler = NotificationScheduler()
+        scheduler.load()
+        heap_size = len(scheduler.heap)
+        for _ in range(3):
+            scheduler.poll_changes()
+        # A mesma linha relida na sobreposição não é empilhada de novo
+        assert len(scheduler.heap) == heap_size
+
+        due_at = scheduled - timedelta(minutes=DEFAULT_REMINDER_MINUTES)
+        assert scheduler.run_once(due_at) == 1
+        assert scheduler.run_once(due_at + timedelta(minutes=1)) == 0
+
+        # Reinício: a carga completa reempilha, mas o índice único evita a duplicata
+        restarted = NotificationScheduler()
+        restarted.load()
+        assert restarted.run_once(due_at) == 0
+        assert Notification.query.filter_by(revision_id=revision_id).count() == 1
+
+def test_rescheduled_revision_replaces_heap_entry(app, make_user):
+    with app.app_context():
+        topic_id = setup_topic(make_user)
+        revision_id = add_revision(topic_id, 1, NOW + timedelta(minutes=40), NOW)
+
+        scheduler = NotificationScheduler()
+        scheduler.load()
+
+        revision = db.session.get(Revision, revision_id)
+        revision.scheduled_date = NOW + timedelta(days=1)
+        revision.updated_at = NOW + timedelta(seconds=1)
+        db.session.commit()
+        scheduler.poll_changes()
+
+        # O horário antigo sai do heap sem gerar lembrete
+        assert scheduler.run_once(NOW + timedelta(minutes=15)) == 0
+        assert scheduler.revisions_watermark == NOW + timedelta(seconds=1)
+
+def test_failed_emit_keeps_reminders_for_the_next_cycle(app, make_user, monkeypatch):
+    with app.app_context():
+        topic_id = setup_topic(make_user)
+        scheduled = NOW + timedelta(minutes=10)
+        revision_id = add_revision(topic_id, 1, scheduled, NOW)
+
+        scheduler = NotificationScheduler()
+        scheduler.load()
+        due_at = scheduled - timedelta(minutes=DEFAULT_REMINDER_MINUTES)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError('banco indisponível')
+        with monkeypatch.context() as patch:
+            patch.setattr(db.session, 'commit', fail)
+            with pytest.raises(RuntimeError):
+                scheduler.run_once(due_at)
+
+        assert revision_id in scheduler.entries
+        assert Notification.query.filter_by(revision_id=revision_id).count() == 0
+        assert scheduler.run_once(due_at + timedelta(minutes=1)) == 1
+        assert Notification.query.filter_by(revision_id=revision_id).count() == 1
@@ -0,0 +1,112 @@
+from sqlalchemy import event, func
+from src.models.user import db
+from src.models.notification import Notification
+from src.services import notification_stream
+from src.services.notification_stream import NotificationHub
+
+class ManualHub(NotificationHub):
+    """Hub sem o leitor em segundo plano: o teste chama poll() diretamente"""
+    def _run(self):
+        pass
+
+def notify(user_id, count):
+    for i in range(count):
+        db.session.add(Notification(user_id=user_id, title=f"Aviso {i}", message='mensagem'))
+    db.session.commit()
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait()[0])
+    return events
+
+def test_idle_period_is_not_replayed_as_live_events(app, make_user):
+    hub = ManualHub()
+    with app.app_context():
+        user_id = make_user('idle').id
+        hub.unsubscribe(hub.subscribe(app, user_id))
+
+        # Sem inscritos, o leitor só acompanha o MAX(id)
+        notify(user_id, 3)
+        assert hub.poll() == 0
+        assert hub.last_id == db.session.query(func.max(Notification.id)).scalar()
+
+        subscription = hub.subscribe(app, user_id)
+        assert hub.poll() == 0
+        assert drain(subscription) == []
+
+        notify(user_id, 1)
+        assert hub.poll() == 1
+        assert len(drain(subscription)) == 1
+
+def test_poll_reads_only_subscribed_users_in_batches(app, make_user, monkeypatch):
+    monkeypatch.setattr(notification_stream, 'POLL_BATCH', 2)
+    hub = ManualHub()
+    with app.app_context():
+        subscribed = make_user('conectado').id
+        other = make_user('ausente').id
+        subscription = hub.subscribe(app, subscribed)
+
+        notify(other, 3)
+        notify(subscribed, 5)
+        notify(other, 2)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            assert hub.poll() == 5
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        ids = drain(subscription)
+        assert ids == sorted(ids) and len(ids) == 5
+        # MAX(id) e três lotes de até dois registros
+        assert len([s for s in statements if 'FROM notifications' in s]) == 4
+        assert hub.last_id == db.session.query(func.max(Notification.id)).scalar()
+
+def test_late_commit_with_lower_id_is_delivered_once(app, make_user):
+    hub = ManualHub()
+    with app.app_context():
+        user_id = make_user('atrasada').id
+        subscription = hub.subscribe(app, user_id)
+        notify(user_id, 3)
+
+        # Simula a transação que pegou o id da sequência e confirmou depois
+        late = Notification.query.order_by(Notification.id).first()
+        late_id = late.id
+        db.session.delete(late)
+        db.session.commit()
+        assert hub.poll() == 2
+
+        db.session.add(Notification(id=late_id, user_id=user_id, title='Atrasada', message='mensagem'))
+        db.session.commit()
+        assert hub.poll() == 1
+        assert hub.poll() == 0
+        assert sorted(drain(subscription)) == [late_id, late_id + 1, late_id + 2]
+
+def test_overlap_zero_keeps_only_the_watermark(app, make_user, monkeypatch):
+    monkeypatch.setattr(notification_stream, 'POLL_OVERLAP', 0)
+    hub = ManualHub()
+    with app.app_context():
+        user_id = make_user('sem-janela').id
+        subscription = hub.subscribe(app, user_id)
+        notify(user_id, 2)
+        assert hub.poll() == 2
+        assert hub.poll() == 0
+        assert len(drain(subscription)) == 2
+        assert hub.sent == set()
+
+def test_stream_does_not_rewind_last_event_id(app, make_user):
+    hub = ManualHub()
+    with app.app_context():
+        subscription = hub.subscribe(app, make_user('stream').id)
+    notification = {'id': 7, 'user_id': 1, 'revision_id': None, 'scheduled_for': None}
+    backlog = [(9, notification_stream.format_event({**notification, 'id': 9}))]
+    for event_id in (9, 7):
+        subscription.queue.put_nowait((event_id, notification_stream.format_event({**notification, 'id': event_id})))
+    subscription.closed = True
+
+    events = list(hub.stream(subscription, backlog))
+    assert [event.startswith('id:') for event in events[1:]] == [True, False]
+    assert events[2].startswith('event: notification\n')
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+import pytest
+from src.models.study import StudySession
+from src.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+def collect(client, url, key=None):
+    """Seguir X-Next-Cursor até a última página; retorna os ids na ordem"""
+    ids = []
+    cursor = None
+    while True:
+        separator = '&' if '?' in url else '?'
+        response = client.get(url + (f"{separator}cursor={cursor}" if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        ids += [row['id'] for row in (body[key] if key else body)]
+        cursor = response.headers.get('X-Next-Cursor')
+        assert response.headers['X-Has-More'] == ('true' if cursor else 'false')
+        if not cursor:
+            return ids
+
+def test_cursor_round_trip():
+    columns = [StudySession.start_time, StudySession.id]
+    values = [datetime(2026, 10, 1, 8, 30, 15, 123456), 42]
+    assert decode_cursor(encode_cursor(values), columns) == values
+
+@pytest.mark.parametrize('cursor', [
+    'nao-e-base64!',
+    base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+    base64.urlsafe_b64encode(json.dumps([1]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(['ontem', 1]).encode()).decode(),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, [StudySession.start_time, StudySession.id])
+
+def test_pages_cover_every_row_once_with_ties(login):
+    client = login('paginas')
+    # Horários repetidos: o id desempata a ordenação
+    for i in range(7):
+        client.post('/api/study/sessions', json={'description': str(i), 'start_time': f"2026-10-0{1 + i % 3}T10:00:00"})
+
+    everything = collect(client, '/api/study/sessions?limit=500')
+    paged = collect(client, '/api/study/sessions?limit=2')
+    assert paged == everything
+    assert len(set(paged)) == 7
+
+def test_topic_lists_page_through_headers(login):
+    client = login('topicos')
+    for i in range(5):
+        client.post('/api/topics/', json={'name': f"T{i}", 'group_id': 1, 'group_name': 'G', 'create_revisions': True})
+
+    topics = collect(client, '/api/topics/?limit=2', key='topics')
+    assert len(topics) == 5 and topics == sorted(topics)
+
+    response = client.get('/api/topics/?limit=2')
+    assert set(response.get_json()) == {'topics'}
+
+    revisions = collect(client, '/api/topics/upcoming-revisions?limit=3&days=0', key='upcoming_revisions')
+    assert len(revisions) == len(set(revisions)) > 0
+
+@pytest.mark.parametrize('url', [
+    '/api/study/sessions', '/api/study/questions', '/api/revisions/',
+    '/api/revisions/notifications', '/api/topics/', '/api/topics/upcoming-revisions',
+])
+def test_endpoints_reject_bad_cursor(login, url):
+    client = login('cursor')
+    response = client.get(f"{url}?cursor=invalido")
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Cursor inválido'}
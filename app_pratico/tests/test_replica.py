@@ -0,0 +1,107 @@
+import sqlite3
+import pytest
+from flask_migrate import upgrade
+from src.app import create_app
+from src.models.user import db
+from src.services import edital_catalog
+from src.utils.auth import user_cache
+from src.utils.replica import STICKY_SESSION_KEY
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """Aplicação com primário e réplica em dois SQLite; replicate() copia o primário"""
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{primary}")
+    monkeypatch.setenv('DATABASE_REPLICA_URL', f"sqlite:///{replica}")
+    monkeypatch.setenv('REPLICA_STICKY_SECONDS', '60')
+    monkeypatch.setenv('STATIC_BUILD_DIR', str(tmp_path / 'static'))
+    monkeypatch.setattr(edital_catalog, '_catalog', None)
+    monkeypatch.setattr(edital_catalog, '_checked_at', 0.0)
+    user_cache.clear()
+
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        upgrade()
+
+    def replicate():
+        with app.app_context():
+            db.engines['replica'].dispose()
+        source, target = sqlite3.connect(primary), sqlite3.connect(replica)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+
+    app.replicate = replicate
+    replicate()
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    user_cache.clear()
+
+def expire_stickiness(client):
+    with client.session_transaction() as session:
+        session.pop(STICKY_SESSION_KEY, None)
+
+def topic_names(client):
+    response = client.get('/api/topics/')
+    assert response.status_code == 200
+    return [topic['name'] for topic in response.get_json()['topics']]
+
+def registered_client(app, username):
+    client = app.test_client()
+    response = client.post('/api/auth/register', json={
+        'username': username, 'email': f"{username}@example.com", 'password': 'senha-teste'
+    })
+    assert response.status_code == 201
+    app.replicate()
+    expire_stickiness(client)
+    return client
+
+def test_client_reads_its_own_writes_until_stickiness_expires(replica_app):
+    client = registered_client(replica_app, 'leitor')
+    assert topic_names(client) == []
+
+    assert client.post('/api/topics/', json={'name': 'Recursos', 'group_id': 1, 'group_name': 'G'}).status_code == 201
+    with client.session_transaction() as session:
+        assert STICKY_SESSION_KEY in session
+    # Preso ao primário: a réplica ainda não tem o tópico
+    assert topic_names(client) == ['Recursos']
+
+    expire_stickiness(client)
+    assert topic_names(client) == []
+
+    replica_app.replicate()
+    assert topic_names(client) == ['Recursos']
+
+def test_failed_write_does_not_stick(replica_app):
+    client = registered_client(replica_app, 'falha')
+    assert client.put('/api/topics/999', json={'name': 'x'}).status_code == 404
+    with client.session_transaction() as session:
+        assert STICKY_SESSION_KEY not in session
+
+def test_get_that_writes_sticks_to_primary(replica_app):
+    client = registered_client(replica_app, 'painel')
+    # O dashboard inicializa o rollup no primário; a réplica não tem as linhas
+    assert client.get('/api/study/dashboard').status_code == 200
+    with client.session_transaction() as session:
+        assert STICKY_SESSION_KEY in session
+
+    expire_stickiness(client)
+    assert client.get('/api/study/dashboard').status_code == 200
+    with client.session_transaction() as session:
+        assert STICKY_SESSION_KEY in session
+
+def test_use_primary_route_ignores_replica(replica_app):
+    client = registered_client(replica_app, 'preferencias')
+    assert client.post('/api/revisions/notifications/preferences', json={'enable_email_notifications': False}).status_code == 200
+    expire_stickiness(client)
+
+    response = client.get('/api/revisions/notifications/preferences')
+    assert response.status_code == 200
+    assert response.get_json()['enable_email_notifications'] is False
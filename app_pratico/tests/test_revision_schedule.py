@@ -0,0 +1,58 @@
+from datetime import datetime
+from src.models.user import db
+from src.models.topic import Topic, Revision
+from src.services import revision_schedule
+from src.services.revision_schedule import REVISION_INTERVALS, create_revision_schedules
+
+def make_topics(user_id, count):
+    topics = [Topic(user_id=user_id, name=f"T{i}", group_id=1, group_name='G') for i in range(count)]
+    db.session.add_all(topics)
+    db.session.commit()
+    return [topic.id for topic in topics]
+
+def test_repeated_scheduling_is_idempotent(app, make_user, monkeypatch):
+    # Lotes pequenos: o conflito também é ignorado entre um lote e outro
+    monkeypatch.setattr(revision_schedule, 'INSERT_CHUNK_SIZE', 7)
+    with app.app_context():
+        topic_ids = make_topics(make_user('agenda').id, 4)
+        start = datetime(2026, 10, 1, 9, 0)
+
+        assert create_revision_schedules(topic_ids[:2], start) == 2 * len(REVISION_INTERVALS)
+        db.session.commit()
+        assert create_revision_schedules(topic_ids, start) == 2 * len(REVISION_INTERVALS)
+        db.session.commit()
+        assert create_revision_schedules(topic_ids, start) == 0
+        db.session.commit()
+
+        rows = db.session.query(Revision.topic_id, Revision.revision_number).all()
+        assert len(rows) == len(set(rows)) == 4 * len(REVISION_INTERVALS)
+
+def test_existing_revisions_are_kept(app, make_user):
+    with app.app_context():
+        topic_id = make_topics(make_user('existente').id, 1)[0]
+        create_revision_schedules([topic_id], datetime(2026, 10, 1))
+        db.session.commit()
+        first = Revision.query.filter_by(topic_id=topic_id, revision_number=1).one()
+        first.notes = 'anotada'
+        db.session.commit()
+
+        assert create_revision_schedules([topic_id], datetime(2027, 1, 1)) == 0
+        db.session.commit()
+        kept = Revision.query.filter_by(topic_id=topic_id, revision_number=1).one()
+        assert (kept.id, kept.notes, kept.scheduled_date) == (first.id, 'anotada', datetime(2026, 10, 2))
+
+def test_bulk_endpoint_retry_creates_nothing(login):
+    client = login('bulk')
+    topic_ids = [
+        client.post('/api/topics/', json={'name': f"T{i}", 'group_id': 1, 'group_name': 'G'}).get_json()['topic']['id']
+        for i in range(3)
+    ]
+
+    first = client.post('/api/topics/revisions/bulk', json={'topic_ids': topic_ids})
+    retry = client.post('/api/topics/revisions/bulk', json={'topic_ids': topic_ids})
+    assert first.status_code == retry.status_code == 201
+    assert first.get_json()['created_revisions'] == 3 * len(REVISION_INTERVALS)
+    assert retry.get_json()['created_revisions'] == 0
+
+    unscheduled = client.post('/api/topics/revisions/bulk', json={'all_unscheduled': True})
+    assert unscheduled.get_json()['topic_ids'] == []
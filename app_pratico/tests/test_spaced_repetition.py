@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models.user import db
+from src.models.topic import Topic, Revision
+from src.services import spaced_repetition
+from src.services.spaced_repetition import (
+    DEFAULT_EASE, MAX_GRADE, MIN_EASE, PASSING_GRADE,
+    cumulative_offsets, next_interval, parse_grade, reschedule_after_revision,
+    reschedule_overdue_revisions, update_ease,
+)
+from src.services.revision_schedule import REVISION_INTERVALS, create_revision_schedules
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+def make_topic(user_id, name='Atos', **kwargs):
+    topic = Topic(user_id=user_id, name=name, group_id=1, group_name='G', **kwargs)
+    db.session.add(topic)
+    db.session.commit()
+    create_revision_schedules([topic.id], NOW - timedelta(days=30))
+    db.session.commit()
+    return topic
+
+def pending_dates(topic_id):
+    return [
+        revision.scheduled_date for revision in Revision.query.filter_by(
+            topic_id=topic_id, is_completed=False
+        ).order_by(Revision.revision_number)
+    ]
+
+@pytest.mark.parametrize('value', [-1, MAX_GRADE + 1, 2.5, '3', True, None])
+def test_parse_grade_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_grade(value)
+
+def test_ease_is_bounded_and_failures_reset_interval():
+    assert update_ease(DEFAULT_EASE, MAX_GRADE) == pytest.approx(DEFAULT_EASE + 0.1)
+    assert update_ease(DEFAULT_EASE, 4) == pytest.approx(DEFAULT_EASE)
+    assert update_ease(MIN_EASE, 0) == MIN_EASE
+
+    assert next_interval(10.0, 2.0, PASSING_GRADE - 1) == 1.0
+    assert next_interval(10.0, 2.0, PASSING_GRADE) == 20.0
+    assert next_interval(0.2, MIN_EASE, MAX_GRADE) == 1.0
+
+def test_cumulative_offsets_sum_the_geometric_series():
+    ease = 2.0
+    offsets = cumulative_offsets(3.0, ease, [0, 1, 2, 3])
+    assert offsets.tolist() == pytest.approx([0.0, 3.0, 9.0, 21.0])
+
+def test_grade_reschedules_pending_revisions(app, make_user):
+    with app.app_context():
+        topic = make_topic(make_user('nota').id)
+        revision = Revision.query.filter_by(topic_id=topic.id, revision_number=1).one()
+        revision.is_completed = True
+        revision.completed_at = NOW
+
+        reschedule_after_revision(revision, MAX_GRADE)
+        db.session.commit()
+
+        ease = DEFAULT_EASE + 0.1
+        interval = REVISION_INTERVALS[0] * ease
+        assert (revision.grade, topic.ease_factor, topic.interval_days) == (
+            MAX_GRADE, pytest.approx(ease), pytest.approx(interval)
+        )
+        expected = cumulative_offsets(interval, ease, range(1, len(REVISION_INTERVALS)))
+        dates = pending_dates(topic.id)
+        assert len(dates) == len(REVISION_INTERVALS) - 1
+        for scheduled, offset in zip(dates, expected):
+            assert abs((scheduled - NOW).total_seconds() - offset * 86400) < 1
+
+def test_failing_grade_brings_next_revision_to_tomorrow(login):
+    client = login('esqueci')
+    topic_id = client.post('/api/topics/', json={
+        'name': 'Prazos', 'group_id': 1, 'group_name': 'G', 'create_revisions': True
+    }).get_json()['topic']['id']
+
+    def revisions():
+        rows = client.get(f"/api/topics/{topic_id}/revisions").get_json()['revisions']
+        return sorted(rows, key=lambda revision: revision['revision_number'])
+
+    revision_id = revisions()[0]['id']
+    assert client.post(f"/api/revisions/mark-completed/{revision_id}", json={'grade': 9}).status_code == 400
+    response = client.post(f"/api/revisions/mark-completed/{revision_id}", json={'grade': 0})
+    assert response.status_code == 200
+
+    topic = client.get('/api/topics/').get_json()['topics'][0]
+    assert topic['interval_days'] == 1.0
+    completed, following = revisions()[:2]
+    assert completed['grade'] == 0 and not following['is_completed']
+    delay = datetime.fromisoformat(following['scheduled_date']) - datetime.fromisoformat(completed['completed_at'])
+    assert abs(delay.total_seconds() - 86400) < 1
+
+def test_overdue_revisions_follow_each_topic_series(app, make_user, monkeypatch):
+    monkeypatch.setattr(spaced_repetition, 'UPDATE_CHUNK_SIZE', 3)
+    with app.app_context():
+        user_id = make_user('atrasado').id
+        graded = make_topic(user_id, 'Avaliado', ease_factor=2.0, interval_days=4.0)
+        fresh = make_topic(user_id, 'Novo', ease_factor=None)
+        on_time = Topic(user_id=user_id, name='Em dia', group_id=1, group_name='G')
+        db.session.add(on_time)
+        db.session.commit()
+        create_revision_schedules([on_time.id], NOW)
+        db.session.commit()
+        untouched = pending_dates(on_time.id)
+
+        expected_count = 2 * len(REVISION_INTERVALS)
+        assert reschedule_overdue_revisions(NOW) == expected_count
+        db.session.commit()
+
+        positions = range(len(REVISION_INTERVALS))
+        for topic, ease, interval in [
+            (graded, 2.0, 4.0),
+            (fresh, DEFAULT_EASE, float(REVISION_INTERVALS[0])),
+        ]:
+            dates = pending_dates(topic.id)
+            assert dates[0] == NOW
+            for scheduled, offset in zip(dates, cumulative_offsets(interval, ease, positions)):
+                assert abs((scheduled - NOW).total_seconds() - offset * 86400) < 1
+
+        assert pending_dates(on_time.id) == untouched
+        assert reschedule_overdue_revisions(NOW) == 0